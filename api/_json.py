@@ -0,0 +1,58 @@
+"""JSON response class for numpy-heavy payloads.
+
+Profile and mesh endpoints return tens of thousands of floats. Going through
+FastAPI's default path means ``arr.tolist()`` (one ``PyFloat`` per element)
+followed by ``jsonable_encoder`` re-walking every list before ``json.dumps``
+finally runs. Handlers that return :class:`NumpyJSONResponse` directly skip
+``jsonable_encoder`` altogether and may leave ``np.ndarray`` / numpy scalars
+in the payload.
+
+``orjson`` (with ``OPT_SERIALIZE_NUMPY``) is used when it is installed; it is
+an optional speed-up, not a dependency. Without it the stdlib encoder is
+used with a numpy-aware ``default`` hook, so the wire format is the same.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover — optional speed-up
+    orjson = None
+
+
+def _numpy_default(obj: Any) -> Any:
+    """Fallback for values neither encoder handles natively.
+
+    orjson only serialises C-contiguous arrays of native dtypes, so strided
+    views (e.g. ``verts[:, 0]``) land here as well.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """``JSONResponse`` that serialises numpy arrays without list round-trips."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(
+                content,
+                default=_numpy_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_numpy_default,
+        ).encode("utf-8")
@@ -1,5 +1,6 @@
 import sqlite3
 import json
+import math
 import uuid
 import functools
 import tempfile
@@ -43,7 +44,8 @@ def init_db():
             process_status TEXT DEFAULT 'idle',
             current_section INTEGER DEFAULT 0,
             total_sections INTEGER DEFAULT 0,
-            completed_sections INTEGER DEFAULT 0
+            completed_sections INTEGER DEFAULT 0,
+            version INTEGER DEFAULT 0
         );
 
         CREATE TABLE IF NOT EXISTS meshes (
@@ -76,10 +78,32 @@ def init_db():
             UNIQUE(session_id, section_name, type)
         );
     """)
+    # Databases created before the ``version`` column existed
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(sessions)")}
+    if "version" not in cols:
+        conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER DEFAULT 0")
     conn.commit()
     conn.close()
 
 
+def _bump_version(conn: sqlite3.Connection, session_id: str):
+    """Mark session data as changed (feeds the ETag on profile/result GETs)."""
+    conn.execute(
+        "UPDATE sessions SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (session_id,),
+    )
+
+
+def get_session_version(session_id: str) -> int:
+    """Monotonic counter bumped on every write that changes session data."""
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT version FROM sessions WHERE id = ?", (session_id,)
+    ).fetchone()
+    conn.close()
+    return int(row["version"] or 0) if row else 0
+
+
 def create_session() -> str:
     """Create a new session and return its ID."""
     session_id = str(uuid.uuid4())
@@ -143,31 +167,79 @@ def save_mesh(
     bounds: Dict[str, float],
 ) -> str:
     """Save a mesh file to the database. Returns mesh ID."""
-    mesh_id = str(uuid.uuid4())
     conn = get_connection()
+    mesh_id, _ = _insert_mesh(conn, session_id, mesh_type, filename, data,
+                              n_vertices, n_faces, bounds)
+    _bump_version(conn, session_id)
+    conn.commit()
+    conn.close()
+    return mesh_id
+
+
+_BLOB_COPY_CHUNK = 1 << 20  # 1 MB
+
+
+def save_mesh_file(
+    session_id: str,
+    mesh_type: str,
+    filename: str,
+    path: str,
+    n_vertices: int,
+    n_faces: int,
+    bounds: Dict[str, float],
+) -> str:
+    """Save a mesh from a file on disk without reading it into memory.
+
+    The row is inserted with a ``zeroblob`` of the file's size and the file
+    is copied into it in 1 MB chunks through SQLite incremental blob I/O
+    (``Connection.blobopen``, Python 3.11+). On older interpreters the file
+    is read in one go, as :func:`save_mesh` would. Returns mesh ID.
+    """
+    size = os.path.getsize(path)
+    conn = get_connection()
+    if not hasattr(conn, "blobopen"):  # Python < 3.11
+        mesh_id, _ = _insert_mesh(conn, session_id, mesh_type, filename,
+                                  Path(path).read_bytes(), n_vertices, n_faces, bounds)
+    else:
+        mesh_id, rowid = _insert_mesh(conn, session_id, mesh_type, filename,
+                                      None, n_vertices, n_faces, bounds, blob_size=size)
+        with open(path, "rb") as src, conn.blobopen("meshes", "data", rowid) as blob:
+            while chunk := src.read(_BLOB_COPY_CHUNK):
+                blob.write(chunk)
+    _bump_version(conn, session_id)
+    conn.commit()
+    conn.close()
+    return mesh_id
+
+
+def _insert_mesh(conn, session_id, mesh_type, filename, data, n_vertices,
+                 n_faces, bounds, blob_size: Optional[int] = None) -> Tuple[str, int]:
+    """Replace the session's mesh of ``mesh_type``; returns ``(mesh_id, rowid)``.
+
+    With ``blob_size`` the ``data`` column is a zero-filled blob of that size
+    for the caller to fill in place.
+    """
+    mesh_id = str(uuid.uuid4())
     # Remove any existing mesh of same type for this session
     conn.execute(
         "DELETE FROM meshes WHERE session_id = ? AND type = ?", (session_id, mesh_type)
     )
-    conn.execute(
-        "INSERT INTO meshes (id, session_id, type, filename, data, n_vertices, n_faces, bounds) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    data_sql = "?" if blob_size is None else "zeroblob(?)"
+    cur = conn.execute(
+        "INSERT INTO meshes (id, session_id, type, filename, data, n_vertices, n_faces, bounds) "
+        f"VALUES (?, ?, ?, ?, {data_sql}, ?, ?, ?)",
         (
             mesh_id,
             session_id,
             mesh_type,
             filename,
-            data,
+            data if blob_size is None else blob_size,
             n_vertices,
             n_faces,
             json.dumps(bounds),
         ),
     )
-    conn.execute(
-        "UPDATE sessions SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (session_id,)
-    )
-    conn.commit()
-    conn.close()
-    return mesh_id
+    return mesh_id, cur.lastrowid
 
 
 def get_mesh(session_id: str, mesh_type: str) -> Optional[Dict[str, Any]]:
@@ -238,6 +310,9 @@ def get_trimesh_by_id(mesh_id: str) -> trimesh.Trimesh:
         # Force evaluation to cache in-memory
         _ = mesh.vertices
         _ = mesh.faces
+        # Unique edges drive the batched section cutter; build them once
+        # here so every cached mesh pays the O(F log F) sort a single time.
+        _ = mesh.edges_unique
         return mesh
     finally:
         if os.path.exists(tmp):
@@ -247,7 +322,10 @@ def get_trimesh_by_id(mesh_id: str) -> trimesh.Trimesh:
 def delete_mesh(mesh_id: str) -> bool:
     """Delete a mesh by ID. Returns True if deleted."""
     conn = get_connection()
+    row = conn.execute("SELECT session_id FROM meshes WHERE id = ?", (mesh_id,)).fetchone()
     cursor = conn.execute("DELETE FROM meshes WHERE id = ?", (mesh_id,))
+    if row is not None:
+        _bump_version(conn, row["session_id"])
     conn.commit()
     deleted = cursor.rowcount > 0
     conn.close()
@@ -283,7 +361,7 @@ def save_sections(session_id: str, sections: List[Dict]):
     """Replace all sections for a session."""
     conn = get_connection()
     conn.execute(
-        "UPDATE sessions SET sections = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        "UPDATE sessions SET sections = ?, version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (json.dumps(sections), session_id),
     )
     conn.commit()
@@ -309,7 +387,7 @@ def save_settings(session_id: str, settings: Dict):
     """Save process settings + tolerances for a session."""
     conn = get_connection()
     conn.execute(
-        "UPDATE sessions SET settings = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        "UPDATE sessions SET settings = ?, version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (json.dumps(settings), session_id),
     )
     conn.commit()
@@ -370,6 +448,29 @@ def get_process_status(session_id: str) -> Dict:
 # --- Results operations ---
 
 
+def _finite_or_none(obj: Any) -> Any:
+    """Copy of ``obj`` with NaN / infinite floats replaced by ``None``."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite_or_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(v) for v in obj]
+    return obj
+
+
+def _dumps_result(row: Dict) -> str:
+    """Encode a result row as strict JSON, storing NaN / Infinity as null.
+
+    Rows are streamed back verbatim by :func:`get_results_json`, so the
+    stored text must already be valid JSON.
+    """
+    try:
+        return json.dumps(row, allow_nan=False)
+    except ValueError:
+        return json.dumps(_finite_or_none(row), allow_nan=False)
+
+
 def save_results(session_id: str, results: List[Dict]):
     """Replace all results for a session."""
     conn = get_connection()
@@ -378,8 +479,9 @@ def save_results(session_id: str, results: List[Dict]):
         section_name = r.get("section", "")
         conn.execute(
             "INSERT INTO results (session_id, section_name, data) VALUES (?, ?, ?)",
-            (session_id, section_name, json.dumps(r)),
+            (session_id, section_name, _dumps_result(r)),
         )
+    _bump_version(conn, session_id)
     conn.commit()
     conn.close()
 
@@ -400,6 +502,35 @@ def get_results(session_id: str, section: Optional[str] = None) -> List[Dict]:
     return [json.loads(r["data"]) for r in rows]
 
 
+def get_results_json(session_id: str, section: Optional[str] = None) -> List[str]:
+    """Like :func:`get_results` but returns each row's stored JSON text.
+
+    Lets callers that only re-emit the rows (e.g. streaming responses)
+    skip the decode/encode round-trip. Rows saved before non-finite values
+    were stored as null are re-encoded when they may hold ``NaN`` or
+    ``Infinity`` tokens, so every returned row is valid JSON.
+    """
+    conn = get_connection()
+    if section:
+        rows = conn.execute(
+            "SELECT data FROM results WHERE session_id = ? AND section_name = ?",
+            (session_id, section),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT data FROM results WHERE session_id = ?", (session_id,)
+        ).fetchall()
+    conn.close()
+    return [_strict_result_json(r["data"]) for r in rows]
+
+
+def _strict_result_json(text: str) -> str:
+    """Stored result text with any ``NaN`` / ``Infinity`` tokens as null."""
+    if "NaN" not in text and "Infinity" not in text:
+        return text
+    return _dumps_result(json.loads(text))
+
+
 def get_results_count(session_id: str) -> int:
     """Count results for a session."""
     conn = get_connection()
@@ -420,6 +551,7 @@ def save_extraction(session_id: str, section_name: str, ext_type: str, data: Dic
         "INSERT OR REPLACE INTO extraction_cache (session_id, section_name, type, data) VALUES (?, ?, ?, ?)",
         (session_id, section_name, ext_type, json.dumps(data)),
     )
+    _bump_version(conn, session_id)
     conn.commit()
     conn.close()
 
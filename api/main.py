@@ -174,7 +174,7 @@ app.add_middleware(
         "Origin",
         "Referer",
     ],
-    expose_headers=["X-Session-ID", "x-session-id"],
+    expose_headers=["X-Session-ID", "x-session-id", "ETag"],
 )
 
 
@@ -10,6 +10,7 @@ Endpoints:
 """
 
 import asyncio
+import io
 import logging
 import os
 import tempfile
@@ -17,21 +18,20 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 import api.database as db
 from api.routers.process import (
-    _load_mesh_from_db,
+    _cut_section_profiles,
+    _mesh_id_from_db,
     _section_from_dict,
     _dict_to_bench,
     _extraction_to_dict,
 )
 from api.schemas import ExportFilters
-from core import (
-    build_reconciled_profile,
-)
-from core.section_cutter import azimuth_to_direction
+from core.compliance_status import worst_status_by_section
 from core.excel_writer import export_results
+from core.profile_compliance import build_reconciled_profile_cached
 from core.report_generator import generate_word_report, generate_section_images_zip
 from core.param_extractor import ExtractionResult
 
@@ -107,6 +107,11 @@ def _apply_bench_filters(
     return params_list
 
 
+def _attachment_header(filename: str) -> Dict[str, str]:
+    """``Content-Disposition`` for in-memory downloads (as ``FileResponse`` sets)."""
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
 def _filters_header(filters: ExportFilters) -> Dict[str, str]:
     summary = {
         "selected_bench_numbers": filters.selected_bench_numbers,
@@ -131,11 +136,11 @@ def _build_excel_payload_sync(
     operation: Optional[str],
     phase: Optional[str],
     filters: Optional[str],
-) -> tuple[str, ExportFilters]:
+) -> tuple[bytes, ExportFilters]:
     """Build the Excel workbook off the event loop.
 
-    Returns ``(tmp_path, export_filters)`` so the async handler can wrap the
-    result in a ``FileResponse`` once the executor task resolves.
+    Returns ``(xlsx_bytes, export_filters)``; the workbook is built in
+    memory, so nothing round-trips through the temp directory.
     """
     export_filters = _parse_filters(filters)
 
@@ -198,10 +203,10 @@ def _build_excel_payload_sync(
         "date": __import__("datetime").datetime.now().strftime("%d/%m/%Y"),
     }
 
-    tmp = os.path.join(tempfile.gettempdir(), f"conciliacion_{session_id[:8]}.xlsx")
-    export_results(results, params_design, params_topo, tolerances, tmp, project_info)
+    buf = io.BytesIO()
+    export_results(results, params_design, params_topo, tolerances, buf, project_info)
 
-    return tmp, export_filters
+    return buf.getvalue(), export_filters
 
 
 @router.get("/excel")
@@ -223,9 +228,11 @@ async def export_excel(
     so multi-section workbooks don't stall the event loop.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
 
-        tmp, export_filters = await _run_in_executor(
+        content, export_filters = await _run_in_executor(
             _build_excel_payload_sync,
             session_id,
             project,
@@ -235,11 +242,13 @@ async def export_excel(
             filters,
         )
 
-        return FileResponse(
-            tmp,
+        return Response(
+            content,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            filename="Conciliacion_Geotecnica.xlsx",
-            headers=_filters_header(export_filters),
+            headers={
+                **_attachment_header("Conciliacion_Geotecnica.xlsx"),
+                **_filters_header(export_filters),
+            },
         )
     except HTTPException:
         raise
@@ -276,16 +285,15 @@ def _build_word_payload_sync(
     results = _filter_comparisons(results, export_filters)
 
     sections_raw = db.get_sections(session_id)
-    mesh_design = _load_mesh_from_db(session_id, "design")
-    mesh_topo = _load_mesh_from_db(session_id, "topo")
+    design_id = _mesh_id_from_db(session_id, "design")
+    topo_id = _mesh_id_from_db(session_id, "topo")
 
     # Build all_data structure expected by generate_word_report
-    from core import cut_both_surfaces
+    sections = [_section_from_dict(s) for s in sections_raw]
+    profiles = _cut_section_profiles(design_id, topo_id, sections)
 
     all_data: List[Dict[str, Any]] = []
-    for sec_dict in sections_raw:
-        sec = _section_from_dict(sec_dict)
-        pd_prof, pt_prof = cut_both_surfaces(mesh_design, mesh_topo, sec)
+    for sec, (pd_prof, pt_prof) in zip(sections, profiles):
 
         # Reconstruct ExtractionResult objects from cache
         design_ext = db.get_extraction(session_id, sec.name, "design")
@@ -368,7 +376,9 @@ async def export_word(
     executor so multi-section reports don't stall the event loop.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
 
         tmp, export_filters = await _run_in_executor(
             _build_word_payload_sync,
@@ -398,21 +408,20 @@ async def export_word(
 # ---------------------------------------------------------------------------
 
 
-def _build_dxf_payload_sync(session_id: str) -> str:
+def _build_dxf_payload_sync(session_id: str) -> bytes:
     """Build the 3D DXF file off the event loop.
 
-    Returns the absolute path to the generated ``.dxf``.
+    Returns the encoded ``.dxf`` bytes (built in memory, no temp file).
     """
     try:
-        mesh_design = _load_mesh_from_db(session_id, "design")
-        mesh_topo = _load_mesh_from_db(session_id, "topo")
+        design_id = _mesh_id_from_db(session_id, "design")
+        topo_id = _mesh_id_from_db(session_id, "topo")
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(400, f"Error loading meshes: {exc}")
 
     import ezdxf
-    from core import cut_both_surfaces
 
     doc = ezdxf.new("R2010")
     msp = doc.modelspace()
@@ -430,34 +439,19 @@ def _build_dxf_payload_sync(session_id: str) -> str:
 
     # Determine per-section compliance status from results
     results = db.get_results(session_id)
-    section_status: Dict[str, str] = {}
-    for c in results:
-        sec_name = c.get("section", "")
-        statuses = [
-            c.get("height_status", ""),
-            c.get("angle_status", ""),
-            c.get("berm_status", ""),
-        ]
-        if sec_name not in section_status:
-            section_status[sec_name] = "CUMPLE"
-        if "NO CUMPLE" in statuses:
-            section_status[sec_name] = "NO CUMPLE"
-        elif (
-            "FUERA DE TOLERANCIA" in statuses
-            and section_status[sec_name] != "NO CUMPLE"
-        ):
-            section_status[sec_name] = "FUERA DE TOLERANCIA"
+    section_status: Dict[str, str] = worst_status_by_section(results)
 
     sections_raw = db.get_sections(session_id)
     n_exported = 0
 
-    for i, sec_dict in enumerate(sections_raw):
-        sec = _section_from_dict(sec_dict)
-        pd_prof, pt_prof = cut_both_surfaces(mesh_design, mesh_topo, sec)
+    sections = [_section_from_dict(s) for s in sections_raw]
+    profiles = _cut_section_profiles(design_id, topo_id, sections)
+
+    for sec, (pd_prof, pt_prof) in zip(sections, profiles):
         if not (pd_prof and pt_prof):
             continue
 
-        direction = azimuth_to_direction(sec.azimuth)
+        direction = sec.direction
         ox, oy = sec.origin[0], sec.origin[1]
 
         status = section_status.get(sec.name, "CUMPLE")
@@ -466,10 +460,12 @@ def _build_dxf_payload_sync(session_id: str) -> str:
         )
 
         def _to_3d(dists, elevs):
-            return [
-                (ox + d * direction[0], oy + d * direction[1], float(e))
-                for d, e in zip(dists, elevs)
-            ]
+            dists = np.asarray(dists, dtype=float)
+            return np.column_stack([
+                ox + dists * direction[0],
+                oy + dists * direction[1],
+                np.asarray(elevs, dtype=float),
+            ])
 
         def _draw_lines(pts, layer):
             msp.add_polyline3d(pts, dxfattribs={"layer": layer})
@@ -489,19 +485,19 @@ def _build_dxf_payload_sync(session_id: str) -> str:
         if design_ext:
             benches_d = [_dict_to_bench(b) for b in design_ext.get("benches", [])]
             if benches_d:
-                rd, re = build_reconciled_profile(benches_d)
-                if len(rd) > 0:
-                    _draw_lines(_to_3d(rd, re), "CONCILIADO_DISEÑO")
+                rec_d = build_reconciled_profile_cached(benches_d, source="design")
+                if len(rec_d.distances) > 0:
+                    _draw_lines(_to_3d(rec_d.distances, rec_d.elevations), "CONCILIADO_DISEÑO")
 
         if topo_ext:
             benches_t = [_dict_to_bench(b) for b in topo_ext.get("benches", [])]
             if benches_t:
-                rt, ret = build_reconciled_profile(benches_t)
-                if len(rt) > 0:
-                    _draw_lines(_to_3d(rt, ret), "CONCILIADO_TOPO")
+                rec_t = build_reconciled_profile_cached(benches_t, source="topo")
+                if len(rec_t.distances) > 0:
+                    _draw_lines(_to_3d(rec_t.distances, rec_t.elevations), "CONCILIADO_TOPO")
 
         # Section label
-        mid_z = float(max(pd_prof.elevations.max(), pt_prof.elevations.max())) + 3
+        mid_z = max(pd_prof.elev_max, pt_prof.elev_max) + 3
         msp.add_text(
             f"{sec.name} [{status}]",
             dxfattribs={"height": 2.0, "layer": "ETIQUETAS", "insert": (ox, oy, mid_z)},
@@ -511,9 +507,9 @@ def _build_dxf_payload_sync(session_id: str) -> str:
     if n_exported == 0:
         raise HTTPException(400, "No profiles could be exported")
 
-    tmp = os.path.join(tempfile.gettempdir(), f"Perfiles_3D_{session_id[:8]}.dxf")
-    doc.saveas(tmp)
-    return tmp
+    stream = io.StringIO()
+    doc.write(stream)
+    return doc.encode(stream.getvalue())
 
 
 @router.get("/dxf")
@@ -524,9 +520,15 @@ async def export_dxf(request: Request):
     exports don't stall the event loop.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
-        tmp = await _run_in_executor(_build_dxf_payload_sync, session_id)
-        return FileResponse(tmp, media_type="application/dxf", filename="Perfiles_3D.dxf")
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
+        content = await _run_in_executor(_build_dxf_payload_sync, session_id)
+        return Response(
+            content,
+            media_type="application/dxf",
+            headers=_attachment_header("Perfiles_3D.dxf"),
+        )
     except HTTPException:
         raise
     except Exception as exc:
@@ -546,16 +548,15 @@ def _build_images_zip_sync(session_id: str):
     ``BytesIO`` buffer), ready to wrap in a ``StreamingResponse``.
     """
     sections_raw = db.get_sections(session_id)
-    mesh_design = _load_mesh_from_db(session_id, "design")
-    mesh_topo = _load_mesh_from_db(session_id, "topo")
-
-    from core import cut_both_surfaces
+    design_id = _mesh_id_from_db(session_id, "design")
+    topo_id = _mesh_id_from_db(session_id, "topo")
 
     # Build all_data structure expected by generate_section_images_zip
+    sections = [_section_from_dict(s) for s in sections_raw]
+    profiles = _cut_section_profiles(design_id, topo_id, sections)
+
     all_data: List[Dict[str, Any]] = []
-    for sec_dict in sections_raw:
-        sec = _section_from_dict(sec_dict)
-        pd_prof, pt_prof = cut_both_surfaces(mesh_design, mesh_topo, sec)
+    for sec, (pd_prof, pt_prof) in zip(sections, profiles):
 
         design_ext = db.get_extraction(session_id, sec.name, "design")
         topo_ext = db.get_extraction(session_id, sec.name, "topo")
@@ -615,9 +616,11 @@ async def export_images(request: Request):
     multi-section ZIP build doesn't stall the event loop.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
 
-        results = db.get_results(session_id)
+        results = await _run_in_executor(db.get_results, session_id)
         if not results:
             raise HTTPException(400, "No results to export — run the pipeline first")
 
@@ -683,7 +686,9 @@ async def export_pdf(
     executor so the event loop stays responsive.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
         tmp = await _run_in_executor(
             _build_pdf_payload_sync,
             session_id,
@@ -756,7 +761,9 @@ async def export_blast_diagnostics(request: Request):
     when the session has no blast upload persisted.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
         tmp = await _run_in_executor(_build_blast_diagnostics_payload_sync, session_id)
         return FileResponse(
             str(tmp),
@@ -776,8 +783,10 @@ async def export_blast_rejections(request: Request):
     from core.blast_export import export_rejected_rows_excel
 
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
-        settings = db.get_settings(session_id) or {}
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
+        settings = await _run_in_executor(db.get_settings, session_id) or {}
         rejected = settings.get("rejected_rows") or []
         config = settings.get("geometry_configuration") or {}
         if not rejected and not settings.get("blast_upload_meta"):
@@ -6,8 +6,8 @@ All endpoints operate under the session identified by ``request.state.session_id
 
 Performance: every handler is ``async def`` and off-loads DB round-trips
 (``api.database`` is synchronous SQLite) to the default executor via
-:func:`api._async_db.run_db`. The cached heavy helpers (``_get_decimated_*``,
-``_get_contours_*``, ``_get_breaklines_*``) stay synchronous so tests can still
+:func:`api._async_db.run_db`. The cached heavy helpers (``_get_viz_mesh_*``,
+``_get_decimated_*``, ``_get_contours_*``, ``_get_breaklines_*``) stay synchronous so tests can still
 call ``.cache_clear()`` on them, but the handler awaits them through
 ``run_db`` so trimesh decimation / sectioning / breakline extraction never
 blocks the event loop.
@@ -15,6 +15,7 @@ blocks the event loop.
 
 import asyncio
 import os
+import shutil
 import tempfile
 import functools
 from pathlib import Path
@@ -26,7 +27,9 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 
 import api.database as db
 from api._async_db import run_db
+from api._json import NumpyJSONResponse
 from core import load_mesh, get_mesh_bounds
+from core.config import DEFAULTS
 
 router = APIRouter(prefix="/meshes", tags=["meshes"])
 
@@ -55,7 +58,28 @@ def _load_mesh_from_blob(mesh_data: bytes, filename: str) -> trimesh.Trimesh:
             f.write(mesh_data)
         return load_mesh(tmp)
     finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+_UPLOAD_CHUNK = 1 << 20  # 1 MB copy buffer for streamed uploads
+
+
+def _spool_upload(src, filename: str) -> tuple[str, int]:
+    """Stream an upload's file object to a temp file in fixed-size chunks.
+
+    Returns ``(path, size_in_bytes)``; the caller owns (and must unlink) the
+    temp file.
+    """
+    suffix = Path(filename).suffix or ".stl"
+    fd, tmp = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(src, f, _UPLOAD_CHUNK)
+    except BaseException:
         os.unlink(tmp)
+        raise
+    return tmp, os.path.getsize(tmp)
 
 
 # ---------------------------------------------------------------------------
@@ -77,46 +101,45 @@ async def upload_mesh(
     if type not in ("design", "topo"):
         raise HTTPException(400, "type must be 'design' or 'topo'")
 
-    content = await file.read()
-    if len(content) == 0:
-        raise HTTPException(400, "Empty file")
-
     filename = file.filename or "mesh.stl"
 
-    # Load mesh to validate and extract metadata
-    suffix = Path(filename).suffix or ".stl"
-    fd, tmp = tempfile.mkstemp(suffix=suffix)
+    # Spool the upload to disk in 1 MB chunks instead of materialising it in
+    # memory, then validate/parse it there (trimesh runs on the default
+    # executor so large uploads don't stall the event loop).
+    tmp, size = await run_db(_spool_upload, file.file, filename)
     try:
-        with os.fdopen(fd, "wb") as f:
-            f.write(content)
-        mesh = load_mesh(tmp)
-    except Exception as exc:
-        raise HTTPException(400, f"Error loading mesh: {exc}")
+        if size == 0:
+            raise HTTPException(400, "Empty file")
+        try:
+            mesh = await run_db(load_mesh, tmp)
+        except Exception as exc:
+            raise HTTPException(400, f"Error loading mesh: {exc}")
+
+        raw_bounds = get_mesh_bounds(mesh)
+        clean_bounds = {
+            "xmin": raw_bounds["xmin"],
+            "xmax": raw_bounds["xmax"],
+            "ymin": raw_bounds["ymin"],
+            "ymax": raw_bounds["ymax"],
+            "zmin": raw_bounds["zmin"],
+            "zmax": raw_bounds["zmax"],
+        }
+
+        session_id = await run_db(db.get_or_create_session, get_session_id(request))
+        # The spooled file is copied into the BLOB column in chunks, so the
+        # upload is never held in memory as one bytes object.
+        mesh_id = await run_db(
+            db.save_mesh_file,
+            session_id=session_id,
+            mesh_type=type,
+            filename=filename,
+            path=tmp,
+            n_vertices=len(mesh.vertices),
+            n_faces=len(mesh.faces),
+            bounds=clean_bounds,
+        )
     finally:
-        if os.path.exists(tmp):
-            os.unlink(tmp)
-
-    raw_bounds = get_mesh_bounds(mesh)
-    clean_bounds = {
-        "xmin": raw_bounds["xmin"],
-        "xmax": raw_bounds["xmax"],
-        "ymin": raw_bounds["ymin"],
-        "ymax": raw_bounds["ymax"],
-        "zmin": raw_bounds["zmin"],
-        "zmax": raw_bounds["zmax"],
-    }
-
-    session_id = await run_db(db.get_or_create_session, get_session_id(request))
-    mesh_id = await run_db(
-        db.save_mesh,
-        session_id=session_id,
-        mesh_type=type,
-        filename=filename,
-        data=content,
-        n_vertices=len(mesh.vertices),
-        n_faces=len(mesh.faces),
-        bounds=clean_bounds,
-    )
+        os.unlink(tmp)
 
     return {
         "mesh_id": mesh_id,
@@ -144,32 +167,76 @@ async def mesh_info(request: Request, mesh_id: str):
     }
 
 
-@functools.lru_cache(maxsize=16)
-def _get_decimated_vertices_cached(mesh_id: str, step: int) -> dict:
-    tmesh = db.get_trimesh_by_id(mesh_id)
+@functools.lru_cache(maxsize=8)
+def _get_viz_mesh_cached(mesh_id: str) -> trimesh.Trimesh:
+    """Decimate a stored mesh once to the display level of detail.
 
+    The face budget (``DEFAULTS.viz_target_faces``) is shared by the 3D
+    preview and contour endpoints; section cutting always uses the
+    full-resolution mesh.
+    """
     from core.mesh_handler import decimate_mesh
-    if len(tmesh.faces) > 0:
-        dec = decimate_mesh(tmesh, step)
-        verts = dec.vertices
-        faces = dec.faces
-    else:
-        verts = tmesh.vertices
-        stride = max(1, len(verts) // step)
-        verts = verts[::stride]
-        faces = []
 
+    tmesh = db.get_trimesh_by_id(mesh_id)
+    if len(tmesh.faces) == 0:
+        return tmesh
+    return decimate_mesh(tmesh, DEFAULTS.viz_target_faces)
+
+
+# Decimal places kept on display-only coordinates (1 cm).
+_DISPLAY_COORD_DECIMALS = 2
+
+
+def _quantise_display_coords(coords) -> np.ndarray:
+    """Round display coordinates to 1 cm into a read-only contiguous array."""
+    out = np.ascontiguousarray(np.round(np.asarray(coords, dtype=float), _DISPLAY_COORD_DECIMALS))
+    out.setflags(write=False)
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _get_decimated_vertices_cached(mesh_id: str, step: int) -> dict:
+    # Requests at or below the display budget decimate from the cached LOD
+    # rather than the full mesh.
+    tmesh = (
+        _get_viz_mesh_cached(mesh_id)
+        if step <= DEFAULTS.viz_target_faces
+        else db.get_trimesh_by_id(mesh_id)
+    )
+
+    # Display-only, like the contours: coordinates are quantised to 1 cm
+    # (contiguous columns, so NumpyJSONResponse encodes them directly) and
+    # face indices are held as int32, halving the cached index buffer.
+    from core.mesh_handler import decimate_mesh, subsample_vertices
+    if len(tmesh.faces) == 0:
+        # Point cloud: at most ``step`` evenly strided points
+        x, y, z = subsample_vertices(tmesh, step)
+        return {
+            "x": _quantise_display_coords(x),
+            "y": _quantise_display_coords(y),
+            "z": _quantise_display_coords(z),
+            "faces": [],
+        }
+
+    dec = decimate_mesh(tmesh, step)
+    verts = np.asarray(dec.vertices)
+    faces = np.ascontiguousarray(dec.faces, dtype=np.int32)
+    faces.setflags(write=False)
     return {
-        "x": verts[:, 0].tolist(),
-        "y": verts[:, 1].tolist(),
-        "z": verts[:, 2].tolist(),
-        "faces": faces.tolist() if len(faces) > 0 else [],
+        "x": _quantise_display_coords(verts[:, 0]),
+        "y": _quantise_display_coords(verts[:, 1]),
+        "z": _quantise_display_coords(verts[:, 2]),
+        "faces": faces if len(faces) > 0 else [],
     }
 
 
 @functools.lru_cache(maxsize=16)
-def _get_contours_cached(mesh_id: str, interval: float, grid_size: int) -> dict:
-    tmesh = db.get_trimesh_by_id(mesh_id)
+def _get_contours_cached(mesh_id: str, interval: float) -> dict:
+    # Keyed on the stored mesh id (a cheap string) rather than the mesh
+    # itself, and only on parameters that change the output: contours are
+    # traced on the mesh triangles, so ``grid_size`` is deliberately left out.
+    # Display-only, so the decimated LOD is traced rather than the full mesh.
+    tmesh = _get_viz_mesh_cached(mesh_id)
     z_min, z_max = tmesh.bounds[0][2], tmesh.bounds[1][2]
 
     # Round to nearest interval
@@ -177,26 +244,17 @@ def _get_contours_cached(mesh_id: str, interval: float, grid_size: int) -> dict:
         np.floor(z_min / interval) * interval, z_max + interval, interval
     )
 
-    contour_lines: list[dict] = []
-
-    # We use exact trimesh sectioning instead of griddata interpolation!
-    # This prevents staircases and produces geometrically perfect contours.
-    for z in levels:
-        slice_path = tmesh.section(plane_origin=[0, 0, z], plane_normal=[0, 0, 1])
-        if slice_path is not None:
-            segs = []
-            # slice_path.discrete gives ordered polylines (requires networkx)
-            for poly in slice_path.discrete:
-                if len(poly) < 2:
-                    continue
-                poly_2d = [[float(v[0]), float(v[1])] for v in poly]
-                segs.append(poly_2d)
-
-            if segs:
-                contour_lines.append({
-                    "elevation": float(z),
-                    "segments": segs
-                })
+    # Contours are traced on the mesh's own triangles (no griddata
+    # re-interpolation), so they follow the surface exactly.
+    from core.mesh_handler import mesh_contour_lines
+
+    # Display-only: coordinates are quantised to 1 cm, which roughly halves
+    # the JSON per vertex, and kept as arrays so NumpyJSONResponse encodes
+    # them without a nested ``tolist()`` walk.
+    contour_lines: list[dict] = [
+        {"elevation": z, "segments": [_quantise_display_coords(seg) for seg in segs]}
+        for z, segs in mesh_contour_lines(tmesh, levels)
+    ]
 
     bounds = {
         "xmin": float(tmesh.bounds[0][0]),
@@ -224,7 +282,8 @@ async def mesh_vertices(request: Request, mesh_id: str, step: int = 8000):
     ``step`` is the *maximum number of faces/points* to return (default 8000).
     """
     try:
-        return await run_db(_get_decimated_vertices_cached, mesh_id, step)
+        payload = await run_db(_get_decimated_vertices_cached, mesh_id, step)
+        return NumpyJSONResponse(payload)
     except ValueError as exc:
         raise HTTPException(404, str(exc))
 
@@ -249,13 +308,15 @@ async def mesh_contours(
     Return contour/isoline data for a mesh.
 
     ``interval`` is the elevation step between contour lines (default 15 m).
-    ``grid_size`` controls the interpolation resolution (default 400×400).
+    ``grid_size`` is accepted for backwards compatibility but ignored:
+    contours are traced on the mesh triangles, not interpolated on a grid.
 
     Returns contour line segments grouped by elevation level, suitable for
     rendering with Chart.js or any line chart library.
     """
     try:
-        return await run_db(_get_contours_cached, mesh_id, interval, grid_size)
+        payload = await run_db(_get_contours_cached, mesh_id, float(interval))
+        return NumpyJSONResponse(payload)
     except ValueError as exc:
         raise HTTPException(404, str(exc))
 
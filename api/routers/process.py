@@ -13,7 +13,9 @@ import logging
 import math
 import os
 import tempfile
+import threading
 import warnings
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -21,14 +23,15 @@ import numpy as np
 import pandas as pd
 import trimesh
 from concurrent.futures import ThreadPoolExecutor
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 import api.database as db
 import api.schemas as schemas
+from api._json import NumpyJSONResponse
 from core import (
     load_mesh,
     SectionLine,
-    cut_both_surfaces,
     extract_parameters,
     compare_design_vs_asbuilt,
     build_reconciled_profile,
@@ -37,8 +40,12 @@ from core.param_extractor import (
     BenchParams,
     ExtractionResult,
     ReconciledPoint,
+    _bench_geometry_arrays,
+    bench_arrays,
     build_reconciled_profile_v2,
+    compare_design_vs_asbuilt_batch,
 )
+from core.section_cutter import cut_both_surfaces_batch
 from core.calculo_tronadura import proyectar_pozos_en_seccion
 from core.blast_correlation import compute_blast_geotech_correlation
 from core.blast_model import fit_powder_factor_damage_model
@@ -72,15 +79,113 @@ def _safe_float(value, ndigits: int = 3) -> float:
     return round(f, ndigits) if math.isfinite(f) else 0.0
 
 
-def _load_mesh_from_db(session_id: str, mesh_type: str) -> trimesh.Trimesh:
-    """Load a mesh from the database, cached in memory."""
+def _mesh_id_from_db(session_id: str, mesh_type: str) -> str:
+    """Return the stored mesh id, making sure the mesh loads (cached in memory)."""
     mesh_info = db.get_mesh(session_id, mesh_type)
     if not mesh_info:
         raise HTTPException(400, f"{mesh_type} mesh not uploaded")
     try:
-        return db.get_trimesh_by_id(mesh_info["id"])
+        db.get_trimesh_by_id(mesh_info["id"])
     except Exception as exc:
         raise HTTPException(400, f"Error loading {mesh_type} mesh: {exc}")
+    return mesh_info["id"]
+
+
+def _load_mesh_from_db(session_id: str, mesh_type: str) -> trimesh.Trimesh:
+    """Load a mesh from the database, cached in memory."""
+    return db.get_trimesh_by_id(_mesh_id_from_db(session_id, mesh_type))
+
+
+def _section_geometry(sec: SectionLine) -> tuple:
+    """Hashable ``(x, y, azimuth, length)`` key for a section's cut plane."""
+    return (
+        float(sec.origin[0]),
+        float(sec.origin[1]),
+        float(sec.azimuth),
+        float(sec.length),
+    )
+
+
+# Per-section profile memo shared by ``POST /process``, ``GET /profiles/{id}``
+# and the exports. Keyed on the mesh ids (a re-upload mints a new id, so stale
+# profiles are never served) and one section's cut geometry, so a single
+# section lookup never cuts more than that section and overlapping section
+# sets reuse every profile already cut.
+_PROFILE_MEMO_SIZE = 1024
+_profile_memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+_profile_memo_lock = threading.Lock()
+
+
+def _profile_memo_clear() -> None:
+    """Drop every memoised profile pair (tests, mesh re-uploads)."""
+    with _profile_memo_lock:
+        _profile_memo.clear()
+
+
+def _cut_section_profiles(
+    design_id: str, topo_id: str, sections: List[SectionLine]
+) -> tuple:
+    """Return the cached ``(design, topo)`` profile pair of every section.
+
+    Only the sections missing from the memo are cut, in one batched
+    mesh-plane sweep.
+    """
+    keys = [(design_id, topo_id, _section_geometry(s)) for s in sections]
+    with _profile_memo_lock:
+        pairs = [_profile_memo.get(k) for k in keys]
+        for k, pair in zip(keys, pairs):
+            if pair is not None:
+                _profile_memo.move_to_end(k)
+
+    missing = [i for i, pair in enumerate(pairs) if pair is None]
+    if missing:
+        cut = cut_both_surfaces_batch(
+            db.get_trimesh_by_id(design_id),
+            db.get_trimesh_by_id(topo_id),
+            [sections[i] for i in missing],
+        )
+        with _profile_memo_lock:
+            for i, pair in zip(missing, cut):
+                pairs[i] = tuple(pair)
+                _profile_memo[keys[i]] = pairs[i]
+                _profile_memo.move_to_end(keys[i])
+            while len(_profile_memo) > _PROFILE_MEMO_SIZE:
+                _profile_memo.popitem(last=False)
+    return tuple(pairs)
+
+
+# Per-section extraction memo shared by every ``POST /process`` run. Keyed on
+# the mesh ids, the section's cut geometry/identity and the detection
+# parameters, so a rerun over an overlapping section set (or with only the
+# tolerances changed) re-extracts just the sections that actually differ.
+# Extraction results are read-only downstream, so entries are shared as-is.
+_EXTRACTION_MEMO_SIZE = 2048
+_extraction_memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+_extraction_memo_lock = threading.Lock()
+
+
+def _extraction_memo_get(key: tuple) -> Optional[tuple]:
+    """Return the memoised ``(design, topo)`` extraction pair, or None."""
+    with _extraction_memo_lock:
+        hit = _extraction_memo.get(key)
+        if hit is not None:
+            _extraction_memo.move_to_end(key)
+        return hit
+
+
+def _extraction_memo_put(key: tuple, value: tuple) -> None:
+    """Store an extraction pair, evicting the least recently used entries."""
+    with _extraction_memo_lock:
+        _extraction_memo[key] = value
+        _extraction_memo.move_to_end(key)
+        while len(_extraction_memo) > _EXTRACTION_MEMO_SIZE:
+            _extraction_memo.popitem(last=False)
+
+
+def _extraction_memo_clear() -> None:
+    """Drop every memoised extraction (tests, mesh re-uploads)."""
+    with _extraction_memo_lock:
+        _extraction_memo.clear()
 
 
 def _extraction_to_dict(er: ExtractionResult) -> dict:
@@ -184,8 +289,8 @@ def _reconciled_point_to_dict(p: ReconciledPoint) -> dict:
 def _reconciled_profile_to_dict(prof) -> dict:
     """Serialise a ReconciledProfile (distances, elevations, segments)."""
     return {
-        "distances": prof.distances.tolist() if len(prof.distances) > 0 else [],
-        "elevations": prof.elevations.tolist() if len(prof.elevations) > 0 else [],
+        "distances": prof.distances,
+        "elevations": prof.elevations,
         "segments": [_reconciled_point_to_dict(p) for p in prof.points],
     }
 
@@ -206,8 +311,8 @@ def _legacy_reconciled_to_dict(benches, floor_elevation: float | None = None) ->
         distances, elevations = build_reconciled_profile(
             benches, floor_elevation=floor_elevation)
     return {
-        "distances": distances.tolist(),
-        "elevations": elevations.tolist(),
+        "distances": distances,
+        "elevations": elevations,
     }
 
 
@@ -216,6 +321,12 @@ def _legacy_reconciled_to_dict(benches, floor_elevation: float | None = None) ->
 # ---------------------------------------------------------------------------
 
 
+# Progress is written to SQLite (a connection + commit per update), which
+# can outweigh the per-section work on small meshes; report it in at most
+# this many steps per run.
+_STATUS_UPDATE_STEPS = 50
+
+
 def _run_pipeline_sync(
     session_id: str,
     sections_raw: list,
@@ -231,8 +342,8 @@ def _run_pipeline_sync(
     """
     # Load both meshes (will raise 400 if missing)
     try:
-        mesh_design = _load_mesh_from_db(session_id, "design")
-        mesh_topo = _load_mesh_from_db(session_id, "topo")
+        design_id = _mesh_id_from_db(session_id, "design")
+        topo_id = _mesh_id_from_db(session_id, "topo")
     except HTTPException:
         raise
     except Exception as exc:
@@ -266,16 +377,35 @@ def _run_pipeline_sync(
     # Mark processing started
     db.update_process_status(session_id, "processing", 0, len(sections))
 
+    # Sections already extracted with the same meshes and parameters are
+    # served from the memo; only the remaining ones are cut and extracted.
+    memo_keys = [
+        (design_id, topo_id, _section_geometry(sec), sec.name, sec.sector,
+         resolution, face_threshold, berm_threshold)
+        for sec in sections
+    ]
+    memo_hits = [_extraction_memo_get(key) for key in memo_keys]
+    missing = [idx for idx, hit in enumerate(memo_hits) if hit is None]
+    profiles: Dict[int, tuple] = {}
+    if missing:
+        cut = _cut_section_profiles(
+            design_id, topo_id, [sections[idx] for idx in missing]
+        )
+        profiles = dict(zip(missing, cut))
+
     # Allocate result containers
     params_design_list: List[Optional[ExtractionResult]] = [None] * len(sections)
     params_topo_list: List[Optional[ExtractionResult]] = [None] * len(sections)
     comparison_results: List[Dict[str, Any]] = []
 
     def _process_section(args: tuple):
-        """Worker: cut → extract → compare for a single section."""
+        """Worker: extract both surfaces of a single pre-cut section."""
         idx, sec = args
         try:
-            pd_prof, pt_prof = cut_both_surfaces(mesh_design, mesh_topo, sec)
+            if memo_hits[idx] is not None:
+                p_d, p_t = memo_hits[idx]
+                return idx, sec, p_d, p_t
+            pd_prof, pt_prof = profiles[idx]
             if pd_prof is not None and pt_prof is not None:
                 p_d = extract_parameters(
                     pd_prof.distances,
@@ -295,30 +425,55 @@ def _run_pipeline_sync(
                     face_threshold,
                     berm_threshold,
                 )
-                comps = compare_design_vs_asbuilt(p_d, p_t, tolerances)
-                return idx, sec, p_d, p_t, comps
+                _extraction_memo_put(memo_keys[idx], (p_d, p_t))
+                return idx, sec, p_d, p_t
             else:
                 p_d_empty = ExtractionResult(section_name=sec.name, sector=sec.sector)
                 p_t_empty = ExtractionResult(section_name=sec.name, sector=sec.sector)
-                return idx, sec, p_d_empty, p_t_empty, []
+                return idx, sec, p_d_empty, p_t_empty
         except Exception as exc:
             logger.exception("Section %s processing failed: %s", sec.name, exc)
             p_d_empty = ExtractionResult(section_name=sec.name, sector=sec.sector)
             p_t_empty = ExtractionResult(section_name=sec.name, sector=sec.sector)
-            return idx, sec, p_d_empty, p_t_empty, []
+            return idx, sec, p_d_empty, p_t_empty
 
     # Execute in parallel (inside the executor thread, so this pool only
-    # uses background threads; no event-loop blocking).
+    # uses background threads; no event-loop blocking). The pool is capped
+    # so small meshes don't pay for more threads than there are sections
+    # or than the cache can feed.
     completed = 0
-    with ThreadPoolExecutor() as executor:
-        for idx, sec, p_d, p_t, comps in executor.map(
+    total = len(sections)
+    update_every = max(1, total // _STATUS_UPDATE_STEPS)
+    n_workers = max(1, min(DEFAULTS.max_section_workers, total))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        for idx, sec, p_d, p_t in executor.map(
             _process_section, enumerate(sections)
         ):
             params_design_list[idx] = p_d
             params_topo_list[idx] = p_t
-            comparison_results.extend(comps)
             completed += 1
-            db.update_process_status(session_id, "processing", completed, len(sections))
+            if completed % update_every == 0 or completed == total:
+                db.update_process_status(session_id, "processing", completed, total)
+
+    # Compare every section in one batch: the tolerance statuses of all
+    # matched benches are evaluated together instead of section by section.
+    pairs = list(zip(params_design_list, params_topo_list))
+    try:
+        section_comps = compare_design_vs_asbuilt_batch(pairs, tolerances)
+    except Exception:
+        # Isolate the failing section(s), as the per-section workers did
+        section_comps = []
+        for idx, (p_d, p_t) in enumerate(pairs):
+            try:
+                section_comps.append(compare_design_vs_asbuilt(p_d, p_t, tolerances))
+            except Exception as exc:
+                sec = sections[idx]
+                logger.exception("Section %s processing failed: %s", sec.name, exc)
+                params_design_list[idx] = ExtractionResult(section_name=sec.name, sector=sec.sector)
+                params_topo_list[idx] = ExtractionResult(section_name=sec.name, sector=sec.sector)
+                section_comps.append([])
+    for comps in section_comps:
+        comparison_results.extend(comps)
 
     # Persist results
     # Save extraction cache for each section
@@ -367,10 +522,12 @@ async def run_process(request: Request, body: Optional[schemas.ProcessSettings]
     DB persistence) is executed off the event loop via ``run_in_executor``.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
 
         # Validate preconditions
-        sections_raw = db.get_sections(session_id)
+        sections_raw = await _run_in_executor(db.get_sections, session_id)
         if not sections_raw:
             raise HTTPException(400, "Load sections first")
 
@@ -430,22 +587,70 @@ async def get_status(request: Request):
 # ---------------------------------------------------------------------------
 
 
+def _session_etag(session_id: str, scope: str) -> str:
+    """Weak ETag derived from the session's data version and a per-view scope."""
+    return f'W/"{session_id}-{db.get_session_version(session_id)}-{scope}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True when the client's ``If-None-Match`` already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (t.strip() for t in header.split(","))
+
+
+_RESULTS_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_json_array(rows: List[str], chunk_bytes: int = _RESULTS_CHUNK_BYTES):
+    """Yield a JSON array of pre-encoded ``rows`` in ~``chunk_bytes`` pieces."""
+    buf: List[str] = ["["]
+    size = 1
+    for i, row in enumerate(rows):
+        if i:
+            buf.append(",")
+        buf.append(row)
+        size += len(row) + 1
+        if size >= chunk_bytes:
+            yield "".join(buf).encode()
+            buf, size = [], 0
+    buf.append("]")
+    yield "".join(buf).encode()
+
+
 @router.get("/results")
 async def get_results(request: Request, section: Optional[str] = None):
     """Return all comparison results, optionally filtered by section.
 
     The SQLite read runs on the default executor so the event loop isn't
     blocked while the (potentially large) results table is fetched.
+    Responses carry an ETag tied to the session version; a matching
+    ``If-None-Match`` short-circuits with 304 before any read or encoding.
+    The body is streamed as a JSON array in ~64 KB chunks.
     """
     try:
         session_id = await _run_in_executor(
             db.get_or_create_session, request.state.session_id
         )
 
-        def _fetch():
-            return db.get_results(session_id, section=section)
+        etag = await _run_in_executor(
+            _session_etag, session_id, f"results:{section or ''}"
+        )
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-        return await _run_in_executor(_fetch)
+        def _fetch():
+            return db.get_results_json(session_id, section=section)
+
+        # Rows are already JSON text in SQLite; stream them as one array
+        # in bounded chunks instead of decoding and re-encoding the list.
+        rows = await _run_in_executor(_fetch)
+        return StreamingResponse(
+            _iter_json_array(rows),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
     except HTTPException:
         raise
     except Exception as exc:
@@ -460,42 +665,45 @@ async def get_results(request: Request, section: Optional[str] = None):
 
 def _build_profile_payload_sync(
     session_id: str,
-    sec_dict: dict,
+    sections_raw: list,
+    section_id: int,
 ) -> dict:
     """Compute profile / extraction payload off the event loop.
 
     Cuts both meshes on the section, builds reconciled profiles (legacy +
     v2), and returns a JSON-ready dict.
     """
-    sec = _section_from_dict(sec_dict)
+    sections = [_section_from_dict(s) for s in sections_raw]
+    sec = sections[section_id]
 
-    # Load meshes and cut profiles
+    # Load meshes and cut profiles (served from the per-section cache
+    # populated by POST /process)
     try:
-        mesh_design = _load_mesh_from_db(session_id, "design")
-        mesh_topo = _load_mesh_from_db(session_id, "topo")
+        design_id = _mesh_id_from_db(session_id, "design")
+        topo_id = _mesh_id_from_db(session_id, "topo")
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(400, f"Error loading meshes: {exc}")
 
-    pd_prof, pt_prof = cut_both_surfaces(mesh_design, mesh_topo, sec)
+    pd_prof, pt_prof = _cut_section_profiles(design_id, topo_id, [sec])[0]
 
     result: Dict[str, Any] = {
         "section_name": sec.name,
         "sector": sec.sector,
-        "origin": sec.origin.tolist(),
+        "origin": sec.origin,
         "azimuth": sec.azimuth,
     }
 
     if pd_prof is not None:
         result["design"] = {
-            "distances": pd_prof.distances.tolist(),
-            "elevations": pd_prof.elevations.tolist(),
+            "distances": pd_prof.distances,
+            "elevations": pd_prof.elevations,
         }
     if pt_prof is not None:
         result["topo"] = {
-            "distances": pt_prof.distances.tolist(),
-            "elevations": pt_prof.elevations.tolist(),
+            "distances": pt_prof.distances,
+            "elevations": pt_prof.elevations,
         }
 
     # Reconciled profiles from extraction cache. The v2 builder
@@ -566,18 +774,29 @@ async def get_profile(request: Request, section_id: int):
     extraction cache, and bench data for interactive editing.
 
     The cut/extract work (trimesh slicing + reconciled profile building)
-    runs off the event loop via ``run_in_executor``.
+    runs off the event loop via ``run_in_executor``. Unchanged sessions
+    answer a matching ``If-None-Match`` with 304 and skip that work.
     """
     try:
-        session_id = db.get_or_create_session(request.state.session_id)
+        session_id = await _run_in_executor(
+            db.get_or_create_session, request.state.session_id
+        )
+
+        etag = await _run_in_executor(
+            _session_etag, session_id, f"profile:{section_id}"
+        )
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
-        sections_raw = db.get_sections(session_id)
+        sections_raw = await _run_in_executor(db.get_sections, session_id)
         if section_id < 0 or section_id >= len(sections_raw):
             raise HTTPException(404, "Section index out of range")
 
-        return await _run_in_executor(
-            _build_profile_payload_sync, session_id, sections_raw[section_id]
+        payload = await _run_in_executor(
+            _build_profile_payload_sync, session_id, sections_raw, section_id
         )
+        # Payload keeps numpy arrays; serialise them directly.
+        return NumpyJSONResponse(payload, headers={"ETag": etag})
     except HTTPException:
         raise
     except Exception as exc:
@@ -590,6 +809,30 @@ async def get_profile(request: Request, section_id: int):
 # ---------------------------------------------------------------------------
 
 
+_POSITION_FIELDS = ("crest_distance", "crest_elevation", "toe_distance", "toe_elevation")
+
+
+def _bench_positions_unchanged(benches: list, body_updates: List[dict]) -> bool:
+    """True when ``body_updates`` leave every crest/toe position as-is.
+
+    Fields missing from an update keep the bench's current value, so they
+    compare equal by construction.
+    """
+    if not benches:
+        return True
+    current = np.array(
+        [[getattr(b, f) for f in _POSITION_FIELDS] for b in benches], dtype=float
+    )
+    sent = np.array(
+        [
+            [float(u.get(f, getattr(b, f))) for f in _POSITION_FIELDS]
+            for b, u in zip(benches, body_updates)
+        ],
+        dtype=float,
+    )
+    return bool(np.allclose(current, sent, rtol=0.0, atol=1e-6))
+
+
 def _update_reconciled_sync(
     session_id: str,
     section_id: int,
@@ -616,33 +859,42 @@ def _update_reconciled_sync(
     # Reconstruct benches from cache and apply updates
     benches = [_dict_to_bench(b) for b in topo_extraction.get("benches", [])]
 
-    for i, update_dict in enumerate(body_updates):
-        if i < len(benches):
-            b = benches[i]
-            # Update positions
-            if "crest_distance" in update_dict:
-                b.crest_distance = float(update_dict["crest_distance"])
-            if "crest_elevation" in update_dict:
-                b.crest_elevation = float(update_dict["crest_elevation"])
-            if "toe_distance" in update_dict:
-                b.toe_distance = float(update_dict["toe_distance"])
-            if "toe_elevation" in update_dict:
-                b.toe_elevation = float(update_dict["toe_elevation"])
-
-            # Recalculate derived values
-            b.bench_height = abs(b.crest_elevation - b.toe_elevation)
-            dx = b.toe_distance - b.crest_distance
-            dz = b.crest_elevation - b.toe_elevation
-            if abs(dx) > 0.01:
-                b.face_angle = abs(float(np.degrees(np.arctan2(dz, abs(dx)))))
-            else:
-                b.face_angle = 90.0
+    n_edited = min(len(body_updates), len(benches))
+    if _bench_positions_unchanged(benches[:n_edited], body_updates[:n_edited]):
+        # Nothing moved (re-sent values, drag jitter): the cached extraction
+        # and stored comparisons are already current, skip the rerun.
+        prof = build_reconciled_profile_v2(benches, source="topo")
+        return {
+            "reconciled_topo": _reconciled_profile_to_dict(prof),
+            "benches": [_bench_to_dict(b) for b in benches],
+        }
 
-    # Recalculate berm widths between adjacent benches
-    for i in range(len(benches) - 1):
-        benches[i].berm_width = abs(
-            benches[i + 1].crest_distance - benches[i].toe_distance
-        )
+    for b, update_dict in zip(benches, body_updates):
+        # Update positions
+        if "crest_distance" in update_dict:
+            b.crest_distance = float(update_dict["crest_distance"])
+        if "crest_elevation" in update_dict:
+            b.crest_elevation = float(update_dict["crest_elevation"])
+        if "toe_distance" in update_dict:
+            b.toe_distance = float(update_dict["toe_distance"])
+        if "toe_elevation" in update_dict:
+            b.toe_elevation = float(update_dict["toe_elevation"])
+
+    # Recalculate derived values (height, angle for edited benches; berm
+    # widths between every adjacent pair) in one vectorised pass
+    arr = bench_arrays(benches)
+    heights, angles = _bench_geometry_arrays(
+        arr.crest_distance[:n_edited],
+        arr.crest_elevation[:n_edited],
+        arr.toe_distance[:n_edited],
+        arr.toe_elevation[:n_edited],
+    )
+    berms = np.abs(arr.crest_distance[1:] - arr.toe_distance[:-1])
+    for b, h, a in zip(benches, heights.tolist(), angles.tolist()):
+        b.bench_height = h
+        b.face_angle = a
+    for b, w in zip(benches, berms.tolist()):
+        b.berm_width = w
 
     # Persist updated extraction cache
     updated_extraction = _extraction_to_dict(
@@ -719,9 +971,10 @@ async def update_reconciled(
             for item in body
         ]
 
-        return await _run_in_executor(
+        payload = await _run_in_executor(
             _update_reconciled_sync, session_id, section_id, body_updates
         )
+        return NumpyJSONResponse(payload)
     except HTTPException:
         raise
     except Exception as exc:
@@ -5,6 +5,7 @@ Sections are stored as an ordered list in the database (one list per session).
 Section IDs are index-based strings: "0", "1", "2", …
 """
 
+import functools
 import io
 import os
 import tempfile
@@ -24,6 +25,7 @@ from core.section_cutter import (
     generate_sections_along_crest,
     generate_perpendicular_sections,
     compute_local_azimuth,
+    compute_local_azimuth_batch,
 )
 
 router = APIRouter(prefix="/sections", tags=["sections"])
@@ -100,6 +102,46 @@ def _dict_to_section(d: dict) -> SectionLine:
     )
 
 
+_X_NAMES = ("X", "ESTE", "EAST", "E")
+_Y_NAMES = ("Y", "NORTE", "NORTH", "N")
+_CSV_MAX_ROWS = 10000
+
+
+def _sniff_xy_columns(content: bytes) -> Optional[tuple]:
+    """Positions of the named X/Y columns in the CSV header line, if any."""
+    header = content.split(b"\n", 1)[0].decode("utf-8-sig", errors="replace")
+    names = [c.strip().strip('"').strip().upper() for c in header.split(",")]
+    xi = next((i for i, c in enumerate(names) if c in _X_NAMES), None)
+    yi = next((i for i, c in enumerate(names) if c in _Y_NAMES), None)
+    if xi is None or yi is None:
+        return None
+    return xi, yi
+
+
+def _parse_polyline_csv(content: bytes) -> np.ndarray:
+    """Parse an X/Y polyline from CSV bytes.
+
+    When the header names the X/Y columns, only those two are parsed
+    (C engine, float64); otherwise the whole frame is read and the first
+    two numeric columns are used.
+    """
+    cols = _sniff_xy_columns(content)
+    if cols is not None:
+        xi, yi = cols
+        df = pd.read_csv(
+            io.BytesIO(content), usecols=[xi, yi], nrows=_CSV_MAX_ROWS, engine="c",
+        )
+        # ``usecols`` keeps file order; put X first
+        df = df.iloc[:, [0, 1] if xi < yi else [1, 0]]
+        return df.dropna().to_numpy(dtype=float)
+
+    df = pd.read_csv(io.BytesIO(content), nrows=_CSV_MAX_ROWS)
+    num_cols = df.select_dtypes(include=[np.number]).columns
+    if len(num_cols) < 2:
+        raise HTTPException(400, "Could not find X/Y columns")
+    return df[[num_cols[0], num_cols[1]]].dropna().values.astype(float)
+
+
 async def _get_design_mesh(session_id: str):
     """Load the design mesh from DB or raise 400.
 
@@ -108,15 +150,83 @@ async def _get_design_mesh(session_id: str):
     trimesh reconstruction itself is a CPU/IO-bound chunk already handed
     off to the threadpool by FastAPI for any subsequent ``def`` caller).
     """
+    return db.get_trimesh_by_id(await _get_design_mesh_id(session_id))
+
+
+async def _get_design_mesh_id(session_id: str) -> str:
+    """Return the stored design mesh id or raise 400."""
     mesh = await run_db(db.get_mesh, session_id, "design")
     if mesh is None:
         raise HTTPException(400, "Upload design mesh first")
-    return db.get_trimesh_by_id(mesh["id"])
+    return mesh["id"]
+
+
+@functools.lru_cache(maxsize=16)
+def _perpendicular_sections_cached(
+    polyline_bytes: bytes,
+    n_cols: int,
+    spacing: float,
+    length: float,
+    sector: str,
+    length_up: Optional[float],
+    length_down: Optional[float],
+    design_id: Optional[str],
+) -> tuple:
+    """Generate perpendicular sections for a polyline, cached in memory.
+
+    Keyed on the raw polyline coordinates and every generation parameter,
+    so re-submitting the same file or curve with the same settings reuses
+    the previous placement (and, with ``design_id``, the local-slope
+    azimuths) instead of walking the polyline and the mesh again. A
+    re-uploaded design mesh mints a new id and therefore a fresh entry.
+
+    The entries are shared across sessions, so they hold immutable tuples
+    of plain values; callers get fresh :class:`SectionLine` objects built
+    from them.
+    """
+    polyline = np.frombuffer(polyline_bytes, dtype=float).reshape(-1, n_cols)
+    design_mesh = db.get_trimesh_by_id(design_id) if design_id else None
+    return tuple(
+        (s.name, tuple(float(v) for v in s.origin), float(s.azimuth), float(s.length),
+         s.sector, s.file_name, s.length_up, s.length_down)
+        for s in generate_perpendicular_sections(
+            polyline, spacing, length, sector, design_mesh=design_mesh,
+            length_up=length_up, length_down=length_down,
+        )
+    )
+
 
+def _perpendicular_sections(
+    polyline: np.ndarray,
+    spacing: float,
+    length: float,
+    sector: str,
+    length_up: Optional[float] = None,
+    length_down: Optional[float] = None,
+    design_id: Optional[str] = None,
+) -> List[SectionLine]:
+    """Return fresh sections of ``polyline`` rebuilt from the cached placement."""
+    pts = np.ascontiguousarray(np.atleast_2d(np.asarray(polyline, dtype=float)))
+    cached = _perpendicular_sections_cached(
+        pts.tobytes(), pts.shape[1], float(spacing), float(length), sector,
+        length_up, length_down, design_id,
+    )
+    return [
+        SectionLine(name=name, origin=np.array(origin), azimuth=azimuth, length=length_,
+                    sector=sector_, file_name=file_name, length_up=up, length_down=down)
+        for name, origin, azimuth, length_, sector_, file_name, up, down in cached
+    ]
 
-async def _save_sections(session_id: str, sections: List[SectionLine]):
-    """Persist a list of SectionLine objects to the database."""
-    await run_db(db.save_sections, session_id, [_section_to_dict(s) for s in sections])
+
+async def _save_sections(session_id: str, sections: List[SectionLine]) -> List[dict]:
+    """Persist a list of SectionLine objects and return the stored dicts.
+
+    The returned list is exactly what was written (plain JSON types), so
+    handlers can build their response without reading the sections back.
+    """
+    stored = [_section_to_dict(s) for s in sections]
+    await run_db(db.save_sections, session_id, stored)
+    return stored
 
 
 async def _load_sections(session_id: str) -> List[dict]:
@@ -222,13 +332,16 @@ async def sections_auto(request: Request, params: SectionAutoParams):
     )
 
     # Override azimuth with local slope if requested
-    if params.az_method == "local_slope":
-        for sec in sections:
-            sec.azimuth = compute_local_azimuth(design_mesh, sec.origin)
-
-    await _save_sections(session_id, sections)
+    if params.az_method == "local_slope" and sections:
+        azimuths = await run_db(
+            compute_local_azimuth_batch,
+            design_mesh,
+            np.array([sec.origin for sec in sections]),
+        )
+        for sec, sec_az in zip(sections, azimuths.tolist()):
+            sec.azimuth = sec_az
 
-    stored = await _load_sections(session_id)
+    stored = await _save_sections(session_id, sections)
     return {
         "sections": [_section_to_response(i, s) for i, s in enumerate(stored)],
     }
@@ -251,8 +364,7 @@ async def sections_manual(request: Request, sections_data: List[SectionCreate]):
         )
         sections.append(sec)
 
-    await _save_sections(session_id, sections)
-    stored = await _load_sections(session_id)
+    stored = await _save_sections(session_id, sections)
     return {
         "message": f"{len(stored)} sections set",
         "sections": [_section_to_response(i, s) for i, s in enumerate(stored)],
@@ -274,7 +386,7 @@ async def add_section_click(request: Request, params: SectionClickParams):
 
     if params.az_mode == "auto":
         design_mesh = await _get_design_mesh(session_id)
-        az = compute_local_azimuth(design_mesh, origin)
+        az = await run_db(compute_local_azimuth, design_mesh, origin)
     else:
         az = params.azimuth if params.azimuth is not None else 0.0
 
@@ -294,8 +406,7 @@ async def add_section_click(request: Request, params: SectionClickParams):
     # Append and save
     new_sections = existing + [_section_to_dict(sec)]
     await run_db(db.save_sections, session_id, new_sections)
-
-    stored = await _load_sections(session_id)
+    stored = new_sections
     return {
         "section": _section_to_response(len(stored) - 1, stored[-1]),
         "total": len(stored),
@@ -320,7 +431,7 @@ async def sections_from_file(
     ``generate_perpendicular_sections()``.
     """
     session_id = await run_db(db.get_or_create_session, get_session_id(request))
-    design_mesh = await _get_design_mesh(session_id)
+    design_id = await _get_design_mesh_id(session_id)
 
     spacing_f = float(spacing)
     length_f = float(length)
@@ -332,52 +443,23 @@ async def sections_from_file(
     polyline = None
 
     if fname.endswith(".dxf"):
-        # Write to temp file for DXF loading
-        fd, tmp = tempfile.mkstemp(suffix=".dxf")
-        try:
-            with os.fdopen(fd, "wb") as f:
-                f.write(content)
-            polyline = load_dxf_polyline(tmp)
-        finally:
-            if os.path.exists(tmp):
-                os.unlink(tmp)
+        # Parsed straight from the upload bytes; no temp-file round-trip.
+        polyline = await run_db(load_dxf_polyline, io.BytesIO(content), file.filename)
         if polyline is None or len(polyline) == 0:
             raise HTTPException(400, "No polylines found in DXF")
     else:
         # CSV / TXT
-        df = pd.read_csv(io.BytesIO(content), nrows=10000)
-        x_col = next(
-            (c for c in df.columns if c.strip().upper() in ("X", "ESTE", "EAST", "E")),
-            None,
-        )
-        y_col = next(
-            (
-                c
-                for c in df.columns
-                if c.strip().upper() in ("Y", "NORTE", "NORTH", "N")
-            ),
-            None,
-        )
-        if x_col is None or y_col is None:
-            num_cols = df.select_dtypes(include=[np.number]).columns
-            if len(num_cols) >= 2:
-                x_col, y_col = num_cols[0], num_cols[1]
-            else:
-                raise HTTPException(400, "Could not find X/Y columns")
-        polyline = df[[x_col, y_col]].dropna().values.astype(float)
+        polyline = await run_db(_parse_polyline_csv, content)
 
     if len(polyline) < 2:
         raise HTTPException(400, "Polyline must have at least 2 points")
 
-    mesh_for_az = design_mesh if az_mode == "local_slope" else None
-    sections = generate_perpendicular_sections(
-        polyline, spacing_f, length_f, sector, design_mesh=mesh_for_az,
-        length_up=l_up_f, length_down=l_down_f
+    sections = await run_db(
+        _perpendicular_sections, polyline, spacing_f, length_f, sector,
+        l_up_f, l_down_f, design_id if az_mode == "local_slope" else None,
     )
 
-    await _save_sections(session_id, sections)
-
-    stored = await _load_sections(session_id)
+    stored = await _save_sections(session_id, sections)
     return {
         "sections": [_section_to_response(i, s) for i, s in enumerate(stored)],
         "polyline": polyline.tolist()
@@ -469,17 +551,12 @@ async def sections_curve(request: Request, params: SectionCurveParams):
     if len(points_array) < 2:
         raise HTTPException(400, "Curve must have at least 2 points")
 
-    sections = generate_perpendicular_sections(
-        points=points_array,
-        spacing=params.spacing,
-        section_length=params.length,
-        sector_name=params.sector,
-        length_up=params.length_up,
-        length_down=params.length_down
+    sections = await run_db(
+        _perpendicular_sections, points_array, params.spacing, params.length,
+        params.sector, params.length_up, params.length_down,
     )
 
-    await _save_sections(session_id, sections)
-    stored = await _load_sections(session_id)
+    stored = await _save_sections(session_id, sections)
     return {
         "sections": [_section_to_response(i, s) for i, s in enumerate(stored)],
     }
@@ -7,18 +7,19 @@ Uso:
 """
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
 from core import (
     load_mesh, get_mesh_bounds,
-    SectionLine, cut_mesh_with_section,
+    SectionLine,
     extract_parameters, compare_design_vs_asbuilt, export_results,
     generate_word_report,
 )
 from core.config import DETECTION, TOLERANCES, DEFAULTS
-from core.section_cutter import generate_sections_along_crest
+from core.section_cutter import cut_both_surfaces_batch, generate_sections_along_crest
 
 
 def parse_args():
@@ -125,11 +126,15 @@ def main():
         )
 
         if args.auto_azimuth:
-            from core.section_cutter import compute_local_azimuth
+            from core.section_cutter import compute_local_azimuth_batch
             print("⚠️ ADVERTENCIA: Usando cálculo de azimut por pendiente local (puede ser ruidoso)")
-            for sec in sections:
-                # CRITICAL: Always use design mesh for azimuth
-                sec.azimuth = compute_local_azimuth(mesh_design, sec.origin)
+            # CRITICAL: Always use design mesh for azimuth
+            azimuths = compute_local_azimuth_batch(
+                mesh_design,
+                np.array([sec.origin[:2] for sec in sections], dtype=float).reshape(-1, 2),
+            )
+            for sec, az in zip(sections, azimuths):
+                sec.azimuth = float(az)
     else:
         print("❌ Debe especificar --config o --auto para definir secciones")
         sys.exit(1)
@@ -144,43 +149,55 @@ def main():
     # Store data for report
     report_data = []
 
-    for i, section in enumerate(sections):
-        print(f"   Procesando {section.name}...", end=" ")
-        
-        pd = cut_mesh_with_section(mesh_design, section)
-        pt = cut_mesh_with_section(mesh_topo, section)
-        
+    # Cut every section in batched sweeps, then extract/compare sections
+    # concurrently; results are consumed in input order so the log and the
+    # exported tables match the serial run.
+    profiles = cut_both_surfaces_batch(mesh_design, mesh_topo, sections)
+
+    def _extract_section(item):
+        section, (pd, pt) = item
         if pd is None or pt is None:
-            print("⚠️ Sin intersección")
-            continue
-        
+            return None
         ep_d = extract_parameters(pd.distances, pd.elevations,
             section.name, section.sector, args.resolution,
             args.face_threshold, args.berm_threshold)
         ep_t = extract_parameters(pt.distances, pt.elevations,
             section.name, section.sector, args.resolution,
             args.face_threshold, args.berm_threshold)
-        
-        params_design.append(ep_d)
-        params_topo.append(ep_t)
-        
-        # Save profile data for report
-        if args.report:
-            report_data.append({
-                'section_name': section.name,
-                'params_design': ep_d,
-                'params_topo': ep_t,
-                'profile_d': (pd.distances, pd.elevations),
-                'profile_t': (pt.distances, pt.elevations),
-            })
-        
-        if ep_d.benches and ep_t.benches:
-            comp = compare_design_vs_asbuilt(ep_d, ep_t, tolerances)
-            comparisons.extend(comp)
-            print(f"✅ {len(ep_d.benches)} bancos diseño, {len(ep_t.benches)} bancos real")
-        else:
-            print(f"⚠️ Bancos: diseño={len(ep_d.benches)}, real={len(ep_t.benches)}")
-    
+        comp = (compare_design_vs_asbuilt(ep_d, ep_t, tolerances)
+                if ep_d.benches and ep_t.benches else None)
+        return ep_d, ep_t, comp
+
+    n_workers = max(1, min(DEFAULTS.max_section_workers, len(sections)))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        outcomes = executor.map(_extract_section, zip(sections, profiles))
+        for section, (pd, pt), outcome in zip(sections, profiles, outcomes):
+            print(f"   Procesando {section.name}...", end=" ")
+
+            if outcome is None:
+                print("⚠️ Sin intersección")
+                continue
+
+            ep_d, ep_t, comp = outcome
+            params_design.append(ep_d)
+            params_topo.append(ep_t)
+
+            # Save profile data for report
+            if args.report:
+                report_data.append({
+                    'section_name': section.name,
+                    'params_design': ep_d,
+                    'params_topo': ep_t,
+                    'profile_d': (pd.distances, pd.elevations),
+                    'profile_t': (pt.distances, pt.elevations),
+                })
+
+            if comp is not None:
+                comparisons.extend(comp)
+                print(f"✅ {len(ep_d.benches)} bancos diseño, {len(ep_t.benches)} bancos real")
+            else:
+                print(f"⚠️ Bancos: diseño={len(ep_d.benches)}, real={len(ep_t.benches)}")
+
     # Resumen
     if comparisons:
         n_total = len(comparisons) * 3
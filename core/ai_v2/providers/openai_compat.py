@@ -2,6 +2,10 @@
 MiniMax, GLM, Grok — anything that exposes an OpenAI-style /v1 endpoint."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import threading
+
 import httpx
 
 from openai import APIConnectionError, APIError, AsyncOpenAI
@@ -10,6 +14,24 @@ from openai.types.chat import ChatCompletionMessageParam
 from core.ai_v2.providers.base import BaseProvider
 
 
+def _close_client(loop: asyncio.AbstractEventLoop | None, client: AsyncOpenAI) -> None:
+    """Close ``client`` without blocking ``loop``; errors are ignored.
+
+    A client whose loop is still running is closed on that loop. Otherwise
+    its loop is gone and the pool is closed on a short-lived private loop.
+    """
+    async def _close() -> None:
+        with contextlib.suppress(Exception):
+            await client.close()
+
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(_close(), loop)
+        return
+    worker = threading.Thread(target=asyncio.run, args=(_close(),))
+    worker.start()
+    worker.join()
+
+
 class OpenAICompatibleProvider(BaseProvider):
     def __init__(
         self,
@@ -17,12 +39,50 @@ class OpenAICompatibleProvider(BaseProvider):
         api_key: str = "not-needed",
         name: str = "unknown",
         timeout_s: float = 120.0,
+        client: AsyncOpenAI | None = None,
     ) -> None:
-        self._client = AsyncOpenAI(
-            base_url=base_url, api_key=api_key, timeout=timeout_s
-        )
+        self._base_url = base_url
+        self._api_key = api_key
+        self._timeout_s = timeout_s
+        self._fixed_client = client
+        self._loop_client: tuple | None = None
         self._name = name
 
+    @property
+    def _client(self) -> AsyncOpenAI:
+        """HTTP client for the running event loop, built on first use.
+
+        The pooled connections of an ``AsyncOpenAI`` are bound to the loop
+        that opened them, so one client is kept per loop: a long-lived loop
+        (the API) reuses it across requests, while each ``asyncio.run`` in
+        the Streamlit tab gets a fresh one and the previous loop's client
+        is closed. A ``client`` passed to the constructor is used as-is on
+        every loop.
+        """
+        if self._fixed_client is not None:
+            return self._fixed_client
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        cached = self._loop_client
+        if cached is None or cached[0] is not loop:
+            if cached is not None:
+                _close_client(*cached)
+            client = AsyncOpenAI(
+                base_url=self._base_url, api_key=self._api_key,
+                timeout=self._timeout_s,
+            )
+            cached = (loop, client)
+            self._loop_client = cached
+        return cached[1]
+
+    def close(self) -> None:
+        """Close the HTTP client this provider built (not an injected one)."""
+        cached, self._loop_client = self._loop_client, None
+        if cached is not None:
+            _close_client(*cached)
+
     @property
     def name(self) -> str:
         return self._name
@@ -1,7 +1,10 @@
 """Provider registry and presets."""
 from __future__ import annotations
 
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 from enum import Enum
 
 from core.ai_v2.providers.openai_compat import OpenAICompatibleProvider
@@ -70,6 +73,40 @@ PROVIDER_PRESETS: dict[ProviderType, dict[str, str]] = {
 }
 
 
+# One provider per (endpoint, key), so reruns and repeated requests reuse
+# its HTTP client instead of building a new one each time. Keyed on a digest
+# of the API key, never the key itself; evicted providers close their client.
+_PROVIDER_CACHE_SIZE = 8
+_provider_cache: "OrderedDict[tuple, OpenAICompatibleProvider]" = OrderedDict()
+_provider_cache_lock = threading.Lock()
+
+
+def _cached_provider(base_url: str, api_key: str, name: str) -> OpenAICompatibleProvider:
+    """Return the shared provider for ``(base_url, api_key, name)``."""
+    key = (base_url, hashlib.sha256(api_key.encode()).hexdigest(), name)
+    evicted = []
+    with _provider_cache_lock:
+        provider = _provider_cache.get(key)
+        if provider is None:
+            provider = OpenAICompatibleProvider(base_url=base_url, api_key=api_key, name=name)
+            _provider_cache[key] = provider
+        _provider_cache.move_to_end(key)
+        while len(_provider_cache) > _PROVIDER_CACHE_SIZE:
+            evicted.append(_provider_cache.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return provider
+
+
+def _provider_cache_clear() -> None:
+    """Drop and close every cached provider (tests, key rotation)."""
+    with _provider_cache_lock:
+        providers = list(_provider_cache.values())
+        _provider_cache.clear()
+    for provider in providers:
+        provider.close()
+
+
 class ProviderRegistry:
     @classmethod
     def get(
@@ -79,11 +116,7 @@ class ProviderRegistry:
         if api_key is None:
             env_var = f"{provider_type.value.upper()}_API_KEY"
             api_key = os.environ.get(env_var, "not-needed")
-        return OpenAICompatibleProvider(
-            base_url=preset["base_url"],
-            api_key=api_key,
-            name=provider_type.value,
-        )
+        return _cached_provider(preset["base_url"], api_key, provider_type.value)
 
     @classmethod
     def get_default_model(cls, provider_type: ProviderType) -> str:
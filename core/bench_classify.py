@@ -42,11 +42,15 @@ def _extended_toe_distance(b):
 def _is_ramp(d_start: float, d_end: float, e_start: float, e_end: float,
              min_width: float = 6.0, max_slope_deg: float = 15.0) -> bool:
     """Return True when a segment is wide and gently sloped enough to be a ramp."""
-    width = abs(d_end - d_start)
-    if width < min_width:
-        return False
-    slope = abs(float(np.degrees(np.arctan2(e_end - e_start, width))))
-    return slope < max_slope_deg
+    return bool(_are_ramps(abs(d_end - d_start), e_start, e_end,
+                           min_width=min_width, max_slope_deg=max_slope_deg))
+
+
+def _are_ramps(widths, e_start, e_end, min_width: float = 6.0,
+               max_slope_deg: float = 15.0):
+    """Vectorised :func:`_is_ramp` over segment widths and end elevations."""
+    slope = np.abs(np.degrees(np.arctan2(e_end - e_start, widths)))
+    return (widths >= min_width) & (slope < max_slope_deg)
 
 
 def _segment_is_ramp(d_start: float, d_end: float,
@@ -59,15 +63,34 @@ def _segment_is_ramp(d_start: float, d_end: float,
     catch berms (toe of the upper bench ≈ crest of the lower bench) from
     being mislabelled as ramps.
     """
-    if classify_berm_as_ramp(width):
-        return True
-    descent = abs(e_end - e_start)
-    if descent > DETECTION.ramp_min_descent_m and _is_ramp(
-            d_start, d_end, e_start, e_end,
-            min_width=DETECTION.ramp_narrow_min_width,
-            max_slope_deg=DETECTION.ramp_max_slope_deg):
-        return True
-    return False
+    return bool(_segments_are_ramp(width, e_start, e_end, spans=abs(d_end - d_start)))
+
+
+def _extended_toe_distances(crest_d, toe_d, toe_e, face_angle, floor_e):
+    """Vectorised :func:`_extended_toe_distance` over bench columns."""
+    angle = np.radians(face_angle)
+    extend = (floor_e > 0) & (floor_e < toe_e) & (angle > 0.01)
+    out = toe_d.copy()
+    if extend.any():
+        face_dir = np.where(toe_d[extend] >= crest_d[extend], 1.0, -1.0)
+        delta_z = toe_e[extend] - floor_e[extend]
+        out[extend] += delta_z / np.tan(angle[extend]) * face_dir
+    return out
+
+
+def _segments_are_ramp(widths, e_start, e_end, spans=None):
+    """Vectorised :func:`_segment_is_ramp` over adjacent bench pairs.
+
+    ``spans`` is the horizontal extent of each segment used for the slope
+    test; it defaults to ``widths``.
+    """
+    if spans is None:
+        spans = widths
+    descending = np.abs(e_end - e_start) > DETECTION.ramp_min_descent_m
+    gentle = _are_ramps(spans, e_start, e_end,
+                        min_width=DETECTION.ramp_narrow_min_width,
+                        max_slope_deg=DETECTION.ramp_max_slope_deg)
+    return classify_berm_as_ramp(widths) | (descending & gentle)
 
 
 def _compute_berm_widths_from_profile(
@@ -97,34 +120,37 @@ def _compute_berm_widths_from_profile(
     benches[0].is_ramp = False
     benches[0].ramp_segment = False
     benches[0].group_break = False
+    if n_benches == 1:
+        return
 
-    for i in range(n_benches - 1):
-        b_curr = benches[i]
-        b_next = benches[i + 1]
-
-        # Usar el toe extendido del banco actual cuando exista piso local.
-        # Esto reduce el ancho de berm porque la cara extendida se acerca
-        # horizontalmente a la crest del banco siguiente.
-        curr_toe_d = _extended_toe_distance(b_curr)
-        curr_right = max(curr_toe_d, b_curr.crest_distance)
-        next_left = min(b_next.toe_distance, b_next.crest_distance)
-
-        width = float(abs(next_left - curr_right))
+    # One pass gathers the fields into columns; every adjacent pair is then
+    # measured and classified at once instead of per-bench attribute reads.
+    crest_d, crest_e, toe_d, toe_e, face, floor, spill = np.array(
+        [(b.crest_distance, b.crest_elevation, b.toe_distance, b.toe_elevation,
+          getattr(b, 'face_angle', 0.0), getattr(b, 'floor_elevation', 0.0),
+          b.spill_width) for b in benches],
+        dtype=float,
+    ).T
+
+    # Usar el toe extendido del banco actual cuando exista piso local.
+    # Esto reduce el ancho de berm porque la cara extendida se acerca
+    # horizontalmente a la crest del banco siguiente.
+    toe_ext = _extended_toe_distances(crest_d, toe_d, toe_e, face, floor)
+    curr_right = np.maximum(toe_ext[:-1], crest_d[:-1])
+    next_left = np.minimum(toe_d[1:], crest_d[1:])
+    widths = np.abs(next_left - curr_right)
+    effective = np.maximum(widths - spill[:-1], 0.0)
+    ramps = _segments_are_ramp(widths, toe_e[:-1], crest_e[1:])
+    breaks = widths >= max_berm_width
+
+    for b_next, width, eff, is_ramp_seg, brk in zip(
+            benches[1:], widths.tolist(), effective.tolist(),
+            ramps.tolist(), breaks.tolist()):
         b_next.berm_width = width
-        b_next.effective_berm_width = float(max(width - b_curr.spill_width, 0.0))
-
-        is_ramp_seg = _segment_is_ramp(
-            curr_right, next_left,
-            float(b_curr.toe_elevation), float(b_next.crest_elevation),
-            width,
-        )
+        b_next.effective_berm_width = eff
         b_next.is_ramp = is_ramp_seg
         b_next.ramp_segment = is_ramp_seg
-
-        if width >= max_berm_width:
-            b_next.group_break = True
-        else:
-            b_next.group_break = False
+        b_next.group_break = brk
 
 
 def _flat_segment_width(d_sub, e_sub, berm_threshold):
@@ -1187,6 +1187,16 @@ def compute_blast_geotech_correlation(
     dev_col = _deviation_column(comparisons)
     df_comp = pd.DataFrame(comparisons) if comparisons else pd.DataFrame()
 
+    # Index the comparison rows by section once, so each section below only
+    # touches its own rows instead of rescanning the whole list/frame.
+    comps_by_section: Dict[Any, List[dict]] = {}
+    for c in comparisons or []:
+        comps_by_section.setdefault(c.get("section"), []).append(c)
+    dev_by_section: Dict[Any, pd.Series] = (
+        {name: grp[dev_col] for name, grp in df_comp.groupby("section", sort=False)}
+        if dev_col and not df_comp.empty else {}
+    )
+
     rows: List[BlastCorrelationRow] = []
     for sec in sections:
         sec_name = getattr(sec, "name", str(sec))
@@ -1201,12 +1211,12 @@ def compute_blast_geotech_correlation(
             else None
         )
 
-        if dev_col and not df_comp.empty and sec_name in df_comp["section"].unique():
-            mean_dev = float(df_comp.loc[df_comp["section"] == sec_name, dev_col].abs().mean())
+        if sec_name in dev_by_section:
+            mean_dev = float(dev_by_section[sec_name].abs().mean())
         else:
             mean_dev = 0.0
 
-        signed = compute_signed_deviations(comparisons or [], sec_name)
+        signed = compute_signed_deviations(comps_by_section.get(sec_name, []), sec_name)
 
         proj = proyectar_pozos_en_seccion(
             df_pozos,
@@ -1273,8 +1283,11 @@ def compute_blast_geotech_correlation(
 
 
 def classify_berm_as_ramp(berm_width: float) -> bool:
-    """Return True when a berm of the given width is most likely a ramp."""
-    return RAMP.min_width <= berm_width <= RAMP.max_width
+    """Return True when a berm of the given width is most likely a ramp.
+
+    Also accepts an array of widths and returns a boolean mask.
+    """
+    return (RAMP.min_width <= berm_width) & (berm_width <= RAMP.max_width)
 
 
 def compute_monthly_trend(blast_df: pd.DataFrame, damage_col: str = 'avg_over_break') -> pd.DataFrame:
@@ -37,6 +37,39 @@ def is_passing_status(status: str) -> bool:
     return status in PASSING_STATUSES
 
 
+# Severity order used when several per-parameter statuses collapse into a
+# single verdict (e.g. one colour per section in the DXF export). Anything
+# not listed ranks as CUMPLE.
+STATUS_RANK = {STATUS_CUMPLE: 0, STATUS_FUERA: 1, STATUS_NO_CUMPLE: 2}
+_RANKED = (STATUS_CUMPLE, STATUS_FUERA, STATUS_NO_CUMPLE)
+
+
+def worst_status(*statuses: str) -> str:
+    """Return the most severe of ``statuses`` by :data:`STATUS_RANK`."""
+    rank = STATUS_RANK.get
+    return _RANKED[max((rank(s, 0) for s in statuses), default=0)]
+
+
+def worst_status_by_section(comparisons) -> dict:
+    """Fold height/angle/berm statuses into one worst status per section.
+
+    Single pass over ``comparisons``; rows without any ranked status leave
+    their section at ``CUMPLE``.
+    """
+    rank = STATUS_RANK.get
+    worst: dict = {}
+    for c in comparisons:
+        sec = c.get("section", "")
+        r = max(
+            rank(c.get("height_status", ""), 0),
+            rank(c.get("angle_status", ""), 0),
+            rank(c.get("berm_status", ""), 0),
+        )
+        if r > worst.get(sec, -1):
+            worst[sec] = r
+    return {sec: _RANKED[r] for sec, r in worst.items()}
+
+
 FEASIBILITY_APPLICABLE = "APPLICABLE"
 FEASIBILITY_CAUTION = "CAUTION"
 FEASIBILITY_INFEASIBLE = "INFEASIBLE"
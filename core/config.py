@@ -71,7 +71,9 @@ class PipelineDefaults:
     section_length: float = 200.0     # meters
     section_spacing: float = 20.0     # meters (for auto-generation)
     target_faces_visual: int = 30000  # target faces for mesh decimation
+    viz_target_faces: int = 200_000   # API display LOD (3D preview, contours)
     max_upload_mb: int = 500          # max file upload size
+    max_section_workers: int = 8      # thread cap for per-section processing
     match_threshold: float = 5.0      # meters, bench matching by elevation
     # Drill & Blast / geotech correlation
     blast_correlation_radius_m: float = 15.0   # meters — projection radius
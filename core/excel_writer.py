@@ -5,7 +5,7 @@ and raise ``ExcelWriterError`` on failure. Callers (api/routers/export,
 ui/tabs/export) can rely on a single exception type for error handling.
 See docs/BARRIDO_2026-06-21.md issue D2.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, BinaryIO, Optional, Union
 from dataclasses import dataclass
 
 import openpyxl
@@ -455,11 +455,16 @@ def _write_sector_summary(wb: Workbook, comparisons: List[Dict[str, Any]]) -> No
 
 def export_results(comparisons: List[Dict[str, Any]], params_design: List[Any],
                    params_topo: List[Any], tolerances: Dict[str, Any],
-                   output_path: str, project_info: Optional[Dict[str, str]] = None,
+                   output_path: Union[str, BinaryIO],
+                   project_info: Optional[Dict[str, str]] = None,
                    df_pozos: Optional[Any] = None,
                    sections: Optional[List[Any]] = None) -> None:
     """Export comparison results to a formatted Excel workbook.
 
+    ``output_path`` may be a filesystem path or a writable binary file
+    object (e.g. ``io.BytesIO``) so callers can stream the workbook
+    without a temp file.
+
     Raises:
         ExcelWriterError: if any sub-step of the export fails. The
             original exception is preserved via ``__cause__``.
@@ -4,6 +4,10 @@ import numpy as np
 from scipy.spatial import cKDTree
 from typing import Any
 
+# Below this many (eval x ref) point pairs a dense distance matrix is cheaper
+# than building a KD-tree (about 16 MB of float64 differences at the limit).
+_BRUTE_FORCE_MAX_PAIRS = 1_000_000
+
 
 def calculate_profile_deviation(profile_ref: Any, profile_eval: Any) -> np.ndarray:
     """
@@ -30,6 +34,12 @@ def calculate_profile_deviation(profile_ref: Any, profile_eval: Any) -> np.ndarr
     pts_ref = np.column_stack((profile_ref.distances, profile_ref.elevations))
     pts_eval = np.column_stack((profile_eval.distances, profile_eval.elevations))
     
+    # Typical sections hold a few hundred points, where tree construction
+    # costs more than comparing every pair outright.
+    if len(pts_ref) * len(pts_eval) <= _BRUTE_FORCE_MAX_PAIRS:
+        sq = ((pts_eval[:, None, :] - pts_ref[None, :, :]) ** 2).sum(axis=-1)
+        return np.sqrt(sq.min(axis=1))
+
     # Use KDTree for efficient nearest neighbor search
     tree = cKDTree(pts_ref)
     distances, _ = tree.query(pts_eval)
@@ -37,6 +47,16 @@ def calculate_profile_deviation(profile_ref: Any, profile_eval: Any) -> np.ndarr
     return distances
 
 
+def _sorted_profile(profile: Any) -> tuple[np.ndarray, np.ndarray]:
+    """``(distances, elevations)`` as float arrays ordered by distance."""
+    d = np.asarray(profile.distances, dtype=float)
+    z = np.asarray(profile.elevations, dtype=float)
+    if len(d) > 1 and np.any(d[1:] < d[:-1]):
+        order = np.argsort(d)
+        d, z = d[order], z[order]
+    return d, z
+
+
 def calculate_area_between_profiles(profile_ref: Any, profile_eval: Any) -> tuple[float, float, np.ndarray, np.ndarray, np.ndarray]:
     """
     Calculate area between two profiles (Design vs As-Built).
@@ -49,49 +69,55 @@ def calculate_area_between_profiles(profile_ref: Any, profile_eval: Any) -> tupl
             We assume profiles are (Distance, Elevation).
             We need to interpolate common X (Distance) axis.
     """
-    from scipy.interpolate import interp1d
-
     if profile_ref is None or profile_eval is None:
         return 0.0, 0.0
 
-    d_ref, z_ref = profile_ref.distances, profile_ref.elevations
-    d_eval, z_eval = profile_eval.distances, profile_eval.elevations
+    d_ref, z_ref = _sorted_profile(profile_ref)
+    d_eval, z_eval = _sorted_profile(profile_eval)
 
     if len(d_ref) < 2 or len(d_eval) < 2:
         return 0.0, 0.0
 
     # Determine common range
-    min_d = max(d_ref.min(), d_eval.min())
-    max_d = min(d_ref.max(), d_eval.max())
+    min_d = max(d_ref[0], d_eval[0])
+    max_d = min(d_ref[-1], d_eval[-1])
 
     if max_d <= min_d:
         return 0.0, 0.0
 
-    # Create common grid
-    # Resolution 0.1m for accurate area integration
-    common_d = np.arange(min_d, max_d, 0.1)
-    
-    # Interpolate
-    f_ref = interp1d(d_ref, z_ref, kind='linear', bounds_error=False, fill_value="extrapolate")
-    f_eval = interp1d(d_eval, z_eval, kind='linear', bounds_error=False, fill_value="extrapolate")
-    
-    z_ref_interp = f_ref(common_d)
-    z_eval_interp = f_eval(common_d)
+    if len(d_ref) == len(d_eval) and np.array_equal(d_ref, d_eval):
+        # Both profiles were sampled on the same stations (e.g. one cut
+        # grid): compare them directly, no interpolation needed.
+        common_d, z_ref_interp, z_eval_interp = d_ref, z_ref, z_eval
+    else:
+        # Create common grid from the profiles' own vertices. Both are
+        # piecewise linear, so no extra samples are needed between them.
+        common_d = np.union1d(d_ref, d_eval)
+        common_d = common_d[(common_d >= min_d) & (common_d <= max_d)]
+
+        # Interpolate. The grid lies inside both profiles' ranges, so plain
+        # linear interpolation needs no extrapolation and no interp1d objects.
+        z_ref_interp = np.interp(common_d, d_ref, z_ref)
+        z_eval_interp = np.interp(common_d, d_eval, z_eval)
     
     # Difference: Topo - Design
     diff = z_eval_interp - z_ref_interp
     
-    # Integration step (dx)
-    dx = 0.1
+    # Add the points where the profiles cross, so each trapezoid lies
+    # entirely on one side and the clipped areas below are exact.
+    cross = np.flatnonzero(diff[:-1] * diff[1:] < 0)
+    if cross.size:
+        t = diff[cross] / (diff[cross] - diff[cross + 1])
+        d_cross = common_d[cross] + t * (common_d[cross + 1] - common_d[cross])
+        common_d = np.insert(common_d, cross + 1, d_cross)
+        z_ref_interp = np.interp(common_d, d_ref, z_ref)
+        z_eval_interp = np.interp(common_d, d_eval, z_eval)
+        diff = z_eval_interp - z_ref_interp
     
     # Under-excavation (Deuda): Topo > Design (diff > 0)
     # Over-excavation (Sobre): Topo < Design (diff < 0)
-    
-    area_under_mask = diff > 0
-    area_over_mask = diff < 0
-    
-    area_under = np.sum(diff[area_under_mask]) * dx
-    area_over = np.sum(np.abs(diff[area_over_mask])) * dx
+    area_under = float(np.trapezoid(np.clip(diff, 0.0, None), x=common_d))
+    area_over = float(np.trapezoid(np.clip(-diff, 0.0, None), x=common_d))
     
     return area_over, area_under, common_d, z_ref_interp, z_eval_interp
 
@@ -1,12 +1,13 @@
 """Mesh loading, decimation, bounds extraction and conversion to plotly."""
 
+import io
 import logging
 import os
 
 import trimesh
 import numpy as np
 import plotly.graph_objects as go
-from typing import Dict, Any, Optional
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -149,36 +150,125 @@ def _load_dxf(filepath: str) -> trimesh.Trimesh:
     return mesh
 
 
-def load_dxf_polyline(file_path: str) -> np.ndarray:
+_BINARY_DXF_SENTINEL = b"AutoCAD Binary DXF\r\n\x1a\x00"
+
+
+def _read_dxf_stream(stream: BinaryIO):
+    """Parse a DXF document from an in-memory binary stream.
+
+    Binary DXF goes through ``ezdxf.recover.read``, which reads binary
+    streams directly. ASCII DXF goes through ``ezdxf.read`` on a text view
+    of the stream. Only geometry is read from these uploads, so the text is
+    decoded as UTF-8 with ``surrogateescape``: pre-2007 code-page bytes
+    in names or text survive without raising.
+    """
+    import ezdxf
+    from ezdxf import recover
+
+    head = stream.read(len(_BINARY_DXF_SENTINEL))
+    stream.seek(0)
+    if head == _BINARY_DXF_SENTINEL:
+        doc, _auditor = recover.read(stream)
+        return doc
+
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="surrogateescape")
+    try:
+        return ezdxf.read(text)
+    finally:
+        text.detach()  # leave the caller's binary stream open
+
+
+def load_dxf_polyline(source: Union[str, BinaryIO],
+                      name: Optional[str] = None) -> np.ndarray:
     """
     Load the first POLYLINE or LWPOLYLINE found in a DXF file.
+
+    ``source`` is a file path or a seekable binary stream (e.g.
+    ``io.BytesIO`` of an upload), which is parsed in memory. ``name``
+    labels the source in log messages (defaults to the path).
     Returns: np.ndarray of shape (N, 2) with X, Y coordinates.
     """
     try:
         import ezdxf
-        doc = ezdxf.readfile(file_path)
+        if hasattr(source, "read"):
+            doc = _read_dxf_stream(source)
+        else:
+            doc = ezdxf.readfile(source)
         msp = doc.modelspace()
+        xy = np.dtype((float, 2))
 
-        lwpolys = msp.query('LWPOLYLINE')
-        if len(lwpolys) > 0:
-            poly = lwpolys[0]
-            points = []
+        poly = next(iter(msp.query('LWPOLYLINE')), None)
+        if poly is not None:
             with poly.points("xy") as pts:
-                points = list(pts)
-            return np.array(points)
+                return np.fromiter(pts, dtype=xy, count=len(pts))
 
-        polys = msp.query('POLYLINE')
-        if len(polys) > 0:
-            poly = polys[0]
-            points = [v.dxf.location[:2] for v in poly.vertices]
-            return np.array(points)
+        poly = next(iter(msp.query('POLYLINE')), None)
+        if poly is not None:
+            return np.fromiter(((v.dxf.location.x, v.dxf.location.y) for v in poly.vertices),
+                               dtype=xy, count=len(poly))
 
         raise ValueError("No se encontraron entidades POLYLINE o LWPOLYLINE en el DXF.")
     except (ValueError, KeyError, AttributeError) as e:
-        logger.warning("DXF polyline extraction failed for %s: %s", file_path, e)
+        logger.warning("DXF polyline extraction failed for %s: %s", name or source, e)
         return np.array([])
 
 
+_STL_HEADER_BYTES = 84  # 80-byte preamble + uint32 triangle count
+_STL_TRIANGLE_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("v", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def _fast_load_binary_stl(filepath: str) -> Optional[trimesh.Trimesh]:
+    """Load a binary STL with one memory-mapped read and a vectorised merge.
+
+    ``trimesh.load`` parses binary STL with numpy too, but then spends most
+    of its time in ``merge_vertices`` (rounding + hashing every corner).
+    STL exporters write shared corners bit-identically, so here duplicates
+    are merged by sorting the raw float32 bit patterns instead, which is
+    ~3x faster on large meshes. Non-finite triangles are dropped, as
+    ``trimesh``'s processing does.
+
+    Returns ``None`` when the file is not a well-formed binary STL (ASCII
+    STL, or a size that disagrees with the header count) so the caller can
+    fall back to trimesh.
+    """
+    size = os.path.getsize(filepath)
+    if size < _STL_HEADER_BYTES:
+        return None
+    with open(filepath, "rb") as fh:
+        header = fh.read(_STL_HEADER_BYTES)
+    n_tri = int(np.frombuffer(header, dtype="<u4", count=1, offset=80)[0])
+    if n_tri == 0 or size != _STL_HEADER_BYTES + n_tri * _STL_TRIANGLE_DTYPE.itemsize:
+        return None
+
+    records = np.memmap(filepath, dtype=_STL_TRIANGLE_DTYPE, mode="r",
+                        offset=_STL_HEADER_BYTES, shape=(n_tri,))
+    # "+ 0.0" folds -0.0 into 0.0 so both merge as the same corner
+    tris = records["v"] + np.float32(0.0)
+    del records  # release the mapping before the caller unlinks the file
+
+    tris = tris[np.isfinite(tris).all(axis=(1, 2))]
+    if len(tris) == 0:
+        return None
+    corners = tris.reshape(-1, 3)
+
+    bits = corners.view(np.uint32)
+    order = np.lexsort((bits[:, 2], bits[:, 1], bits[:, 0]))
+    sorted_bits = bits[order]
+    is_new = np.empty(len(order), dtype=bool)
+    is_new[0] = True
+    np.any(sorted_bits[1:] != sorted_bits[:-1], axis=1, out=is_new[1:])
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(is_new) - 1
+
+    vertices = corners[order[is_new]].astype(np.float64)
+    return trimesh.Trimesh(vertices=vertices, faces=inverse.reshape(-1, 3),
+                           process=False)
+
+
 def load_mesh(filepath: str) -> trimesh.Trimesh:
     """Load a 3D surface mesh from STL, OBJ, PLY, or DXF file.
 
@@ -196,7 +286,10 @@ def load_mesh(filepath: str) -> trimesh.Trimesh:
     if str(filepath).lower().endswith('.dxf'):
         mesh = _load_dxf(filepath)
     else:
-        mesh = trimesh.load(filepath)
+        # Binary STL fast path; ASCII STL / OBJ / PLY go through trimesh
+        mesh = _fast_load_binary_stl(filepath) if is_stl else None
+        if mesh is None:
+            mesh = trimesh.load(filepath)
 
     if isinstance(mesh, trimesh.Scene):
         mesh = mesh.dump(concatenate=True)
@@ -276,13 +369,212 @@ def _vertex_clustering(mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trim
 
 
 def decimate_mesh(mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
-    """Reduce mesh face count for visualization performance."""
+    """Reduce mesh face count for visualization performance.
+
+    The result is memoised in the source mesh's trimesh cache per
+    ``target_faces``, so repeated calls on an unchanged mesh (UI reruns,
+    several views of the same surface) return the same decimated mesh;
+    editing the source vertices or faces invalidates it.
+    """
     if len(mesh.faces) <= target_faces:
         return mesh
+    cache = getattr(mesh, "_cache", None)
+    key = f"decimated_{int(target_faces)}"
+    cached = cache[key] if cache is not None else None
+    if cached is not None:
+        return cached
     try:
-        return mesh.simplify_quadric_decimation(face_count=target_faces)
+        out = mesh.simplify_quadric_decimation(face_count=target_faces)
     except (ImportError, Exception):
-        return _vertex_clustering(mesh, target_faces)
+        out = _vertex_clustering(mesh, target_faces)
+    if cache is not None:
+        cache[key] = out
+    return out
+
+
+def subsample_vertices(mesh, max_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evenly strided ``(x, y, z)`` columns of at most ``max_points`` vertices.
+
+    For plan/point-cloud backdrops. The columns are contiguous (ready for
+    plotting or JSON encoding) and memoised in the mesh's trimesh cache per
+    ``max_points``, so repeated views of an unchanged mesh reuse them.
+    """
+    cache = getattr(mesh, "_cache", None)
+    key = f"vertex_sample_{int(max_points)}"
+    cached = cache[key] if cache is not None else None
+    if cached is not None:
+        return cached
+    verts = np.asarray(mesh.vertices)
+    stride = max(1, -(-len(verts) // max(1, int(max_points))))
+    sub = verts[::stride]
+    out = tuple(np.ascontiguousarray(sub[:, i]) for i in range(3))
+    for col in out:
+        col.setflags(write=False)
+    if cache is not None:
+        cache[key] = out
+    return out
+
+
+_ELEVATION_GRID_FACE_CHUNK = 250_000
+
+
+def mesh_elevation_grid(mesh: trimesh.Trimesh,
+                        grid_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sample a mesh's elevation on a regular ``grid_size`` x ``grid_size`` XY grid.
+
+    Each grid node is interpolated linearly (barycentric) inside the mesh
+    face that covers it, so the result matches ``griddata(method='linear')``
+    over a triangulation without building one: the mesh already is a
+    triangulation. Nodes outside every face stay NaN; where faces overlap
+    in plan (overhangs) the highest surface wins. Faces are rasterised in
+    chunks to bound the temporary memory on large meshes.
+
+    Returns ``(xi, yi, zi_grid)`` with ``zi_grid`` indexed ``[row(y), col(x)]``.
+    """
+    verts = np.asarray(mesh.vertices, dtype=float)
+    faces = np.asarray(mesh.faces)
+    n = int(grid_size)
+    lo = verts[:, :2].min(axis=0)
+    hi = verts[:, :2].max(axis=0)
+    xi = np.linspace(lo[0], hi[0], n)
+    yi = np.linspace(lo[1], hi[1], n)
+    zi_grid = np.full((n, n), np.nan)
+    if len(faces) == 0 or n < 2:
+        return xi, yi, zi_grid
+    step = np.where(hi > lo, (hi - lo) / (n - 1), 1.0)
+    zi_flat = zi_grid.reshape(-1)
+    for start in range(0, len(faces), _ELEVATION_GRID_FACE_CHUNK):
+        _rasterise_faces(verts[faces[start:start + _ELEVATION_GRID_FACE_CHUNK]],
+                         xi, yi, lo, step, zi_flat)
+    return xi, yi, zi_grid
+
+
+def _rasterise_faces(tri, xi, yi, lo, step, zi_flat) -> None:
+    """Write the barycentric elevation of ``tri`` (F, 3, 3) into the grid nodes it covers."""
+    n = len(xi)
+    x0, x1, x2 = tri[:, 0, 0], tri[:, 1, 0], tri[:, 2, 0]
+    y0, y1, y2 = tri[:, 0, 1], tri[:, 1, 1], tri[:, 2, 1]
+    det = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+
+    # Grid nodes inside each face's bounding box (a hair of slack so nodes
+    # sitting exactly on a shared edge are not lost to rounding).
+    eps = 1e-9
+    gx = (tri[:, :, 0] - lo[0]) / step[0]
+    gy = (tri[:, :, 1] - lo[1]) / step[1]
+    c_lo = np.clip(np.ceil(gx.min(axis=1) - eps), 0, n).astype(np.intp)
+    c_hi = np.clip(np.floor(gx.max(axis=1) + eps), -1, n - 1).astype(np.intp)
+    r_lo = np.clip(np.ceil(gy.min(axis=1) - eps), 0, n).astype(np.intp)
+    r_hi = np.clip(np.floor(gy.max(axis=1) + eps), -1, n - 1).astype(np.intp)
+    n_cols = np.maximum(c_hi - c_lo + 1, 0)
+    counts = n_cols * np.maximum(r_hi - r_lo + 1, 0)
+    counts[det == 0] = 0                                 # vertical faces
+
+    f = np.repeat(np.arange(len(tri)), counts)
+    if len(f) == 0:
+        return
+    k = np.arange(len(f)) - np.repeat(np.cumsum(counts) - counts, counts)
+    col = c_lo[f] + k % n_cols[f]
+    row = r_lo[f] + k // n_cols[f]
+    px, py = xi[col], yi[row]
+
+    l0 = ((y1[f] - y2[f]) * (px - x2[f]) + (x2[f] - x1[f]) * (py - y2[f])) / det[f]
+    l1 = ((y2[f] - y0[f]) * (px - x2[f]) + (x0[f] - x2[f]) * (py - y2[f])) / det[f]
+    l2 = 1.0 - l0 - l1
+    inside = (l0 >= -eps) & (l1 >= -eps) & (l2 >= -eps)
+    f = f[inside]
+    z = (l0[inside] * tri[f, 0, 2] + l1[inside] * tri[f, 1, 2]
+         + l2[inside] * tri[f, 2, 2])
+
+    # Ascending z so the last (highest) write wins on overlapping faces;
+    # fmax keeps a higher value written by an earlier chunk.
+    order = np.argsort(z, kind="stable")
+    flat = (row[inside] * n + col[inside])[order]
+    zi_flat[flat] = np.fmax(zi_flat[flat], z[order])
+
+
+def _contour_lines_by_section(mesh: trimesh.Trimesh, levels) -> list:
+    """Per-level exact ``mesh.section`` fallback for :func:`mesh_contour_lines`."""
+    out = []
+    for z in levels:
+        slice_path = mesh.section(plane_origin=[0, 0, z], plane_normal=[0, 0, 1])
+        if slice_path is None:
+            continue
+        # slice_path.discrete gives ordered polylines (requires networkx)
+        segs = [np.asarray(poly)[:, :2] for poly in slice_path.discrete if len(poly) >= 2]
+        if segs:
+            out.append((float(z), segs))
+    return out
+
+
+def _contour_lines_by_tracer(mesh: trimesh.Trimesh, levels) -> list:
+    """Trace ``levels`` on the mesh triangles with matplotlib's public ``tricontour``.
+
+    The contour set is built on a bare :class:`~matplotlib.figure.Figure`
+    (no pyplot, no rendering); each level's path is split into polylines
+    at its ``MOVETO`` codes.
+    """
+    if not levels:
+        return []
+    import matplotlib.tri as mtri
+    from matplotlib.figure import Figure
+    from matplotlib.path import Path
+
+    triangulation = mtri.Triangulation(
+        mesh.vertices[:, 0], mesh.vertices[:, 1], mesh.faces
+    )
+    cs = Figure().add_subplot().tricontour(
+        triangulation, np.asarray(mesh.vertices[:, 2], dtype=float), levels=levels
+    )
+    out = []
+    for z, path in zip(cs.levels, cs.get_paths()):
+        verts = path.vertices
+        if len(verts) < 2:
+            continue
+        if path.codes is None:
+            parts = [verts]
+        else:
+            starts = np.flatnonzero(path.codes == Path.MOVETO)
+            parts = np.split(verts, starts[1:])
+        segs = [np.asarray(seg, dtype=float) for seg in parts if len(seg) >= 2]
+        if segs:
+            out.append((float(z), segs))
+    return out
+
+
+def mesh_contour_lines(mesh: trimesh.Trimesh, levels) -> list:
+    """Trace horizontal contour polylines of a mesh at the given elevations.
+
+    Levels strictly between vertex elevations are traced on the mesh's own
+    triangulation by matplotlib's ``tricontour`` (linear interpolation of
+    vertex Z inside each face), which builds the edge adjacency once and
+    walks every level in C++. That avoids one plane/face intersection plus
+    polyline re-assembly per level in ``mesh.section``, and never
+    re-triangulates the points the way ``griddata`` would.
+
+    A level that coincides with a vertex elevation (e.g. exactly at a flat
+    bench) is left to ``mesh.section``, whose handling of on-plane faces is
+    the reference output; so is every level if the tracer fails.
+
+    Returns a list of ``(elevation, [polyline (N, 2) array, ...])`` for the
+    levels that produced at least one polyline with two or more points.
+    """
+    levels = [float(z) for z in levels]
+    if len(mesh.faces) == 0 or not levels:
+        return []
+    z = np.asarray(mesh.vertices[:, 2], dtype=float)
+    z_lo, z_hi = float(z.min()), float(z.max())
+    on_vertex = np.isin(levels, z)
+    traced = sorted({lvl for lvl, hit in zip(levels, on_vertex)
+                     if not hit and z_lo < lvl < z_hi})
+    exact = sorted({lvl for lvl, hit in zip(levels, on_vertex) if hit})
+
+    try:
+        lines = dict(_contour_lines_by_tracer(mesh, traced))
+    except Exception as exc:  # noqa: BLE001 - degenerate input / backend issues
+        logger.debug("Triangle contour tracer failed (%s); using mesh.section", exc)
+        return _contour_lines_by_section(mesh, levels)
+    lines.update(_contour_lines_by_section(mesh, exact))
+    return [(lvl, lines[lvl]) for lvl in levels if lvl in lines]
 
 
 def mesh_to_plotly(mesh: trimesh.Trimesh, name: str, color: str, opacity: float) -> go.Mesh3d:
@@ -27,20 +27,25 @@ from core.bench_hazards import (
 from core.profile_compliance import (
     _evaluate_status,
     build_reconciled_profile,
+    build_reconciled_profile_cached,
     build_reconciled_profile_v2,
     compare_design_vs_asbuilt,
+    compare_design_vs_asbuilt_batch,
 )
 from core.profile_extract import (
+    BenchArrays,
     BenchParams,
     ExtractionResult,
     ReconciledPoint,
     ReconciledProfile,
     ReconciliationGap,
+    _bench_geometry_arrays,
     _build_reconciled_points,
     _detect_sub_benches,
     _discrete_curvature,
     _find_local_extrema,
     _vote_bench_detection,
+    bench_arrays,
     extract_parameters,
 )
 from core.profile_simplify import (
@@ -50,8 +55,9 @@ from core.profile_simplify import (
 
 __all__ = [
     "ReconciledPoint", "ReconciledProfile", "BenchParams", "ExtractionResult",
+    "BenchArrays", "bench_arrays",
     "ReconciliationGap",
-    "extract_parameters", "_build_reconciled_points",
+    "extract_parameters", "_build_reconciled_points", "_bench_geometry_arrays",
     "_detect_sub_benches", "_discrete_curvature", "_find_local_extrema",
     "_vote_bench_detection",
     "ramer_douglas_peucker", "_detect_and_project_solid_toe",
@@ -62,5 +68,6 @@ __all__ = [
     "_angle_between_segments", "_detect_wedge_shape_in_face",
     "_detect_toppling_potential", "_evaluate_angle_consistency",
     "_evaluate_status", "build_reconciled_profile", "build_reconciled_profile_v2",
-    "compare_design_vs_asbuilt",
+    "build_reconciled_profile_cached",
+    "compare_design_vs_asbuilt", "compare_design_vs_asbuilt_batch",
 ]
@@ -6,13 +6,17 @@ Three public functions live here:
   signed deviation and asymmetric tolerances.
 * :func:`build_reconciled_profile` (legacy) /
   :func:`build_reconciled_profile_v2` (preferred) — turn a list of
-  detected benches into an idealised polyline.
+  detected benches into an idealised polyline
+  (:func:`build_reconciled_profile_cached` memoises the v2 form).
 * :func:`compare_design_vs_asbuilt` — global best-fit (Hungarian)
   matching between design and as-built benches, with the per-bench
-  compliance scoring used by the Excel/Word reports.
+  compliance scoring used by the Excel/Word reports
+  (:func:`compare_design_vs_asbuilt_batch` for many sections at once).
 """
 
+import threading
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import List
 
@@ -32,6 +36,7 @@ from core.profile_extract import (
     ReconciledPoint,
     ReconciledProfile,
     _build_reconciled_points,
+    bench_arrays,
 )
 
 
@@ -53,6 +58,27 @@ def _evaluate_status(deviation, tol_neg, tol_pos):
         return STATUS_NO_CUMPLE
 
 
+# Status codes produced by :func:`_evaluate_status_codes`, indexed into
+# this table to get the tripartite status strings.
+_STATUS_BY_CODE = np.array([STATUS_CUMPLE, STATUS_FUERA, STATUS_NO_CUMPLE], dtype=object)
+
+
+def _evaluate_status_codes(deviation, tol_neg, tol_pos) -> np.ndarray:
+    """Vectorised :func:`_evaluate_status`: 0/1/2 codes per deviation.
+
+    Same thresholds (``<= limit`` passes, ``<= 1.5 * limit`` is out of
+    tolerance) with the limit chosen by the deviation's sign, evaluated
+    branch-free over the whole array.
+    """
+    dev = np.asarray(deviation, dtype=float)
+    limit = np.where(dev < 0, tol_neg, tol_pos)
+    abs_dev = np.abs(dev)
+    # NaN fails both comparisons and lands on NO CUMPLE, like the scalar path
+    return (
+        2 - (abs_dev <= limit).astype(np.int8) - (abs_dev <= limit * 1.5).astype(np.int8)
+    )
+
+
 def build_reconciled_profile(benches, *, source: str = "topo",
                              return_v2: bool = False,
                              profile=None,
@@ -197,33 +223,68 @@ def build_reconciled_profile_v2(
     )
 
 
+# Bench fields the reconciled polyline is built from; two bench lists with
+# equal values for these yield the same reconciled profile.
+_RECONCILED_BENCH_FIELDS = (
+    "bench_number", "crest_distance", "crest_elevation", "toe_distance",
+    "toe_elevation", "face_angle", "floor_elevation", "is_ramp",
+)
+_RECONCILED_CACHE_MAX = 256
+_reconciled_cache: "OrderedDict[tuple, ReconciledProfile]" = OrderedDict()
+_reconciled_cache_lock = threading.Lock()
+
+
+def build_reconciled_profile_cached(benches, *, source: str = "topo"):
+    """:func:`build_reconciled_profile_v2` memoised on the benches' geometry.
+
+    Plots, image ZIPs, Word reports and DXF exports rebuild the same
+    sections repeatedly. The key is a value signature of the benches, so
+    edited benches still produce a fresh profile; oldest entries are
+    evicted first once the cache is full. The returned object is shared
+    between callers and must not be mutated.
+    """
+    key = (source, tuple(
+        tuple(getattr(b, name) for name in _RECONCILED_BENCH_FIELDS) for b in benches
+    ))
+    with _reconciled_cache_lock:
+        prof = _reconciled_cache.get(key)
+    if prof is None:
+        prof = build_reconciled_profile_v2(benches, source=source)
+        with _reconciled_cache_lock:
+            _reconciled_cache[key] = prof
+            while len(_reconciled_cache) > _RECONCILED_CACHE_MAX:
+                _reconciled_cache.popitem(last=False)
+    return prof
+
+
 def _build_cost_matrix(
     benches_design: list, benches_topo: list, match_threshold: float = 8.0,
 ) -> np.ndarray:
     """Pairwise cost matrix (design x topo). Pairs above threshold are
     blocked with a huge cost so the Hungarian solver won't pair them.
     Cost = sqrt(1.5 * dz**2 + 1.0 * dx**2) (z-weighted)."""
-    n_d = len(benches_design)
-    n_t = len(benches_topo)
-    cost = np.zeros((n_d, n_t))
-    for i, bd in enumerate(benches_design):
-        bd_z = (bd.crest_elevation + bd.toe_elevation) / 2
-        bd_x = (bd.crest_distance + bd.toe_distance) / 2
-        for j, bt in enumerate(benches_topo):
-            bt_z = (bt.crest_elevation + bt.toe_elevation) / 2
-            bt_x = (bt.crest_distance + bt.toe_distance) / 2
-            diff_z = abs(bd_z - bt_z)
-            if diff_z >= match_threshold:
-                cost[i, j] = 1e9
-            else:
-                cost[i, j] = np.sqrt(1.5 * (bd_z - bt_z) ** 2 + 1.0 * (bd_x - bt_x) ** 2)
+    d = bench_arrays(benches_design)
+    t = bench_arrays(benches_topo)
+    bd_z = (d.crest_elevation + d.toe_elevation) / 2
+    bd_x = (d.crest_distance + d.toe_distance) / 2
+    bt_z = (t.crest_elevation + t.toe_elevation) / 2
+    bt_x = (t.crest_distance + t.toe_distance) / 2
+    dz = bd_z[:, None] - bt_z[None, :]
+    dx = bd_x[:, None] - bt_x[None, :]
+    cost = np.sqrt(1.5 * dz ** 2 + 1.0 * dx ** 2)
+    cost[np.abs(dz) >= match_threshold] = 1e9
     return cost
 
 
 def _build_match_row(
-    bd, bt, params_design, tolerances,
+    bd, bt, params_design, tolerances, status_codes=None,
 ) -> dict:
-    """Build a single MATCH comparison row (design + topo benches paired)."""
+    """Build a single MATCH comparison row (design + topo benches paired).
+
+    ``status_codes`` optionally carries the precomputed ``(height, angle)``
+    codes from :func:`_evaluate_status_codes`; when omitted they are
+    evaluated here for this one pair.
+    """
     height_dev = bt.bench_height - bd.bench_height
     angle_dev = bt.face_angle - bd.face_angle
 
@@ -238,13 +299,17 @@ def _build_match_row(
     berm_status = STATUS_CUMPLE if berm_complies else STATUS_NO_CUMPLE
     berm_score = 60 if berm_complies else 0
 
-    angle_complies = abs(angle_dev) <= (tol_a['neg'] if angle_dev < 0 else tol_a['pos'])
-    angle_status = _evaluate_status(angle_dev, tol_a['neg'], tol_a['pos'])
-    angle_score = 10 if angle_complies else 0
+    if status_codes is None:
+        height_code = int(_evaluate_status_codes(height_dev, tol_h['neg'], tol_h['pos']))
+        angle_code = int(_evaluate_status_codes(angle_dev, tol_a['neg'], tol_a['pos']))
+    else:
+        height_code, angle_code = status_codes
+
+    angle_status = _STATUS_BY_CODE[angle_code]
+    angle_score = 10 if angle_code == 0 else 0
 
-    height_complies = abs(height_dev) <= (tol_h['neg'] if height_dev < 0 else tol_h['pos'])
-    height_status = _evaluate_status(height_dev, tol_h['neg'], tol_h['pos'])
-    height_score = 30 if height_complies else 0
+    height_status = _STATUS_BY_CODE[height_code]
+    height_score = 30 if height_code == 0 else 0
 
     return {
         'sector': params_design.sector,
@@ -374,43 +439,39 @@ def _greedy_match_filter(candidates: list[tuple[int, int, float]]) -> list[tuple
     return valid
 
 
-def compare_design_vs_asbuilt(params_design, params_topo, tolerances):
-    """
-    Compare design vs as-built parameters using Global Best-Fit Matching (Hungarian Algorithm).
-    Now returns matches, missing design benches, and extra topo benches.
-    """
-    comparisons: list[dict] = []
-
-    benches_design = params_design.benches
-    benches_topo = params_topo.benches
-
-    n_d = len(benches_design)
-    n_t = len(benches_topo)
-
-    if n_d == 0 and n_t == 0:
-        return []
-
+def _match_section(params_design, params_topo) -> list[tuple[int, int]]:
+    """Best-fit ``(design_idx, topo_idx)`` bench pairs of one section, by design index."""
     match_threshold = 8.0
-    cost_matrix = _build_cost_matrix(benches_design, benches_topo, match_threshold)
+    cost_matrix = _build_cost_matrix(
+        params_design.benches, params_topo.benches, match_threshold)
     candidates = _resolve_optimal_matches(cost_matrix, match_threshold)
     valid_matches = _greedy_match_filter(candidates)
+    return sorted({r: c for r, c, _ in valid_matches}.items())
+
 
-    matched_design_indices = {r for r, c, _ in valid_matches}
-    matched_topo_indices = {c for r, c, _ in valid_matches}
-    design_to_topo = {r: c for r, c, _ in valid_matches}
+def _section_rows(params_design, params_topo, tolerances, matched,
+                  height_codes, angle_codes) -> list[dict]:
+    """Assemble the MATCH/MISSING/EXTRA rows of one section from its status codes."""
+    comparisons: list[dict] = []
+    benches_design = params_design.benches
+    benches_topo = params_topo.benches
 
-    for r in range(n_d):
-        if r in matched_design_indices:
-            c = design_to_topo[r]
-            comparisons.append(
-                _build_match_row(benches_design[r], benches_topo[c], params_design, tolerances)
+    for (r, c), h_code, a_code in zip(matched, height_codes, angle_codes):
+        comparisons.append(
+            _build_match_row(
+                benches_design[r], benches_topo[c], params_design, tolerances,
+                status_codes=(h_code, a_code),
             )
+        )
 
-    for i in range(n_d):
+    matched_design_indices = {r for r, _ in matched}
+    matched_topo_indices = {c for _, c in matched}
+
+    for i in range(len(benches_design)):
         if i not in matched_design_indices:
             comparisons.append(_build_missing_row(benches_design[i], params_design))
 
-    for j in range(n_t):
+    for j in range(len(benches_topo)):
         if j not in matched_topo_indices:
             comparisons.append(_build_extra_row(benches_topo[j], params_design))
 
@@ -427,6 +488,61 @@ def compare_design_vs_asbuilt(params_design, params_topo, tolerances):
     return comparisons
 
 
+def compare_design_vs_asbuilt_batch(pairs, tolerances) -> list[list[dict]]:
+    """Compare many ``(params_design, params_topo)`` sections at once.
+
+    Bench matching is still solved per section, but the height / angle
+    tolerance statuses of every matched pair across all sections are
+    evaluated in a single vectorised pass. Returns one comparison list per
+    input pair, each identical to :func:`compare_design_vs_asbuilt`.
+    """
+    pairs = list(pairs)
+    matches = [
+        _match_section(pd_, pt_) if pd_.benches or pt_.benches else None
+        for pd_, pt_ in pairs
+    ]
+
+    bench_d, bench_t = [], []
+    for (pd_, pt_), matched in zip(pairs, matches):
+        for r, c in matched or ():
+            bench_d.append(pd_.benches[r])
+            bench_t.append(pt_.benches[c])
+
+    height_codes: list = []
+    angle_codes: list = []
+    if bench_d:
+        d = bench_arrays(bench_d)
+        t = bench_arrays(bench_t)
+        tol_h = tolerances['bench_height']
+        tol_a = tolerances['face_angle']
+        height_codes = _evaluate_status_codes(
+            t.bench_height - d.bench_height, tol_h['neg'], tol_h['pos']).tolist()
+        angle_codes = _evaluate_status_codes(
+            t.face_angle - d.face_angle, tol_a['neg'], tol_a['pos']).tolist()
+
+    results: list[list[dict]] = []
+    offset = 0
+    for (pd_, pt_), matched in zip(pairs, matches):
+        if matched is None:
+            results.append([])
+            continue
+        end = offset + len(matched)
+        results.append(_section_rows(
+            pd_, pt_, tolerances, matched,
+            height_codes[offset:end], angle_codes[offset:end],
+        ))
+        offset = end
+    return results
+
+
+def compare_design_vs_asbuilt(params_design, params_topo, tolerances):
+    """
+    Compare design vs as-built parameters using Global Best-Fit Matching (Hungarian Algorithm).
+    Now returns matches, missing design benches, and extra topo benches.
+    """
+    return compare_design_vs_asbuilt_batch([(params_design, params_topo)], tolerances)[0]
+
+
 @dataclass
 class SectorDeviation:
     """Integrated deviations for a single sector between two profile points.
@@ -469,14 +585,20 @@ def _design_sector_boundaries(design_d: np.ndarray, design_e: np.ndarray) -> Lis
     de = np.diff(e)
     sign = np.sign(de)
     sign[sign == 0] = 1
-    boundaries: List[float] = []
-    for i in range(1, n - 1):
-        if sign[i - 1] > 0 and sign[i] < 0:
-            boundaries.append(float(d[i]))
-        elif sign[i - 1] < 0 and sign[i] > 0:
-            boundaries.append(float(d[i]))
-    boundaries = sorted(set(boundaries))
-    return boundaries
+    # Interior node i is an extremum when the slope sign flips across it;
+    # the product test also ignores NaN slopes, like the scalar checks did.
+    flips = (sign[:-1] * sign[1:]) < 0
+    return np.unique(d[1:-1][flips]).tolist()
+
+
+def _segment_reduce(ufunc: np.ufunc, values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Reduce ``values[lo[i]:hi[i]]`` for every segment with one ``reduceat``.
+
+    Segments must be non-empty and ordered so that ``lo[i + 1] >= hi[i] - 1``
+    (consecutive segments may share at most their boundary element).
+    """
+    padded = np.append(values, 0.0)
+    return ufunc.reduceat(padded, np.column_stack((lo, hi)).ravel())[::2]
 
 
 def _classify_sector(area_above: float, area_below: float, width: float, tolerance_m: float) -> str:
@@ -567,44 +689,62 @@ def compute_sector_deviations(
     edges = [d_lo] + [b for b in boundaries if d_lo < b < d_hi] + [d_hi]
     edges = sorted(set(edges))
 
+    # Each sector covers the contiguous grid nodes ``[lo, hi)``; adjacent
+    # sectors may share one node but never a grid interval, so every
+    # per-sector sum is a single ``reduceat`` over the whole profile.
+    edge_arr = np.asarray(edges, dtype=float)
+    starts = edge_arr[:-1]
+    ends = edge_arr[1:]
+    lo = np.searchsorted(common_d, starts, side="left")
+    hi = np.searchsorted(common_d, ends, side="right")
+    keep = (hi - lo) >= 2
+    if not np.any(keep):
+        return []
+    starts, ends, lo, hi = starts[keep], ends[keep], lo[keep], hi[keep]
+
+    delta = topo_interp - design_interp
+    positive = np.clip(delta, 0.0, None)
+    negative = np.clip(-delta, 0.0, None)
+    weight = np.abs(delta)
+    step = np.diff(common_d)
+
+    def _trapz(y: np.ndarray) -> np.ndarray:
+        return _segment_reduce(np.add, step * (y[1:] + y[:-1]) / 2.0, lo, hi - 1)
+
+    area_above = _trapz(positive)
+    area_below = _trapz(negative)
+    net_area = _trapz(delta)
+    mean_delta = _segment_reduce(np.add, delta, lo, hi) / (hi - lo)
+    max_delta = _segment_reduce(np.maximum, weight, lo, hi)
+    weight_sum = _segment_reduce(np.add, weight, lo, hi)
+    moment = _segment_reduce(np.add, common_d * weight, lo, hi)
+    weighted = weight_sum > 1e-9
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid_d = np.where(weighted, moment / weight_sum, 0.5 * (starts + ends))
+    # Sample delta within the sector's own nodes (clamped like the
+    # per-sector interpolation it replaces).
+    centroid_delta = np.interp(
+        np.clip(centroid_d, common_d[lo], common_d[hi - 1]), common_d, delta
+    )
+    widths = common_d[hi - 1] - common_d[lo]
+
     sectors: List[SectorDeviation] = []
-    for i in range(len(edges) - 1):
-        start = edges[i]
-        end = edges[i + 1]
-        mask = (common_d >= start) & (common_d <= end)
-        if not np.any(mask):
-            continue
-        d_seg = common_d[mask]
-        delta = topo_interp[mask] - design_interp[mask]
-        width = float(d_seg[-1] - d_seg[0])
-        if width <= 0:
-            continue
-        positive = np.clip(delta, 0.0, None)
-        negative = np.clip(-delta, 0.0, None)
-        area_above = float(np.trapezoid(positive, d_seg))
-        area_below = float(np.trapezoid(negative, d_seg))
-        net_area = float(np.trapezoid(delta, d_seg))
-        mean_delta = float(np.mean(delta))
-        max_delta = float(np.max(np.abs(delta)))
-        weight = np.abs(delta)
-        if weight.sum() > 1e-9:
-            centroid_d = float(np.sum(d_seg * weight) / np.sum(weight))
-        else:
-            centroid_d = float(0.5 * (start + end))
-        centroid_delta = float(np.interp(centroid_d, d_seg, delta))
-        classification = _classify_sector(area_above, area_below, width, float(tolerance_m))
+    for i in range(starts.size):
+        classification = _classify_sector(
+            float(area_above[i]), float(area_below[i]), float(widths[i]), float(tolerance_m)
+        )
         sectors.append(SectorDeviation(
             sector_id=len(sectors) + 1,
-            d_start=float(start),
-            d_end=float(end),
-            area_above_m2=area_above,
-            area_below_m2=area_below,
-            net_area_m2=net_area,
+            d_start=float(starts[i]),
+            d_end=float(ends[i]),
+            area_above_m2=float(area_above[i]),
+            area_below_m2=float(area_below[i]),
+            net_area_m2=float(net_area[i]),
             classification=classification,
-            mean_delta_h=mean_delta,
-            max_delta_h=max_delta,
-            centroid_d=centroid_d,
-            centroid_delta_h=centroid_delta,
+            mean_delta_h=float(mean_delta[i]),
+            max_delta_h=float(max_delta[i]),
+            centroid_d=float(centroid_d[i]),
+            centroid_delta_h=float(centroid_delta[i]),
         ))
 
     return sectors
@@ -16,7 +16,7 @@ import json
 import logging
 import math
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Tuple
+from typing import List, Literal, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -41,7 +41,7 @@ from core.bench_hazards import (
 from core.config import DETECTION, TOLERANCES
 from core.profile_simplify import (
     _detect_and_project_solid_toe,
-    ramer_douglas_peucker,
+    rdp_keep_mask,
 )
 
 SegmentType = Literal["crest", "berm_top", "berm_bottom", "toe", "face", "ramp"]
@@ -315,6 +315,35 @@ class ReconciliationGap:
     severity: str
 
 
+class BenchArrays(NamedTuple):
+    """Structure-of-arrays view of a bench list (one float array per field)."""
+    crest_distance: np.ndarray
+    crest_elevation: np.ndarray
+    toe_distance: np.ndarray
+    toe_elevation: np.ndarray
+    bench_height: np.ndarray
+    face_angle: np.ndarray
+    berm_width: np.ndarray
+
+
+def bench_arrays(benches: List[BenchParams]) -> BenchArrays:
+    """Gather the geometric bench fields into contiguous float arrays.
+
+    Built in a single pass so vectorised consumers (cost matrices, edit
+    recompute, serialisation) don't re-walk the dataclasses per field.
+    The :class:`BenchParams` list stays the source of truth; the view is a
+    snapshot and does not track later in-place edits.
+    """
+    if not benches:
+        empty = np.empty(0, dtype=float)
+        return BenchArrays(*([empty] * len(BenchArrays._fields)))
+    cols = np.array(
+        [[getattr(b, name) for name in BenchArrays._fields] for b in benches],
+        dtype=float,
+    )
+    return BenchArrays(*np.ascontiguousarray(cols.T))
+
+
 @dataclass
 class ExtractionResult:
     """Result of parameter extraction for a section."""
@@ -327,6 +356,10 @@ class ExtractionResult:
     floor_elevation: Optional[float] = None
     crest_elevation_max: Optional[float] = None
 
+    def bench_arrays(self) -> BenchArrays:
+        """SoA snapshot of :attr:`benches`; see :func:`bench_arrays`."""
+        return bench_arrays(self.benches)
+
 
 def _adaptive_smooth(elevations) -> np.ndarray:
     """Savitzky-Golay smoothing with a window scaled to profile length."""
@@ -375,36 +408,63 @@ def _find_local_extrema(distances, elevations, window: int = 3) -> Tuple[List[in
     d = np.asarray(distances, dtype=float)
     e = np.asarray(elevations, dtype=float)
     n = len(d)
-    crests: List[int] = []
-    toes: List[int] = []
     if n < 2 * window + 1:
-        return crests, toes
+        return [], []
     slope_sign = np.sign(np.diff(e))
-    for i in range(window, n - window):
-        incoming = slope_sign[i - 1]
-        outgoing = slope_sign[i]
-        if incoming >= 0 and outgoing < 0:
-            crests.append(i)
-        if incoming < 0 and outgoing >= 0:
-            toes.append(i)
+    # Point i sits between slope i-1 (incoming) and slope i (outgoing)
+    incoming = slope_sign[window - 1:n - window - 1]
+    outgoing = slope_sign[window:n - window]
+    idx = np.arange(window, n - window)
+    crests = idx[(incoming >= 0) & (outgoing < 0)].tolist()
+    toes = idx[(incoming < 0) & (outgoing >= 0)].tolist()
     return crests, toes
 
 
+class VoteFeatures(NamedTuple):
+    """Whole-profile inputs of the bench vote, computed once per profile."""
+    distances: np.ndarray
+    elevations: np.ndarray
+    curvature: np.ndarray
+    crest_distances: np.ndarray
+    toe_distances: np.ndarray
+    smoothed: np.ndarray
+
+
+def _vote_features(distances, elevations) -> VoteFeatures:
+    """Curvature, local extrema and smoothed profile shared by every vote."""
+    d = np.asarray(distances, dtype=float)
+    e = np.asarray(elevations, dtype=float)
+    crests, toes = _find_local_extrema(d, e, window=DETECTION.extrema_window)
+    return VoteFeatures(
+        distances=d,
+        elevations=e,
+        curvature=_discrete_curvature(d, e),
+        crest_distances=d[np.asarray(crests, dtype=int)],
+        toe_distances=d[np.asarray(toes, dtype=int)],
+        smoothed=_adaptive_smooth(e),
+    )
+
+
 def _vote_bench_detection(
     d_min: float,
     d_max: float,
     distances,
     elevations,
     face_threshold: float,
+    features: Optional[VoteFeatures] = None,
 ) -> Tuple[int, str]:
     """Count how many detection methods agree a ``[d_min, d_max]`` span is a face.
 
     Method A (RDP + angle) always agrees because it produced the candidate.
     Methods B (curvature), C (local extrema) and D (smoothed slope) vote
     independently. Returns ``(n_agreeing, method_label)``.
+
+    The B-D inputs only depend on the whole profile, so callers voting on
+    several spans pass ``features`` from :func:`_vote_features` once.
     """
-    d = np.asarray(distances, dtype=float)
-    e = np.asarray(elevations, dtype=float)
+    if features is None:
+        features = _vote_features(distances, elevations)
+    d = features.distances
     n_agree = 1
     labels = ["angle"]
 
@@ -413,7 +473,7 @@ def _vote_bench_detection(
     span = max(hi - lo, 1e-6)
     zone = span * 0.4 + 2.0
 
-    curv = _discrete_curvature(d, e)
+    curv = features.curvature
     left_mask = (d >= lo - zone) & (d <= lo + zone)
     right_mask = (d >= hi - zone) & (d <= hi + zone)
     left_curv = np.any(curv[left_mask] > DETECTION.curvature_threshold) if np.any(left_mask) else False
@@ -422,14 +482,15 @@ def _vote_bench_detection(
         n_agree += 1
         labels.append("curvature")
 
-    crests, toes = _find_local_extrema(d, e, window=DETECTION.extrema_window)
-    has_crest = any(lo - zone <= d[c] <= hi + zone for c in crests)
-    has_toe = any(lo - zone <= d[t] <= hi + zone for t in toes)
+    crest_d = features.crest_distances
+    toe_d = features.toe_distances
+    has_crest = np.any((crest_d >= lo - zone) & (crest_d <= hi + zone))
+    has_toe = np.any((toe_d >= lo - zone) & (toe_d <= hi + zone))
     if has_crest and has_toe:
         n_agree += 1
         labels.append("extrema")
 
-    e_smooth = _adaptive_smooth(e)
+    e_smooth = features.smoothed
     band = (d >= lo) & (d <= hi)
     if np.sum(band) >= 2:
         seg_d = d[band]
@@ -532,6 +593,25 @@ def _bench_from_points(
     )
 
 
+def _bench_geometry_arrays(crest_d, crest_e, toe_d, toe_e) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised bench height / face angle from crest-toe coordinates.
+
+    Array form of the per-bench recompute used after interactive editing:
+    ``height = |crest_e - toe_e|``; ``face_angle`` is the crest→toe slope in
+    degrees, or 90° when the horizontal run is under 1 cm.
+    """
+    crest_d = np.asarray(crest_d, dtype=float)
+    crest_e = np.asarray(crest_e, dtype=float)
+    toe_d = np.asarray(toe_d, dtype=float)
+    toe_e = np.asarray(toe_e, dtype=float)
+    dz = crest_e - toe_e
+    dx = np.abs(toe_d - crest_d)
+    face_angle = np.where(
+        dx > 0.01, np.abs(np.degrees(np.arctan2(dz, dx))), 90.0
+    )
+    return np.abs(dz), face_angle
+
+
 def _emit_reconciliation_gaps(
     detected: List[BenchParams],
     design_benches: List[BenchParams],
@@ -623,9 +703,12 @@ def _simplify_and_classify_segments(
     """
     if len(distances) < 3:
         return None
-    points = np.column_stack((distances, elevations))
-    epsilon = DETECTION.simplify_epsilon
-    simplified = ramer_douglas_peucker(points, epsilon)
+    distances = np.asarray(distances, dtype=float)
+    elevations = np.asarray(elevations, dtype=float)
+    # Simplify on the columns and stack only the kept vertices, rather than
+    # stacking the whole profile into an Nx2 array first.
+    keep = rdp_keep_mask(distances, elevations, DETECTION.simplify_epsilon)
+    simplified = np.column_stack((distances[keep], elevations[keep]))
     if len(simplified) < 2:
         return None
 
@@ -652,26 +735,17 @@ def _simplify_and_classify_segments(
 
 def _merge_adjacent_segments(segment_type: np.ndarray) -> list[dict]:
     """Coalesce consecutive equal-type segments into {start_idx, end_idx} dicts."""
-    merged: list[dict] = []
-    if len(segment_type) == 0:
-        return merged
-    current_type = segment_type[0]
-    start_idx = 0
-    for i in range(1, len(segment_type)):
-        if segment_type[i] != current_type:
-            merged.append({
-                'type': current_type,
-                'start_idx': start_idx,
-                'end_idx': i,
-            })
-            current_type = segment_type[i]
-            start_idx = i
-    merged.append({
-        'type': current_type,
-        'start_idx': start_idx,
-        'end_idx': len(segment_type),
-    })
-    return merged
+    segment_type = np.asarray(segment_type)
+    n = len(segment_type)
+    if n == 0:
+        return []
+    breaks = np.flatnonzero(segment_type[1:] != segment_type[:-1]) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [n]))
+    return [
+        {'type': t, 'start_idx': s, 'end_idx': e}
+        for t, s, e in zip(segment_type[starts].tolist(), starts.tolist(), ends.tolist())
+    ]
 
 
 def _build_face_bench(
@@ -683,6 +757,7 @@ def _build_face_bench(
     dists: np.ndarray, angles: np.ndarray,
     bench_num: int,
     prev_face_angle: float | None,
+    vote_features: Optional[VoteFeatures] = None,
 ) -> BenchParams:
     """Build a single BenchParams from a face segment, including toe/spill.
 
@@ -712,7 +787,7 @@ def _build_face_bench(
 
     n_agree, method_label = _vote_bench_detection(
         min(crest[0], toe[0]), max(crest[0], toe[0]),
-        distances, elevations, face_threshold,
+        distances, elevations, face_threshold, features=vote_features,
     )
     confidence = _confidence_from_vote(n_agree, source_points_total)
 
@@ -872,6 +947,7 @@ def extract_parameters(distances, elevations, section_name, sector,
 
     benches: list[BenchParams] = []
     bench_num = 0
+    vote_features: Optional[VoteFeatures] = None
 
     for seg in merged_segments:
         if seg['type'] != 1:
@@ -884,10 +960,12 @@ def extract_parameters(distances, elevations, section_name, sector,
 
         # Sub-bench split (multi-method vote) when face is wider than max_single_bench_width
         prev_face_angle = benches[-1].face_angle if benches else None
+        if vote_features is None:
+            vote_features = _vote_features(distances, elevations)
         new_bench = _build_face_bench(
             face_pts, simplified, distances, elevations,
             face_threshold, dx, dy, dists, angles,
-            bench_num + 1, prev_face_angle,
+            bench_num + 1, prev_face_angle, vote_features,
         )
         new_bench.wedge_risk = _detect_wedge_shape_in_face(new_bench)
         new_bench.toppling_risk = _detect_toppling_potential(new_bench, prev_face_angle)
@@ -9,6 +9,11 @@ import numpy as np
 
 from core.config import DETECTION
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover — optional speed-up
+    njit = None
+
 
 def ramer_douglas_peucker(points, epsilon):
     """
@@ -18,16 +23,39 @@ def ramer_douglas_peucker(points, epsilon):
 
     Iterative implementation (explicit stack + keep-mask): same output as
     the classic recursive version, without per-level array allocations or
-    recursion-depth limits on dense profiles.
+    recursion-depth limits on dense profiles. When numba is installed the
+    mask is computed by a compiled kernel instead.
     """
     points = np.asarray(points)
-    n = len(points)
-    if n < 3:
+    if len(points) < 3:
         return points
+    return points[rdp_keep_mask(points[:, 0], points[:, 1], epsilon)]
+
 
+def rdp_keep_mask(xs, ys, epsilon):
+    """Boolean mask of the vertices :func:`ramer_douglas_peucker` keeps.
+
+    Takes the coordinate columns separately, so callers holding distance
+    and elevation arrays need not stack them into an Nx2 array first.
+    """
+    # Contiguous coordinate columns, so each span reads two flat slices
+    # instead of strided views (no copy when they already are).
+    xs = np.ascontiguousarray(xs, dtype=float)
+    ys = np.ascontiguousarray(ys, dtype=float)
+    if len(xs) < 3:
+        return np.ones(len(xs), dtype=bool)
+    if _rdp_keep_mask_nb is not None:
+        return _rdp_keep_mask_nb(xs, ys, float(epsilon))
+    return _rdp_keep_mask(xs, ys, epsilon)
+
+
+def _rdp_keep_mask(xs, ys, epsilon):
+    """NumPy RDP kernel: boolean mask of the vertices to keep."""
+    n = len(xs)
     keep = np.zeros(n, dtype=bool)
     keep[0] = True
     keep[n - 1] = True
+    eps_sq = epsilon * epsilon
 
     stack = [(0, n - 1)]
     while stack:
@@ -35,27 +63,109 @@ def ramer_douglas_peucker(points, epsilon):
         if end - start < 2:
             continue
 
-        start_pt = points[start]
-        end_pt = points[end]
-        line_vec = end_pt - start_pt
-        line_len_sq = np.dot(line_vec, line_vec)
+        sx, sy = xs[start], ys[start]
+        lx, ly = xs[end] - sx, ys[end] - sy
+        line_len_sq = lx * lx + ly * ly
 
-        seg = points[start + 1:end]
+        seg_x = xs[start + 1:end] - sx
+        seg_y = ys[start + 1:end] - sy
         if line_len_sq == 0:
-            dists = np.linalg.norm(seg - start_pt, axis=1)
+            # Degenerate span: rank by squared radial distance.
+            score = seg_x * seg_x + seg_y * seg_y
+            limit = eps_sq
         else:
-            numer = np.abs(line_vec[0] * (seg[:, 1] - start_pt[1]) -
-                           line_vec[1] * (seg[:, 0] - start_pt[0]))
-            dists = numer / np.sqrt(line_len_sq)
+            # Perpendicular distance is |cross| / |line|: rank by |cross| and
+            # test the winner as cross**2 > eps**2 * |line|**2, so neither
+            # a division nor a square root is needed. The 2D cross is
+            # written out and accumulated in place into the fresh seg_y
+            # buffer, so each span allocates only the two offset arrays.
+            score = seg_y
+            score *= lx
+            seg_x *= ly
+            score -= seg_x
+            np.abs(score, out=score)
+            limit = eps_sq * line_len_sq
 
-        local_idx = int(np.argmax(dists))
-        if dists[local_idx] > epsilon:
+        local_idx = int(np.argmax(score))
+        best = score[local_idx]
+        if (best if line_len_sq == 0 else best * best) > limit:
             index = start + 1 + local_idx
             keep[index] = True
             stack.append((start, index))
             stack.append((index, end))
 
-    return points[keep]
+    return keep
+
+
+def _rdp_keep_mask_scalar(xs, ys, epsilon):
+    """Scalar-loop twin of :func:`_rdp_keep_mask`, compiled with numba.
+
+    Spans are scanned element by element, so there is no per-span NumPy
+    dispatch. A NaN score stops the split of its span, matching
+    ``np.argmax`` picking the NaN in the vectorised kernel.
+    """
+    n = xs.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = True
+    keep[n - 1] = True
+
+    eps_sq = epsilon * epsilon
+
+    starts = np.empty(2 * n, dtype=np.int64)
+    ends = np.empty(2 * n, dtype=np.int64)
+    starts[0] = 0
+    ends[0] = n - 1
+    top = 1
+    while top > 0:
+        top -= 1
+        start = starts[top]
+        end = ends[top]
+        if end - start < 2:
+            continue
+
+        sx = xs[start]
+        sy = ys[start]
+        lx = xs[end] - sx
+        ly = ys[end] - sy
+        line_len_sq = lx * lx + ly * ly
+        degenerate = line_len_sq == 0.0
+
+        best = -1.0
+        index = -1
+        for i in range(start + 1, end):
+            dx = xs[i] - sx
+            dy = ys[i] - sy
+            if degenerate:
+                score = dx * dx + dy * dy
+            else:
+                score = abs(lx * dy - ly * dx)
+            if score != score:
+                index = -1
+                break
+            if score > best:
+                best = score
+                index = i
+
+        if degenerate:
+            split = best > eps_sq
+        else:
+            split = best * best > eps_sq * line_len_sq
+        if index >= 0 and split:
+            keep[index] = True
+            starts[top] = start
+            ends[top] = index
+            top += 1
+            starts[top] = index
+            ends[top] = end
+            top += 1
+
+    return keep
+
+
+if njit is not None:
+    _rdp_keep_mask_nb = njit(cache=True)(_rdp_keep_mask_scalar)
+else:
+    _rdp_keep_mask_nb = None
 
 
 def _detect_and_project_solid_toe(sorted_face_pts: np.ndarray, face_threshold: float) -> tuple[float, float, np.ndarray]:
@@ -24,9 +24,19 @@ from core.compliance_status import (
     STATUS_NO_CUMPLE,
 )
 from core.config import DEFAULTS
+from core.profile_compliance import build_reconciled_profile_cached
+from core.section_cutter import section_endpoints
+
 
 def create_section_plot(params_design, params_topo, distances_d, elevations_d, distances_t, elevations_t,
-                        plot_options=None, section=None, df_pozos=None, filtered_bench_nums=None):
+                        plot_options=None, section=None, df_pozos=None, filtered_bench_nums=None,
+                        figure=None):
+    """Render one section profile as PNG bytes.
+
+    ``figure`` lets batch callers pass a ``matplotlib.figure.Figure`` that is
+    cleared and redrawn for every section instead of creating and closing a
+    pyplot figure each time; it is left open for the caller.
+    """
     if plot_options is None:
         plot_options = {}
     show_reconciled = plot_options.get('show_reconciled', True)
@@ -40,7 +50,12 @@ def create_section_plot(params_design, params_topo, distances_d, elevations_d, d
     if not tolerances:
         tolerances = {'bench_height': {'pos': 1.5}}
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    if figure is None:
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig = figure
+        fig.clear()
+        ax = fig.add_subplot()
 
     if len(distances_d) > 0:
         ax.plot(distances_d, elevations_d, color='royalblue', label='Diseño', linewidth=2)
@@ -70,22 +85,17 @@ def create_section_plot(params_design, params_topo, distances_d, elevations_d, d
             devs = calculate_profile_deviation(pd_prof, pt_prof)
             T = tolerances.get('bench_height', {}).get('pos', 1.5)
 
-            mask_ok = devs <= T
-            mask_warn = (devs > T) & (devs <= 1.5 * T)
-            mask_nok = devs > 1.5 * T
-
-            if np.any(mask_ok):
-                ax.scatter(distances_t[mask_ok], elevations_t[mask_ok], color='#006100', s=10, zorder=5)
-            if np.any(mask_warn):
-                ax.scatter(distances_t[mask_warn], elevations_t[mask_warn], color='#FFD700', s=12, zorder=5)
-            if np.any(mask_nok):
-                ax.scatter(distances_t[mask_nok], elevations_t[mask_nok], color='#FF0000', s=12, zorder=5)
+            # 0 = cumple (<= T), 1 = alerta (<= 1.5 T), 2 = no cumple.
+            codes = np.digitize(devs, np.array([T, 1.5 * T], dtype=float), right=True)
+            for code, color, size in ((0, '#006100', 10), (1, '#FFD700', 12), (2, '#FF0000', 12)):
+                m = (codes == code) & ~np.isnan(devs)
+                if np.any(m):
+                    ax.scatter(distances_t[m], elevations_t[m], color=color, s=size, zorder=5)
 
             ax.plot([], [], color='forestgreen', linewidth=2, label='Topografía Real')
         else:
             ax.plot(distances_t, elevations_t, color='forestgreen', label='Topografía Real', linewidth=2)
 
-    from core.param_extractor import build_reconciled_profile_v2
     # Estilos por tipo de segmento para el perfil idealizado.
     # La cara del banco se dibuja continua; la berma (horizontal) con
     # guiones; la rampa (transición oblicua) con punteado fino.
@@ -96,7 +106,7 @@ def create_section_plot(params_design, params_topo, distances_d, elevations_d, d
     }
     if show_reconciled:
         if params_topo and params_topo.benches:
-            rec_prof = build_reconciled_profile_v2(params_topo.benches, source="topo")
+            rec_prof = build_reconciled_profile_cached(params_topo.benches, source="topo")
             if len(rec_prof.distances) > 0:
                 # Trazo continuo base (para la leyenda y como fallback)
                 ax.plot(rec_prof.distances, rec_prof.elevations,
@@ -116,7 +126,7 @@ def create_section_plot(params_design, params_topo, distances_d, elevations_d, d
                     ax.plot(b.toe_distance, b.toe_elevation, marker='d', color='#FF7F0E', markersize=5, zorder=5)
 
         if params_design and params_design.benches:
-            rec_d_prof = build_reconciled_profile_v2(params_design.benches, source="design")
+            rec_d_prof = build_reconciled_profile_cached(params_design.benches, source="design")
             if len(rec_d_prof.distances) > 0:
                 ax.plot(rec_d_prof.distances, rec_d_prof.elevations,
                         color='royalblue', linestyle='--', linewidth=1.5, alpha=0.7)
@@ -223,7 +233,8 @@ def create_section_plot(params_design, params_topo, distances_d, elevations_d, d
 
     buf = io.BytesIO()
     fig.savefig(buf, format='png', dpi=200, bbox_inches='tight')
-    plt.close(fig)
+    if figure is None:
+        plt.close(fig)
     buf.seek(0)
     return buf
 
@@ -255,22 +266,11 @@ def create_plan_view_image(comparisons, sections, mesh_topo=None, grid_ref=0.0):
     fig, ax = plt.subplots(figsize=(10, 8))
 
     # ── Calcular bounding box de los perfiles para hacer zoom ──
-    all_x, all_y = [], []
-    for sec in sections:
-        origin = np.asarray(sec.origin)
-        az_rad = np.radians(sec.azimuth)
-        direction = np.array([np.sin(az_rad), np.cos(az_rad)])
-        half_len = sec.length / 2.0
-        p1 = origin - direction * half_len
-        p2 = origin + direction * half_len
-        all_x.extend([p1[0], p2[0]])
-        all_y.extend([p1[1], p2[1]])
-
-    if not all_x:
-        return None
-
-    x_min, x_max = min(all_x), max(all_x)
-    y_min, y_max = min(all_y), max(all_y)
+    # Extremos de todas las secciones en una sola pasada (N, 2)
+    p1s, p2s = section_endpoints(sections)
+    endpoints = np.concatenate((p1s, p2s))
+    x_min, y_min = endpoints.min(axis=0)
+    x_max, y_max = endpoints.max(axis=0)
     # Margen del 15% para que los labels no se corten
     x_margin = max((x_max - x_min) * 0.15, 20.0)
     y_margin = max((y_max - y_min) * 0.15, 20.0)
@@ -278,17 +278,10 @@ def create_plan_view_image(comparisons, sections, mesh_topo=None, grid_ref=0.0):
     # ── Background: topographic contour lines ──
     if mesh_topo is not None:
         try:
-            from scipy.interpolate import griddata
-            verts = mesh_topo.vertices
-            if len(verts) > 200_000:
-                step = len(verts) // 200_000
-                verts = verts[::step]
-            x, y, z = verts[:, 0], verts[:, 1], verts[:, 2]
+            from core.mesh_handler import mesh_elevation_grid
             grid_size = 300
-            xi = np.linspace(x.min(), x.max(), grid_size)
-            yi = np.linspace(y.min(), y.max(), grid_size)
+            xi, yi, zi_grid = mesh_elevation_grid(mesh_topo, grid_size)
             xi_grid, yi_grid = np.meshgrid(xi, yi)
-            zi_grid = griddata((x, y), z, (xi_grid, yi_grid), method='linear')
 
             z_min = float(np.nanmin(zi_grid))
             z_max = float(np.nanmax(zi_grid))
@@ -301,19 +294,12 @@ def create_plan_view_image(comparisons, sections, mesh_topo=None, grid_ref=0.0):
             pass  # Sin topo, solo perfiles
 
     # ── Section lines ──
-    for sec in sections:
+    for sec, p1, p2 in zip(sections, p1s, p2s):
         name = sec.name
         status = section_status.get(name, {'score': 0, 'cumple': False})
         color = '#2E7D32' if status['cumple'] else '#C62828'
         score = status['score']
 
-        origin = np.asarray(sec.origin)
-        az_rad = np.radians(sec.azimuth)
-        direction = np.array([np.sin(az_rad), np.cos(az_rad)])
-        half_len = sec.length / 2.0
-        p1 = origin - direction * half_len
-        p2 = origin + direction * half_len
-
         ax.plot([p1[0], p2[0]], [p1[1], p2[1]],
                 color=color, linewidth=3.5, solid_capstyle='round', zorder=5)
 
@@ -688,10 +674,13 @@ def generate_word_report(comparisons, all_data, output_path, project_info=None,
 
     doc.add_heading("3. Detalle por Sección", level=1)
 
+    comps_by_section = {}
+    for c in comparisons:
+        comps_by_section.setdefault(c['section'], []).append(c)
+
     valid_items = []
     for item in all_data:
-        sec_name = item['section_name']
-        sec_comps = [c for c in comparisons if c['section'] == sec_name]
+        sec_comps = comps_by_section.get(item['section_name'])
         if sec_comps:
             valid_items.append((item, sec_comps))
 
@@ -790,39 +779,46 @@ def generate_word_report(comparisons, all_data, output_path, project_info=None,
 
 def generate_section_images_zip(all_data, plot_options=None, sections=None, df_pozos=None, filtered_comps=None):
     import zipfile
+    from matplotlib.figure import Figure
 
     if plot_options is None:
         plot_options = {}
 
     zip_buffer = io.BytesIO()
 
+    bench_nums_by_section = {}
+    for c in filtered_comps or []:
+        bench_nums_by_section.setdefault(c['section'], set()).add(c['bench_num'])
+
+    sections_by_name = {}
+    for s in sections or []:
+        sections_by_name.setdefault(s.name, s)
+
+    # One off-screen figure redrawn per section: skips pyplot's per-image
+    # figure creation and teardown across the whole batch.
+    figure = Figure(figsize=(10, 6))
+
     with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
         for item in all_data:
             sec_name = item['section_name']
 
             filtered_bench_nums = None
             if filtered_comps:
-                sec_comps = [c for c in filtered_comps if c['section'] == sec_name]
-                if not sec_comps:
+                filtered_bench_nums = bench_nums_by_section.get(sec_name)
+                if not filtered_bench_nums:
                     continue
-                filtered_bench_nums = {c['bench_num'] for c in sec_comps}
 
             pd = item['params_design']
             pt = item['params_topo']
             prof_d = item['profile_d']
             prof_t = item['profile_t']
 
-            sec_obj = None
-            if sections:
-                for s in sections:
-                    if s.name == sec_name:
-                        sec_obj = s
-                        break
+            sec_obj = sections_by_name.get(sec_name)
 
             img_buf = create_section_plot(
                 pd, pt, prof_d[0], prof_d[1], prof_t[0], prof_t[1],
                 plot_options=plot_options, section=sec_obj, df_pozos=df_pozos,
-                filtered_bench_nums=filtered_bench_nums
+                filtered_bench_nums=filtered_bench_nums, figure=figure,
             )
 
             filename = f"{sec_name}.png"
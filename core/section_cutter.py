@@ -1,9 +1,11 @@
 """Section definition, generation and mesh cutting."""
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Optional
 import trimesh
+from scipy.spatial import cKDTree
 
 
 @dataclass
@@ -21,6 +23,23 @@ class SectionLine:
         if self.length_up is not None and self.length_down is not None:
             self.length = float(self.length_up + self.length_down)
 
+    @property
+    def direction(self) -> np.ndarray:
+        """Unit 2D direction vector for :attr:`azimuth` (read-only).
+
+        Memoised per azimuth value, so callers that touch the same section
+        repeatedly (cutting, DXF export, blast attribution) share one
+        ``sin``/``cos`` evaluation while still picking up re-assigned
+        azimuths (e.g. after ``compute_local_azimuth``).
+        """
+        cached = self.__dict__.get("_direction")
+        if cached is None or cached[0] != self.azimuth:
+            vec = azimuth_to_direction(self.azimuth)
+            vec.setflags(write=False)
+            cached = (self.azimuth, vec)
+            self._direction = cached
+        return cached[1]
+
 
 @dataclass
 class ProfileResult:
@@ -28,6 +47,20 @@ class ProfileResult:
     distances: np.ndarray
     elevations: np.ndarray
 
+    @property
+    def elev_max(self) -> float:
+        """Highest profile elevation (read-only).
+
+        Memoised per ``elevations`` array, so exporters that place labels
+        above every section reuse one reduction while still picking up a
+        re-assigned array.
+        """
+        cached = self.__dict__.get("_elev_max")
+        if cached is None or cached[0] is not self.elevations:
+            cached = (self.elevations, float(np.max(self.elevations)))
+            self._elev_max = cached
+        return cached[1]
+
 
 def azimuth_to_direction(azimuth_deg: float) -> np.ndarray:
     """Convert azimuth (degrees from North, clockwise) to 2D direction vector."""
@@ -35,36 +68,40 @@ def azimuth_to_direction(azimuth_deg: float) -> np.ndarray:
     return np.array([np.sin(az_rad), np.cos(az_rad)])
 
 
-def cut_mesh_with_section(mesh: trimesh.Trimesh, section: SectionLine) -> Optional[ProfileResult]:
-    """
-    Cut a mesh with a vertical plane defined by a SectionLine.
-    Returns a ProfileResult with distances and elevations, or None.
-    """
-    direction = azimuth_to_direction(section.azimuth)
+def azimuths_to_directions(azimuths_deg) -> np.ndarray:
+    """Vectorised :func:`azimuth_to_direction`: ``(N,)`` azimuths -> ``(N, 2)`` unit vectors."""
+    az_rad = np.radians(np.asarray(azimuths_deg, dtype=float).reshape(-1))
+    return np.column_stack((np.sin(az_rad), np.cos(az_rad)))
 
-    # Plane normal (perpendicular to direction in XY plane)
-    plane_normal = np.array([direction[1], -direction[0], 0.0])
-    plane_origin = np.array([section.origin[0], section.origin[1], 0.0])
 
-    try:
-        lines = trimesh.intersections.mesh_plane(
-            mesh, plane_normal, plane_origin
-        )
-    except (ValueError, np.linalg.LinAlgError, AttributeError):
-        # trimesh raises ValueError for malformed planes and numpy for
-        # degenerate geometry. AttributeError covers bad mesh objects.
-        return None
+def section_endpoints(sections) -> tuple[np.ndarray, np.ndarray]:
+    """Centred end points ``(p1, p2)`` of every section as two ``(N, 2)`` arrays.
 
-    if lines is None or len(lines) == 0:
-        return None
+    ``p1 = origin - direction * length / 2`` and ``p2`` its mirror, evaluated
+    once for the whole set so figure code can draw or bound N sections
+    without per-section temporaries.
+    """
+    sections = list(sections)
+    origins = np.array([np.asarray(s.origin, dtype=float)[:2] for s in sections],
+                       dtype=float).reshape(-1, 2)
+    lengths = np.fromiter((s.length for s in sections), dtype=float, count=len(sections))
+    half = azimuths_to_directions([s.azimuth for s in sections]) * (lengths[:, None] * 0.5)
+    return origins - half, origins + half
+
+
+def _section_window(section: SectionLine) -> tuple[float, float]:
+    """Signed along-section extent ``(lo, hi)`` measured from the origin."""
+    if getattr(section, 'length_up', None) is not None and getattr(section, 'length_down', None) is not None:
+        return -section.length_down, section.length_up
+    half_len = section.length / 2
+    return -half_len, half_len
 
-    # Collect all intersection points
-    points = []
-    for segment in lines:
-        for point in segment:
-            points.append(point)
 
-    points = np.array(points)
+def _profile_from_points(points: np.ndarray, section: SectionLine,
+                         direction: np.ndarray) -> Optional[ProfileResult]:
+    """Project 3D plane-intersection points onto a section and resample them."""
+    if len(points) == 0:
+        return None
 
     # Project onto section direction to get distance along section
     origin_2d = section.origin
@@ -73,11 +110,8 @@ def cut_mesh_with_section(mesh: trimesh.Trimesh, section: SectionLine) -> Option
     elevs = points[:, 2]
 
     # Filter by section length
-    if getattr(section, 'length_up', None) is not None and getattr(section, 'length_down', None) is not None:
-        mask = (dists >= -section.length_down) & (dists <= section.length_up)
-    else:
-        half_len = section.length / 2
-        mask = (dists >= -half_len) & (dists <= half_len)
+    lo, hi = _section_window(section)
+    mask = (dists >= lo) & (dists <= hi)
     dists = dists[mask]
     elevs = elevs[mask]
 
@@ -92,12 +126,8 @@ def cut_mesh_with_section(mesh: trimesh.Trimesh, section: SectionLine) -> Option
     # Remove near-duplicate distances by rounding and averaging elevations
     rounded = np.round(dists, 3)
     unique_dists, inv = np.unique(rounded, return_inverse=True)
-    unique_elevs = np.zeros(len(unique_dists))
-    counts = np.zeros(len(unique_dists))
-    for idx, uid in enumerate(inv):
-        unique_elevs[uid] += elevs[idx]
-        counts[uid] += 1
-    unique_elevs /= counts
+    unique_elevs = (np.bincount(inv, weights=elevs, minlength=len(unique_dists))
+                    / np.bincount(inv, minlength=len(unique_dists)))
 
     # Densificar el perfil con resampling uniforme. La intersección
     # plano-mesh produce puntos solo en los bordes de los triángulos,
@@ -118,6 +148,157 @@ def cut_mesh_with_section(mesh: trimesh.Trimesh, section: SectionLine) -> Option
     return ProfileResult(distances=unique_dists, elevations=unique_elevs)
 
 
+def face_xy_index(mesh: trimesh.Trimesh) -> tuple[cKDTree, float]:
+    """KD-tree over face centroids (XY) plus the largest centroid-to-vertex
+    XY distance, built once per mesh and kept in the mesh's trimesh cache.
+
+    Every point of a face lies within that reach of its centroid, so a ball
+    query of radius ``reach`` around a segment finds every face it touches.
+    """
+    cache = getattr(mesh, "_cache", None)
+    index = cache["face_xy_index"] if cache is not None else None
+    if index is None:
+        triangles = np.asarray(mesh.triangles, dtype=float)[:, :, :2]
+        centroids = triangles.mean(axis=1)
+        offsets = triangles - centroids[:, None, :]
+        reach = float(np.sqrt((offsets ** 2).sum(axis=2)).max()) if len(triangles) else 0.0
+        index = (cKDTree(centroids), reach)
+        if cache is not None:
+            cache["face_xy_index"] = index
+    return index
+
+
+def _faces_near_section(mesh: trimesh.Trimesh, section: SectionLine,
+                        direction: np.ndarray) -> np.ndarray:
+    """Indices of the faces that can touch the section segment.
+
+    The segment is sampled every ``2 * reach`` and each sample queried with
+    radius ``2 * reach``, which covers every point within ``reach`` of the
+    segment, so the cut only visits faces near the section instead of the
+    whole mesh.
+    """
+    tree, reach = face_xy_index(mesh)
+    if tree.n == 0:
+        return np.empty(0, dtype=np.int64)
+    lo, hi = _section_window(section)
+    radius = 2.0 * reach + 1e-6
+    n_samples = max(2, int(np.ceil((hi - lo) / radius)) + 1)
+    along = np.linspace(lo, hi, n_samples)
+    samples = np.asarray(section.origin, dtype=float)[:2] + along[:, None] * direction
+    hits = tree.query_ball_point(samples, radius, return_sorted=False)
+    if not any(len(h) for h in hits):
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate([np.asarray(h, dtype=np.int64) for h in hits]))
+
+
+def cut_mesh_with_section(mesh: trimesh.Trimesh, section: SectionLine) -> Optional[ProfileResult]:
+    """
+    Cut a mesh with a vertical plane defined by a SectionLine.
+    Returns a ProfileResult with distances and elevations, or None.
+
+    Only the faces near the section segment (see ``face_xy_index``) are
+    sliced, so the per-section cost scales with the section length rather
+    than with the size of the mesh.
+    """
+    direction = section.direction
+
+    # Plane normal (perpendicular to direction in XY plane)
+    plane_normal = np.array([direction[1], -direction[0], 0.0])
+    plane_origin = np.array([section.origin[0], section.origin[1], 0.0])
+
+    try:
+        local_faces = _faces_near_section(mesh, section, direction)
+        if len(local_faces) == 0:
+            return None
+        # Slice a compact submesh of just the local faces, built from
+        # plain-array views: arithmetic or fancy indexing on trimesh's
+        # tracked arrays marks them dirty, forcing a full re-hash of the
+        # mesh on the next cache lookup (``face_xy_index`` of the next
+        # section). ``process=False`` keeps the vertex order, so the
+        # precomputed dots line up with the submesh vertices.
+        local_verts, local_tris = np.unique(
+            np.asarray(mesh.faces)[local_faces], return_inverse=True)
+        local_xyz = np.asarray(mesh.vertices, dtype=float)[local_verts]
+        submesh = trimesh.Trimesh(
+            vertices=local_xyz, faces=local_tris.reshape(-1, 3), process=False,
+        )
+        dots = ((local_xyz[:, 0] - plane_origin[0]) * plane_normal[0]
+                + (local_xyz[:, 1] - plane_origin[1]) * plane_normal[1])
+        lines = trimesh.intersections.mesh_plane(
+            submesh, plane_normal, plane_origin, cached_dots=dots,
+        )
+    except (ValueError, np.linalg.LinAlgError, AttributeError):
+        # trimesh raises ValueError for malformed planes and numpy for
+        # degenerate geometry. AttributeError covers bad mesh objects.
+        return None
+
+    if lines is None or len(lines) == 0:
+        return None
+
+    # Collect all intersection points
+    points = np.asarray(lines, dtype=float).reshape(-1, 3)
+    return _profile_from_points(points, section, direction)
+
+
+def cut_mesh_with_sections(mesh: trimesh.Trimesh,
+                           sections: List[SectionLine]) -> List[Optional[ProfileResult]]:
+    """
+    Cut a mesh with many vertical section planes.
+
+    Equivalent to calling ``cut_mesh_with_section`` once per section, but the
+    crossing points are interpolated directly on the mesh's unique edges, and
+    each section only looks at the vertices and edges of the faces near its
+    segment (see ``face_xy_index``), so the bytes touched per section scale
+    with the section length instead of the mesh size.
+
+    Returns one ProfileResult (or None) per section, in input order.
+    """
+    if not sections:
+        return []
+
+    try:
+        vertices = np.asarray(mesh.vertices, dtype=float)
+        faces = np.asarray(mesh.faces)
+        edges = np.asarray(mesh.edges_unique)
+        face_edges = np.asarray(mesh.faces_unique_edges)
+    except (ValueError, AttributeError):
+        return [None] * len(sections)
+    if len(vertices) == 0 or len(edges) == 0:
+        return [None] * len(sections)
+
+    directions = np.array([s.direction for s in sections])
+    normals = np.column_stack([directions[:, 1], -directions[:, 0]])
+    origins = np.array([np.asarray(s.origin, dtype=float)[:2] for s in sections])
+    offsets = np.einsum('sj,sj->s', origins, normals)
+
+    # Signed vertex-to-plane distances, only ever filled for local vertices
+    signed = np.empty(len(vertices))
+
+    results: List[Optional[ProfileResult]] = []
+    for k, section in enumerate(sections):
+        local_faces = _faces_near_section(mesh, section, directions[k])
+        if len(local_faces) == 0:
+            results.append(None)
+            continue
+        local_verts = np.unique(faces[local_faces])
+        local_edges = np.unique(face_edges[local_faces])
+
+        signed[local_verts] = vertices[local_verts, :2] @ normals[k] - offsets[k]
+        ends = edges[local_edges]
+        s_a = signed[ends[:, 0]]
+        s_b = signed[ends[:, 1]]
+        idx = np.flatnonzero((s_a * s_b) < 0)
+        edge_a = vertices[ends[idx, 0]]
+        sa = s_a[idx]
+        t = sa / (sa - s_b[idx])
+        points = edge_a + t[:, None] * (vertices[ends[idx, 1]] - edge_a)
+        on_plane = vertices[local_verts[signed[local_verts] == 0.0]]
+        if len(on_plane):
+            points = np.vstack([points, on_plane])
+        results.append(_profile_from_points(points, section, directions[k]))
+    return results
+
+
 def cut_both_surfaces(mesh_design: trimesh.Trimesh, mesh_topo: trimesh.Trimesh,
                       section: SectionLine) -> tuple[Optional[ProfileResult], Optional[ProfileResult]]:
     """Cut both design and topo meshes with the same section."""
@@ -126,6 +307,43 @@ def cut_both_surfaces(mesh_design: trimesh.Trimesh, mesh_topo: trimesh.Trimesh,
     return pd, pt
 
 
+def cut_both_surfaces_batch(
+    mesh_design: trimesh.Trimesh, mesh_topo: trimesh.Trimesh,
+    sections: List[SectionLine],
+) -> List[tuple[Optional[ProfileResult], Optional[ProfileResult]]]:
+    """Cut both design and topo meshes with every section in batched sweeps.
+
+    The two sweeps are independent, so they run on two threads (the NumPy
+    kernels release the GIL). When the same mesh is passed for both
+    surfaces the sweeps stay sequential, since its lazy caches are not
+    thread-safe.
+    """
+    if mesh_design is mesh_topo or len(sections) < 2:
+        design = cut_mesh_with_sections(mesh_design, sections)
+        topo = cut_mesh_with_sections(mesh_topo, sections)
+        return list(zip(design, topo))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        design = executor.submit(cut_mesh_with_sections, mesh_design, sections)
+        topo = executor.submit(cut_mesh_with_sections, mesh_topo, sections)
+        return list(zip(design.result(), topo.result()))
+
+
+def vertex_xy_kdtree(mesh: trimesh.Trimesh) -> cKDTree:
+    """KD-tree over the mesh's vertex XY coordinates, built once per mesh.
+
+    Stored in the mesh's own trimesh cache, so it lives as long as the mesh
+    object (``api.database.get_trimesh_by_id`` keeps those around) and is
+    dropped automatically if the vertices are modified.
+    """
+    cache = getattr(mesh, "_cache", None)
+    tree = cache["vertex_xy_kdtree"] if cache is not None else None
+    if tree is None:
+        tree = cKDTree(np.asarray(mesh.vertices, dtype=float)[:, :2])
+        if cache is not None:
+            cache["vertex_xy_kdtree"] = tree
+    return tree
+
+
 def compute_local_azimuth(design_mesh: trimesh.Trimesh, point_xy: np.ndarray,
                           radius: float = 50.0) -> float:
     """
@@ -140,19 +358,27 @@ def compute_local_azimuth(design_mesh: trimesh.Trimesh, point_xy: np.ndarray,
     Returns:
         float: Azimuth in degrees (0=N, 90=E). Returns 0.0 if not enough neighbors.
     """
-    verts = design_mesh.vertices
-    dx = verts[:, 0] - point_xy[0]
-    dy = verts[:, 1] - point_xy[1]
-    dists_sq = dx ** 2 + dy ** 2
-
-    mask = dists_sq < radius ** 2
-    if mask.sum() < 10:
-        mask = dists_sq < (radius * 3) ** 2
-        if mask.sum() < 10:
+    # Plain ndarray view: indexing the TrackedArray itself would flag the
+    # mesh hash dirty and make the next cached-tree lookup re-hash the mesh.
+    verts = np.asarray(design_mesh.vertices, dtype=float)
+    tree = vertex_xy_kdtree(design_mesh)
+    xy = np.asarray(point_xy, dtype=float)[:2]
+
+    def _within(r: float) -> np.ndarray:
+        # Ball query, then keep the strict ``< r`` boundary of the original
+        # brute-force mask; sorted so rows stay in vertex order.
+        idx = np.sort(np.asarray(tree.query_ball_point(xy, r), dtype=np.intp))
+        d = tree.data[idx] - xy
+        return idx[np.einsum('ij,ij->i', d, d) < r ** 2]
+
+    idx = _within(radius)
+    if len(idx) < 10:
+        idx = _within(radius * 3)
+        if len(idx) < 10:
             # Fallback: cannot determine slope, return 0.0 (North)
             return 0.0
 
-    local_verts = verts[mask]
+    local_verts = verts[idx]
 
     # Fit plane z = a*x + b*y + c via least squares
     A = np.column_stack([local_verts[:, 0], local_verts[:, 1],
@@ -175,6 +401,89 @@ def compute_local_azimuth(design_mesh: trimesh.Trimesh, point_xy: np.ndarray,
     return float(azimuth)
 
 
+def _ball_neighbours(tree: cKDTree, pts: np.ndarray, r: float):
+    """Flat ``(vertex_idx, owner)`` pairs of vertices strictly within ``r`` of each point."""
+    lists = tree.query_ball_point(pts, r)
+    lens = np.fromiter((len(l) for l in lists), dtype=np.intp, count=len(pts))
+    if lens.sum() == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    flat = np.concatenate([np.asarray(l, dtype=np.intp) for l in lists])
+    owner = np.repeat(np.arange(len(pts)), lens)
+    d = tree.data[flat] - pts[owner]
+    keep = np.einsum('ij,ij->i', d, d) < r ** 2
+    return flat[keep], owner[keep]
+
+
+def compute_local_azimuth_batch(design_mesh: trimesh.Trimesh, origins,
+                                radius: float = 50.0) -> np.ndarray:
+    """Vectorised :func:`compute_local_azimuth` for many origins at once.
+
+    One ball query on the mesh's cached XY KD-tree collects every
+    neighbourhood, and the plane fits are solved together from per-origin
+    normal-equation sums (coordinates centred on each origin). The same
+    radius / 3x-radius fallback, flat-gradient and <10-neighbour rules
+    apply; rank-deficient neighbourhoods fall back to the scalar
+    least-squares fit.
+
+    Returns an array of azimuths in degrees, one per origin.
+    """
+    pts = np.atleast_2d(np.asarray(origins, dtype=float))[:, :2]
+    n = len(pts)
+    out = np.zeros(n)
+    if n == 0:
+        return out
+
+    verts = np.asarray(design_mesh.vertices, dtype=float)
+    tree = vertex_xy_kdtree(design_mesh)
+
+    flat, owner = _ball_neighbours(tree, pts, radius)
+    counts = np.bincount(owner, minlength=n)
+    retry = np.flatnonzero(counts < 10)
+    if len(retry):
+        flat_w, owner_w = _ball_neighbours(tree, pts[retry], radius * 3)
+        keep = counts[owner] >= 10
+        flat = np.concatenate([flat[keep], flat_w])
+        owner = np.concatenate([owner[keep], retry[owner_w]])
+        counts = np.bincount(owner, minlength=n)
+
+    ok = counts >= 10
+    if not ok.any():
+        return out
+
+    # Normal equations for z = a*x + b*y + c on origin-centred coordinates
+    dxy = verts[flat, :2] - pts[owner]
+    x, y, z = dxy[:, 0], dxy[:, 1], verts[flat, 2]
+
+    def _sum(w):
+        return np.bincount(owner, weights=w, minlength=n)
+
+    sx, sy, sz = _sum(x), _sum(y), _sum(z)
+    ata = np.empty((n, 3, 3))
+    ata[:, 0, 0] = _sum(x * x)
+    ata[:, 0, 1] = ata[:, 1, 0] = _sum(x * y)
+    ata[:, 1, 1] = _sum(y * y)
+    ata[:, 0, 2] = ata[:, 2, 0] = sx
+    ata[:, 1, 2] = ata[:, 2, 1] = sy
+    ata[:, 2, 2] = counts
+    atz = np.stack([_sum(x * z), _sum(y * z), sz], axis=1)
+
+    rows = np.flatnonzero(ok)
+    cond = np.linalg.cond(ata[rows])
+    solvable = rows[np.isfinite(cond) & (cond < 1e12)]
+    coeffs = np.zeros((n, 3))
+    if len(solvable):
+        coeffs[solvable] = np.linalg.solve(ata[solvable], atz[solvable][..., None])[..., 0]
+
+    grad_x, grad_y = coeffs[:, 0], coeffs[:, 1]
+    flat_grad = (np.abs(grad_x) < 1e-6) & (np.abs(grad_y) < 1e-6)
+    az = np.degrees(np.arctan2(-grad_x, -grad_y)) % 360
+    out[solvable] = np.where(flat_grad[solvable], 0.0, az[solvable])
+
+    for i in np.setdiff1d(rows, solvable):
+        out[i] = compute_local_azimuth(design_mesh, pts[i], radius)
+    return out
+
+
 def generate_sections_along_crest(mesh: trimesh.Trimesh, start_point: np.ndarray,
                                    end_point: np.ndarray, n_sections: int,
                                    section_azimuth: Optional[float] = None,
@@ -251,20 +560,27 @@ def generate_perpendicular_sections(points: np.ndarray, spacing: float,
     else:
         section_dists = np.arange(spacing / 2, total_length, spacing)
 
-    sections = []
-    for i, d in enumerate(section_dists):
-        # Find which segment we're on
-        seg_idx = int(np.searchsorted(cum_dist, d, side='right')) - 1
-        seg_idx = max(0, min(seg_idx, len(points) - 2))
-
-        # Interpolate position
-        t = ((d - cum_dist[seg_idx]) / seg_lengths[seg_idx]
-             if seg_lengths[seg_idx] > 0 else 0)
-        origin = points[seg_idx] + t * diffs[seg_idx]
+    # Segment of every section position in one searchsorted call, then
+    # interpolate all positions together (zero-length segments snap to
+    # their start vertex).
+    section_dists = np.asarray(section_dists, dtype=float)
+    seg_ids = np.clip(
+        cum_dist.searchsorted(section_dists, side='right') - 1, 0, len(points) - 2)
+    seg_len = seg_lengths[seg_ids]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(seg_len > 0, (section_dists - cum_dist[seg_ids]) / seg_len, 0.0)
+    positions = points[seg_ids] + t[:, None] * diffs[seg_ids]
+    placements = list(zip(seg_ids.tolist(), positions))
+
+    if design_mesh is not None:
+        # Enforce using the provided design mesh for azimuth (one batched fit)
+        mesh_az = compute_local_azimuth_batch(
+            design_mesh, np.array([o for _, o in placements]))
 
+    sections = []
+    for i, (seg_idx, origin) in enumerate(placements):
         if design_mesh is not None:
-            # Enforce using the provided design mesh for azimuth
-            az = compute_local_azimuth(design_mesh, origin)
+            az = float(mesh_az[i])
         else:
             # Perpendicular to the polyline tangent
             tangent = diffs[seg_idx]
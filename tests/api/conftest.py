@@ -18,6 +18,8 @@ from fastapi.testclient import TestClient
 
 import api.database as db
 import api.routers.meshes as meshes_router
+import api.routers.process as process_router
+import api.routers.sections as sections_router
 from api.main import app
 from core import load_mesh
 
@@ -159,13 +161,21 @@ def uploaded_mesh_id(client: TestClient, stl_bytes: bytes) -> str:
 def _clear_lru_caches() -> Iterator[None]:
     """Reset the lru_cache-decorated helpers between tests so cached
     meshes/sections from previous tests do not bleed into new ones."""
+    meshes_router._get_viz_mesh_cached.cache_clear()
     meshes_router._get_decimated_vertices_cached.cache_clear()
     meshes_router._get_contours_cached.cache_clear()
     meshes_router._get_breaklines_cached.cache_clear()
+    process_router._profile_memo_clear()
+    process_router._extraction_memo_clear()
+    sections_router._perpendicular_sections_cached.cache_clear()
     # The DB layer also caches the trimesh by id.
     db.get_trimesh_by_id.cache_clear()
     yield
+    meshes_router._get_viz_mesh_cached.cache_clear()
     meshes_router._get_decimated_vertices_cached.cache_clear()
     meshes_router._get_contours_cached.cache_clear()
     meshes_router._get_breaklines_cached.cache_clear()
+    process_router._profile_memo_clear()
+    process_router._extraction_memo_clear()
+    sections_router._perpendicular_sections_cached.cache_clear()
     db.get_trimesh_by_id.cache_clear()
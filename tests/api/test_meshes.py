@@ -13,8 +13,10 @@ isolated SQLite database (see tests/api/conftest.py).
 """
 from __future__ import annotations
 
+import dataclasses
 import io
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -230,6 +232,47 @@ class TestMeshVertices:
             for idx in tri:
                 assert 0 <= idx < n_verts
 
+    def test_small_steps_share_one_viz_decimation(
+        self, client: TestClient, larger_stl_bytes: bytes, monkeypatch: pytest.MonkeyPatch
+    ):
+        """The display LOD is built once per mesh and reused across steps."""
+        monkeypatch.setattr(
+            meshes_router, "DEFAULTS", dataclasses.replace(meshes_router.DEFAULTS, viz_target_faces=5000)
+        )
+        up = client.post(
+            "/api/v1/meshes/upload",
+            files={"file": ("big.stl", larger_stl_bytes, "application/octet-stream")},
+            data={"type": "design"},
+        )
+        mesh_id = up.json()["mesh_id"]
+
+        for step in (4000, 2000):
+            resp = client.get(f"/api/v1/meshes/{mesh_id}/vertices", params={"step": step})
+            assert resp.status_code == 200
+            assert len(resp.json()["faces"]) <= 5000
+        info = meshes_router._get_viz_mesh_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_vertices_coordinates_quantised_to_cm(
+        self, client: TestClient, larger_stl_bytes: bytes
+    ):
+        """Display vertices carry coordinates rounded to 1 cm."""
+        up = client.post(
+            "/api/v1/meshes/upload",
+            files={"file": ("big.stl", larger_stl_bytes, "application/octet-stream")},
+            data={"type": "design"},
+        )
+        mesh_id = up.json()["mesh_id"]
+
+        resp = client.get(f"/api/v1/meshes/{mesh_id}/vertices", params={"step": 2000})
+        assert resp.status_code == 200
+        body = resp.json()
+        for axis in ("x", "y", "z"):
+            coords = np.array(body[axis])
+            assert coords.size
+            np.testing.assert_allclose(coords, np.round(coords, 2), rtol=0, atol=1e-9)
+        assert all(isinstance(i, int) for tri in body["faces"][:20] for i in tri)
+
     def test_vertices_unknown_id_returns_404(self, client: TestClient):
         """The cached helper raises ValueError when the mesh is missing,
         and the router converts it to 404."""
@@ -322,6 +365,47 @@ class TestMeshContours:
         assert resp.status_code == 200
         assert resp.json()["interval"] == 5.0
 
+    def test_contours_cache_ignores_grid_size(
+        self, client: TestClient, larger_stl_bytes: bytes
+    ):
+        """``grid_size`` has no effect on exact sectioning, so it must not
+        split the cache: a second call with a different value is a hit."""
+        up = client.post(
+            "/api/v1/meshes/upload",
+            files={"file": ("topo.stl", larger_stl_bytes, "application/octet-stream")},
+            data={"type": "topo"},
+        )
+        mesh_id = up.json()["mesh_id"]
+        meshes_router._get_contours_cached.cache_clear()
+
+        first = client.get(f"/api/v1/meshes/{mesh_id}/contours", params={"grid_size": 400})
+        second = client.get(f"/api/v1/meshes/{mesh_id}/contours", params={"grid_size": 1500})
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        info = meshes_router._get_contours_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_contours_coordinates_quantised_to_cm(
+        self, client: TestClient, larger_stl_bytes: bytes
+    ):
+        """Display contours carry plan coordinates rounded to 1 cm."""
+        up = client.post(
+            "/api/v1/meshes/upload",
+            files={"file": ("topo.stl", larger_stl_bytes, "application/octet-stream")},
+            data={"type": "topo"},
+        )
+        mesh_id = up.json()["mesh_id"]
+
+        resp = client.get(f"/api/v1/meshes/{mesh_id}/contours", params={"interval": 1.0})
+        assert resp.status_code == 200
+        points = [
+            pt for line in resp.json()["lines"] for seg in line["segments"] for pt in seg
+        ]
+        assert points
+        assert all(len(pt) == 2 for pt in points)
+        coords = np.array(points)
+        np.testing.assert_allclose(coords, np.round(coords, 2), rtol=0, atol=1e-9)
+
     def test_contours_unknown_id_returns_404(self, client: TestClient):
         meshes_router._get_contours_cached.cache_clear()
         resp = client.get("/api/v1/meshes/ghost/contours")
@@ -276,9 +276,12 @@ def _api_reset_state_caches(monkeypatch):
     failures. Reset it before every test.
     """
     import api.database as db
+    import api.routers.process as process_router
 
     try:
         db.get_trimesh_by_id.cache_clear()
+        process_router._profile_memo_clear()
+        process_router._extraction_memo_clear()
     except Exception:
         pass
     yield
@@ -40,14 +40,15 @@ async def _collect(gen):
 
 def _make_provider(mock_create):
     """Build a provider whose ``_client.chat.completions.create`` is mocked."""
-    provider = OpenAICompatibleProvider.__new__(OpenAICompatibleProvider)
-    provider._client = SimpleNamespace(
-        chat=SimpleNamespace(
-            completions=SimpleNamespace(create=mock_create)
-        )
+    return OpenAICompatibleProvider(
+        base_url="http://x",
+        name="test",
+        client=SimpleNamespace(
+            chat=SimpleNamespace(
+                completions=SimpleNamespace(create=mock_create)
+            )
+        ),
     )
-    provider._name = "test"
-    return provider
 
 
 class TestStreamOptionsIncludeUsage:
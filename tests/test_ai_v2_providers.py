@@ -96,4 +96,50 @@ def test_list_models_returns_empty_on_error():
     p = OpenAICompatibleProvider(base_url="http://localhost:1", name="dead")
     import asyncio
     result = asyncio.run(p.list_models())
-    assert result == []
\ No newline at end of file
+    assert result == []
+
+
+def test_registry_reuses_provider_per_key():
+    from core.ai_v2.providers import registry
+
+    registry._provider_cache_clear()
+    try:
+        a = ProviderRegistry.get(ProviderType.OPENAI, api_key="sk-reuse")
+        assert ProviderRegistry.get(ProviderType.OPENAI, api_key="sk-reuse") is a
+        assert ProviderRegistry.get(ProviderType.OPENAI, api_key="sk-other") is not a
+        assert not any("sk-reuse" in part for key in registry._provider_cache for part in key)
+    finally:
+        registry._provider_cache_clear()
+
+
+def test_registry_closes_evicted_providers(monkeypatch):
+    from core.ai_v2.providers import registry
+
+    closed = []
+    monkeypatch.setattr(OpenAICompatibleProvider, "close", lambda self: closed.append(self))
+    monkeypatch.setattr(registry, "_PROVIDER_CACHE_SIZE", 1)
+    registry._provider_cache_clear()
+    try:
+        a = ProviderRegistry.get(ProviderType.OPENAI, api_key="sk-first")
+        b = ProviderRegistry.get(ProviderType.OPENAI, api_key="sk-second")
+        assert closed == [a]
+    finally:
+        registry._provider_cache_clear()
+    assert closed == [a, b]
+
+
+def test_client_is_reused_within_a_loop_and_rebuilt_across_loops():
+    import asyncio
+
+    p = OpenAICompatibleProvider(base_url="http://x")
+
+    async def _clients():
+        return p._client, p._client
+
+    first, again = asyncio.run(_clients())
+    assert again is first
+    later, _ = asyncio.run(_clients())
+    assert later is not first
+    assert first.is_closed()
+    p.close()
+    assert later.is_closed()
@@ -6,9 +6,11 @@ and export routers. Uses an isolated SQLite database per test.
 
 import io
 import os
+import sys
 import tempfile
 import uuid
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -143,6 +145,43 @@ class TestMeshUpload:
         )
         assert resp.status_code == 400
 
+    def test_upload_streams_bytes_unchanged(self, client, headers, stl_path, monkeypatch):
+        """Spooled uploads store the exact file bytes and clean up the temp file."""
+        import api.routers.meshes as meshes_router
+
+        spooled = []
+        real_spool = meshes_router._spool_upload
+
+        def _spy(src, filename):
+            tmp, size = real_spool(src, filename)
+            spooled.append(tmp)
+            return tmp, size
+
+        monkeypatch.setattr(meshes_router, "_spool_upload", _spy)
+        data = _upload_mesh(client, headers, stl_path, "design")
+
+        stored = db.get_mesh_by_id(data["mesh_id"])
+        with open(stl_path, "rb") as f:
+            assert stored["data"] == f.read()
+        assert len(spooled) == 1
+        assert not os.path.exists(spooled[0])
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="needs Connection.blobopen")
+    def test_upload_copies_spooled_file_into_blob(self, client, headers, stl_path, monkeypatch):
+        """The stored BLOB is filled from the spooled file, never read back whole."""
+        from pathlib import Path
+
+        def _no_read_bytes(self):
+            raise AssertionError("upload must not read the spooled file into memory")
+
+        monkeypatch.setattr(Path, "read_bytes", _no_read_bytes)
+        monkeypatch.setattr(db, "_BLOB_COPY_CHUNK", 4096)
+        data = _upload_mesh(client, headers, stl_path, "design")
+
+        stored = db.get_mesh_by_id(data["mesh_id"])
+        with open(stl_path, "rb") as f:
+            assert stored["data"] == f.read()
+
 
 class TestMeshInfo:
     def test_info_after_upload(self, client, headers, stl_path):
@@ -374,6 +413,87 @@ class TestSectionsFromFile:
         assert "sections" in data
         assert len(data["sections"]) > 0
 
+    def test_from_dxf(self, client, headers, stl_path):
+        """Upload a DXF polyline; it is parsed from memory, not a temp file."""
+        ezdxf = pytest.importorskip("ezdxf")
+        _upload_mesh(client, headers, stl_path, "design")
+
+        doc = ezdxf.new(dxfversion="R2010")
+        doc.modelspace().add_lwpolyline([(100.0, 200.0), (400.0, 200.0)])
+        buf = io.StringIO()
+        doc.write(buf)
+        resp = client.post(
+            "/api/v1/sections/from-file",
+            files={"file": ("line.dxf", buf.getvalue().encode(), "application/dxf")},
+            data={"spacing": "50.0", "length": "200.0"},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        assert resp.json()["polyline"] == [[100.0, 200.0], [400.0, 200.0]]
+
+    def test_repeat_upload_reuses_generated_sections(self, client, headers, stl_path,
+                                                     monkeypatch):
+        """Same polyline and settings twice only generates the sections once."""
+        import api.routers.sections as sections_router
+
+        _upload_mesh(client, headers, stl_path, "design")
+        sections_router._perpendicular_sections_cached.cache_clear()
+        calls = []
+        real = sections_router.generate_perpendicular_sections
+
+        def counting(*args, **kwargs):
+            calls.append(args)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(sections_router, "generate_perpendicular_sections", counting)
+        csv_content = b"X,Y\n100.0,200.0\n400.0,200.0\n"
+        form = {"spacing": "50.0", "length": "200.0", "sector": "Test"}
+        bodies = []
+        for spacing in ("50.0", "50.0", "75.0"):
+            resp = client.post(
+                "/api/v1/sections/from-file",
+                files={"file": ("sections.csv", csv_content, "text/csv")},
+                data={**form, "spacing": spacing},
+                headers=headers,
+            )
+            assert resp.status_code == 200
+            bodies.append(resp.json())
+        assert len(calls) == 2
+        assert bodies[0] == bodies[1]
+        assert len(bodies[2]["sections"]) < len(bodies[0]["sections"])
+        sections_router._perpendicular_sections_cached.cache_clear()
+
+    def test_cached_sections_are_fresh_objects(self):
+        """Callers editing a returned section must not corrupt the cache."""
+        import api.routers.sections as sections_router
+
+        sections_router._perpendicular_sections_cached.cache_clear()
+        polyline = np.array([[100.0, 200.0], [400.0, 200.0]])
+        first = sections_router._perpendicular_sections(polyline, 50.0, 200.0, "S")
+        first[0].name = "edited"
+        first[0].origin[0] = -1.0
+        again = sections_router._perpendicular_sections(polyline, 50.0, 200.0, "S")
+
+        assert again[0] is not first[0]
+        assert again[0].name != "edited"
+        assert again[0].origin[0] != -1.0
+        assert sections_router._perpendicular_sections_cached.cache_info().hits == 1
+        sections_router._perpendicular_sections_cached.cache_clear()
+
+    def test_csv_named_columns_parsed_in_xy_order(self):
+        from api.routers.sections import _parse_polyline_csv
+
+        content = b'id,"Norte",Este,z\n1,200.0,100.0,5\n2,,150.0,5\n3,210.0,300.0,5\n'
+        np.testing.assert_array_equal(
+            _parse_polyline_csv(content), [[100.0, 200.0], [300.0, 210.0]]
+        )
+
+    def test_csv_unnamed_numeric_columns_fallback(self):
+        from api.routers.sections import _parse_polyline_csv
+
+        content = b"a,b\n1.0,2.0\n3.0,4.0\n"
+        np.testing.assert_array_equal(_parse_polyline_csv(content), [[1.0, 2.0], [3.0, 4.0]])
+
     def test_from_csv_bad_columns_400(self, client, headers, stl_path):
         """CSV without recognizable X/Y columns returns 400."""
         _upload_mesh(client, headers, stl_path, "design")
@@ -435,6 +555,65 @@ class TestProcessResults:
         assert resp.status_code == 200
         assert resp.json() == []
 
+    def test_results_etag_304_until_changed(self, client, headers):
+        resp = client.get("/api/v1/process/results", headers=headers)
+        etag = resp.headers["etag"]
+        assert etag.startswith('W/"')
+
+        cached = client.get(
+            "/api/v1/process/results", headers={**headers, "If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        db.save_results(headers["x-session-id"], [{"section": "S-01"}])
+        fresh = client.get(
+            "/api/v1/process/results", headers={**headers, "If-None-Match": etag}
+        )
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != etag
+        assert fresh.json() == [{"section": "S-01"}]
+
+    def test_results_stream_as_one_json_array(self, client, headers):
+        from api.routers.process import _iter_json_array
+
+        rows = [{"section": f"S-{i:02d}", "delta": i * 0.5} for i in range(40)]
+        db.save_results(headers["x-session-id"], rows)
+        resp = client.get("/api/v1/process/results", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/json")
+        assert resp.json() == rows
+
+        only = client.get("/api/v1/process/results", params={"section": "S-03"}, headers=headers)
+        assert only.json() == [rows[3]]
+
+        chunks = list(_iter_json_array(['{"a":1}', '{"b":2}', '{"c":3}'], chunk_bytes=8))
+        assert len(chunks) > 1
+        assert b"".join(chunks) == b'[{"a":1},{"b":2},{"c":3}]'
+        assert b"".join(_iter_json_array([])) == b"[]"
+
+    def test_results_stream_nan_deviation_as_null(self, client, headers):
+        rows = [{"section": "S-01", "height_dev": float("nan"), "angle_dev": float("inf")}]
+        db.save_results(headers["x-session-id"], rows)
+        resp = client.get("/api/v1/process/results", headers=headers)
+        assert resp.status_code == 200
+        assert b"NaN" not in resp.content and b"Infinity" not in resp.content
+        assert resp.json() == [{"section": "S-01", "height_dev": None, "angle_dev": None}]
+
+    def test_results_stream_legacy_nan_rows_as_null(self, client, headers):
+        session_id = headers["x-session-id"]
+        db.save_results(session_id, [{"section": "S-01"}])
+        conn = db.get_connection()
+        conn.execute(
+            "UPDATE results SET data = ? WHERE session_id = ?",
+            ('{"section": "NaN-S", "height_dev": NaN, "angle_dev": -Infinity}', session_id),
+        )
+        conn.commit()
+        conn.close()
+        resp = client.get("/api/v1/process/results", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == [{"section": "NaN-S", "height_dev": None, "angle_dev": None}]
+
 
 class TestProcessRun:
     def test_run_no_sections_400(self, client):
@@ -442,6 +621,102 @@ class TestProcessRun:
         resp = client.post("/api/v1/process")
         assert resp.status_code == 400
 
+    def test_run_caps_workers_to_section_count(self, client, headers, stl_path, monkeypatch):
+        import api.routers.process as process_router
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": f"S-0{i}", "origin": [2.0 + i, 2.0], "azimuth": 0.0, "length": 20.0}
+            for i in range(3)
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        seen = []
+        real_pool = process_router.ThreadPoolExecutor
+
+        def recording_pool(*args, **kwargs):
+            seen.append(kwargs.get("max_workers"))
+            return real_pool(*args, **kwargs)
+
+        monkeypatch.setattr(process_router, "ThreadPoolExecutor", recording_pool)
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["total_sections"] == 3
+        assert seen == [3]
+
+    def test_run_throttles_progress_updates(self, client, headers, stl_path, monkeypatch):
+        import api.routers.process as process_router
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": f"S-0{i}", "origin": [1.0 + i, 2.0], "azimuth": 0.0, "length": 20.0}
+            for i in range(5)
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        updates = []
+        real_update = db.update_process_status
+
+        def recording_update(session_id, status, current=0, total=0, completed=0):
+            updates.append((status, current))
+            return real_update(session_id, status, current, total, completed)
+
+        monkeypatch.setattr(process_router, "_STATUS_UPDATE_STEPS", 2)
+        monkeypatch.setattr(db, "update_process_status", recording_update)
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert updates == [
+            ("processing", 0), ("processing", 2), ("processing", 4),
+            ("processing", 5), ("complete", 5),
+        ]
+
+    def test_rerun_only_extracts_new_sections(self, client, headers, stl_path, monkeypatch):
+        import api.routers.process as process_router
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": f"S-0{i}", "origin": [2.0 + i, 2.0], "azimuth": 0.0, "length": 20.0}
+            for i in range(2)
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        extracted = []
+        real_extract = process_router.extract_parameters
+
+        def counting_extract(distances, elevations, name, *args):
+            extracted.append(name)
+            return real_extract(distances, elevations, name, *args)
+
+        monkeypatch.setattr(process_router, "extract_parameters", counting_extract)
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        first = client.get("/api/v1/process/results", headers=headers).json()
+        assert sorted(extracted) == ["S-00", "S-00", "S-01", "S-01"]
+
+        extracted.clear()
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert extracted == []
+        assert client.get("/api/v1/process/results", headers=headers).json() == first
+
+        sections.append({"name": "S-02", "origin": [4.0, 2.0], "azimuth": 0.0, "length": 20.0})
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert extracted == ["S-02", "S-02"]
+
+        resp = client.put(
+            "/api/v1/settings", json={"process": {"face_threshold": 50.0}}, headers=headers
+        )
+        assert resp.status_code == 200
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert len(extracted) == 2 + 6
+
 
 class TestProcessProfiles:
     def test_profiles_out_of_range_404(self, client):
@@ -499,6 +774,124 @@ class TestProcessProfiles:
         assert "reconciled_design" in data
         assert "reconciled_topo" in data
 
+    def test_profiles_reuse_cached_cut(self, client, headers, stl_path, monkeypatch):
+        import api.routers.process as process_router
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": "S-01", "origin": [2.0, 2.0], "azimuth": 0.0, "length": 20.0, "sector": "A"}
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        calls = []
+        real_cut = process_router.cut_both_surfaces_batch
+
+        def counting_cut(m_d, m_t, secs):
+            calls.append(secs)
+            return real_cut(m_d, m_t, secs)
+
+        monkeypatch.setattr(process_router, "cut_both_surfaces_batch", counting_cut)
+
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        for _ in range(2):
+            resp = client.get("/api/v1/process/profiles/0", headers=headers)
+            assert resp.status_code == 200, resp.text
+        assert len(calls) == 1
+
+        _upload_mesh(client, headers, stl_path, "topo")
+        resp = client.get("/api/v1/process/profiles/0", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert len(calls) == 2
+
+    def test_profiles_miss_cuts_only_requested_section(self, client, headers, stl_path, monkeypatch):
+        import api.routers.process as process_router
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": f"S-0{i}", "origin": [2.0 + i, 2.0], "azimuth": 0.0, "length": 20.0}
+            for i in range(3)
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        calls = []
+        real_cut = process_router.cut_both_surfaces_batch
+
+        def counting_cut(m_d, m_t, secs):
+            calls.append([s.name for s in secs])
+            return real_cut(m_d, m_t, secs)
+
+        monkeypatch.setattr(process_router, "cut_both_surfaces_batch", counting_cut)
+
+        resp = client.get("/api/v1/process/profiles/1", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert calls == [["S-01"]]
+
+        resp = client.post("/api/v1/process", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert calls == [["S-01"], ["S-00", "S-02"]]
+
+
+class TestUpdateReconciled:
+    def test_recomputes_edited_bench_geometry(self, client, headers):
+        """Edited benches get fresh height/angle; berms follow the new positions."""
+        sections = [{"name": "S-01", "origin": [0.0, 0.0], "azimuth": 0.0, "length": 20.0}]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        def bench(n, cd, ce, td, te):
+            return {
+                "bench_number": n, "crest_distance": cd, "crest_elevation": ce,
+                "toe_distance": td, "toe_elevation": te,
+                "bench_height": 0.0, "face_angle": 0.0, "berm_width": 0.0,
+            }
+
+        db.save_extraction(headers["x-session-id"], "S-01", "topo", {
+            "section_name": "S-01",
+            "sector": "",
+            "benches": [bench(1, 0.0, 30.0, 5.0, 15.0), bench(2, 14.0, 15.0, 19.0, 0.0)],
+        })
+
+        body = [bench(1, 0.0, 30.0, 5.0, 18.0), bench(2, 13.0, 18.0, 13.0, 3.0)]
+        resp = client.put("/api/v1/process/results/0/reconciled", json=body, headers=headers)
+        assert resp.status_code == 200, resp.text
+
+        benches = resp.json()["benches"]
+        assert benches[0]["bench_height"] == pytest.approx(12.0)
+        assert benches[0]["face_angle"] == pytest.approx(67.4, abs=0.05)
+        assert benches[0]["berm_width"] == pytest.approx(8.0)
+        assert benches[1]["bench_height"] == pytest.approx(15.0)
+        assert benches[1]["face_angle"] == pytest.approx(90.0)
+        assert isinstance(resp.json()["reconciled_topo"]["distances"], list)
+
+    def test_unchanged_positions_skip_rerun(self, client, headers, monkeypatch):
+        """Re-sending the stored positions returns without rewriting state."""
+        from api.routers import process as process_router
+
+        sections = [{"name": "S-01", "origin": [0.0, 0.0], "azimuth": 0.0, "length": 20.0}]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        stored = {
+            "bench_number": 1, "crest_distance": 0.0, "crest_elevation": 30.0,
+            "toe_distance": 5.0, "toe_elevation": 18.0,
+            "bench_height": 12.0, "face_angle": 67.4, "berm_width": 0.0,
+        }
+        db.save_extraction(headers["x-session-id"], "S-01", "topo", {
+            "section_name": "S-01", "sector": "", "benches": [stored],
+        })
+
+        def fail(*args, **kwargs):
+            raise AssertionError("extraction should not be rewritten")
+
+        monkeypatch.setattr(process_router.db, "save_extraction", fail)
+        body = [dict(stored, crest_distance=1e-9)]
+        resp = client.put("/api/v1/process/results/0/reconciled", json=body, headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["benches"][0]["bench_height"] == pytest.approx(12.0)
+
 
 # ===================================================================
 # 6. Export
@@ -589,6 +982,79 @@ class TestExportDXF:
         resp = client.get("/api/v1/export/dxf")
         assert resp.status_code == 400
 
+    def test_profiles_written_as_3d_polylines(self, client, headers, stl_path, tmp_path):
+        """Each raw profile becomes one POLYLINE placed along the section azimuth."""
+        ezdxf = pytest.importorskip("ezdxf")
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": "S-01", "origin": [2.0, 2.0], "azimuth": 90.0, "length": 20.0}
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+
+        resp = client.get("/api/v1/export/dxf", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-disposition"] == 'attachment; filename="Perfiles_3D.dxf"'
+
+        path = tmp_path / "out.dxf"
+        path.write_bytes(resp.content)
+        msp = ezdxf.readfile(str(path)).modelspace()
+        # One POLYLINE per profile; never one LINE entity per segment
+        assert len(msp.query("LINE")) == 0
+        polys = {p.dxf.layer: p for p in msp.query("POLYLINE")}
+        design = next(p for layer, p in polys.items() if layer.startswith("DISEÑO_"))
+        pts = [tuple(v.dxf.location) for v in design.vertices]
+        assert len(pts) > 1
+        # Azimuth 90° runs due east, so every vertex keeps the origin's Y.
+        assert all(y == pytest.approx(2.0) for _, y, _ in pts)
+
+    def test_reconciled_profiles_reused_across_exports(self, client, headers, stl_path, monkeypatch):
+        """A second export serves both reconciled polylines from the cache."""
+        from collections import OrderedDict
+
+        import core.profile_compliance as pc
+
+        _upload_mesh(client, headers, stl_path, "design")
+        _upload_mesh(client, headers, stl_path, "topo")
+        sections = [
+            {"name": "S-01", "origin": [2.0, 2.0], "azimuth": 90.0, "length": 20.0}
+        ]
+        resp = client.post("/api/v1/sections/manual", json=sections, headers=headers)
+        assert resp.status_code == 200
+        ext = {
+            "section_name": "S-01",
+            "benches": [
+                {
+                    "bench_number": 1,
+                    "crest_elevation": 10.0,
+                    "crest_distance": 2.0,
+                    "toe_elevation": 5.0,
+                    "toe_distance": 4.0,
+                    "face_angle": 68.0,
+                }
+            ],
+        }
+        session_id = headers["x-session-id"]
+        db.save_extraction(session_id, "S-01", "design", ext)
+        db.save_extraction(session_id, "S-01", "topo", ext)
+
+        calls = []
+        real_build = pc.build_reconciled_profile_v2
+
+        def counting_build(benches, **kwargs):
+            calls.append(kwargs.get("source"))
+            return real_build(benches, **kwargs)
+
+        monkeypatch.setattr(pc, "_reconciled_cache", OrderedDict())
+        monkeypatch.setattr(pc, "build_reconciled_profile_v2", counting_build)
+
+        for _ in range(2):
+            resp = client.get("/api/v1/export/dxf", headers=headers)
+            assert resp.status_code == 200, resp.text
+        assert sorted(calls) == ["design", "topo"]
+        assert b"CONCILIADO_TOPO" in resp.content
+
 
 class TestExportImages:
     def test_no_results_400(self, client):
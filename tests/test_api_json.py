@@ -0,0 +1,47 @@
+"""Tests for api/_json.py NumpyJSONResponse (orjson and stdlib paths)."""
+import json
+
+import numpy as np
+import pytest
+
+import api._json as api_json
+from api._json import NumpyJSONResponse
+
+
+def _payload():
+    verts = np.arange(12, dtype=float).reshape(4, 3)
+    return {
+        "origin": np.array([1.5, 2.5]),
+        "x": verts[:, 0],  # strided view, not C-contiguous
+        "faces": np.array([[0, 1, 2]], dtype=np.int64),
+        "azimuth": np.float64(45.0),
+        "n": np.int32(3),
+        "name": "S-01",
+    }
+
+
+EXPECTED = {
+    "origin": [1.5, 2.5],
+    "x": [0.0, 3.0, 6.0, 9.0],
+    "faces": [[0, 1, 2]],
+    "azimuth": 45.0,
+    "n": 3,
+    "name": "S-01",
+}
+
+
+def test_render_numpy_payload():
+    body = NumpyJSONResponse(_payload()).body
+    assert json.loads(body) == EXPECTED
+
+
+def test_render_without_orjson(monkeypatch):
+    monkeypatch.setattr(api_json, "orjson", None)
+    body = NumpyJSONResponse(_payload()).body
+    assert json.loads(body) == EXPECTED
+
+
+def test_unknown_type_raises(monkeypatch):
+    monkeypatch.setattr(api_json, "orjson", None)
+    with pytest.raises(TypeError):
+        NumpyJSONResponse({"bad": object()})
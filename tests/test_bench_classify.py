@@ -9,8 +9,12 @@ from core.bench_classify import (
     _apply_leading_berm,
     _apply_trailing_berm,
     _compute_berm_widths_from_profile,
+    _extended_toe_distance,
+    _extended_toe_distances,
     _flat_segment_width,
     _is_ramp,
+    _segment_is_ramp,
+    _segments_are_ramp,
 )
 
 
@@ -47,6 +51,35 @@ def test_compute_berm_widths_accepts_empty_bench_list():
     assert _compute_berm_widths_from_profile([], None, None, None) is None
 
 
+def test_segments_are_ramp_matches_scalar_classifier():
+    rng = np.random.default_rng(7)
+    widths = rng.uniform(0.0, 60.0, 200)
+    e_start = rng.uniform(90.0, 110.0, 200)
+    e_end = e_start + rng.uniform(-8.0, 8.0, 200)
+
+    vectorised = _segments_are_ramp(widths, e_start, e_end)
+    scalar = [_segment_is_ramp(0.0, w, a, b, w) for w, a, b in zip(widths, e_start, e_end)]
+    assert vectorised.tolist() == scalar
+
+
+def test_extended_toe_distances_matches_scalar():
+    benches = [
+        SimpleNamespace(crest_distance=0.0, toe_distance=5.0, toe_elevation=85.0,
+                        face_angle=70.0, floor_elevation=80.0),
+        SimpleNamespace(crest_distance=20.0, toe_distance=15.0, toe_elevation=70.0,
+                        face_angle=65.0, floor_elevation=68.0),
+        SimpleNamespace(crest_distance=30.0, toe_distance=35.0, toe_elevation=55.0,
+                        face_angle=70.0, floor_elevation=0.0),
+    ]
+    cols = [np.array([getattr(b, f) for b in benches], dtype=float) for f in (
+        "crest_distance", "toe_distance", "toe_elevation", "face_angle", "floor_elevation")]
+
+    np.testing.assert_allclose(
+        _extended_toe_distances(*cols),
+        [_extended_toe_distance(b) for b in benches],
+    )
+
+
 def test_flat_segment_width_distinguishes_flat_and_steep_segments():
     assert _flat_segment_width(np.array([0.0, 8.0]), np.array([100.0, 100.5]), 10.0) == pytest.approx(8.0)
     assert _flat_segment_width(np.array([0.0, 2.0]), np.array([100.0, 98.0]), 10.0) == 0.0
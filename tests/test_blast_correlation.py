@@ -106,6 +106,24 @@ class TestComputeBlastGeotechCorrelation:
         assert compute_blast_geotech_correlation(None, [], []) == []
         assert compute_blast_geotech_correlation(pd.DataFrame(), [], []) == []
 
+    def test_deviations_aggregated_per_section(self):
+        df = procesar_pozos(_valid_hole(0.0, 0.0), geometry_user_confirmed=True)[0]
+        sections = [_section("S1", 0.0, 0.0, 90.0), _section("S2", 100.0, 0.0, 90.0),
+                    _section("S3", 200.0, 0.0, 90.0)]
+        comps = [
+            {"section": "S2", "delta_crest": -0.4},
+            {"section": "S1", "delta_crest": 0.3},
+            {"section": "S2", "delta_crest": 0.8},
+            {"section": "S1", "delta_crest": -0.1},
+        ]
+        rows = {r.section_name: r for r in compute_blast_geotech_correlation(df, sections, comps)}
+        assert rows["S1"].mean_abs_deviation == pytest.approx(0.2)
+        assert rows["S2"].mean_abs_deviation == pytest.approx(0.6)
+        assert (rows["S2"].n_over, rows["S2"].n_under) == (1, 1)
+        assert rows["S2"].avg_over_break == pytest.approx(0.8)
+        assert rows["S3"].mean_abs_deviation == 0.0
+        assert (rows["S3"].n_over, rows["S3"].n_under) == (0, 0)
+
     def test_comparisons_without_deviation_column_still_work(self):
         df = procesar_pozos(_valid_hole(0.0, 0.0), geometry_user_confirmed=True)[0]
         sections = [_section("S1", 0.0, 0.0, 90.0)]
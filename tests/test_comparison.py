@@ -81,6 +81,20 @@ class TestStatusTriad:
             )
 
 
+class TestStatusCodes:
+    """Vectorised status codes agree with the scalar triad."""
+
+    def test_codes_match_scalar_status(self):
+        from core.profile_compliance import _STATUS_BY_CODE, _evaluate_status_codes
+
+        devs = np.array([0.5, 1.5, 1.6, 2.25, 2.3, -1.0, -1.1, -1.5, -1.6, np.nan])
+        codes = _evaluate_status_codes(devs, 1.0, 1.5)
+        assert codes.tolist() == [0, 0, 1, 1, 2, 0, 1, 1, 2, 2]
+        assert list(_STATUS_BY_CODE[codes]) == [
+            _evaluate_status(v, tol_neg=1.0, tol_pos=1.5) for v in devs
+        ]
+
+
 # ---------------------------------------------------------------------------
 # Integration: compare_design_vs_asbuilt
 # ---------------------------------------------------------------------------
@@ -325,3 +339,30 @@ class TestCompareDesignVsAsbuilt:
         params_a2 = self._make_params([bt2])
         comps2 = compare_design_vs_asbuilt(params_d2, params_a2, sample_tolerances)
         assert comps2[0]['delta_crest'] == -5.0
+
+    def test_batch_matches_per_section_compare(self, sample_tolerances):
+        """compare_design_vs_asbuilt_batch == compare por sección, en orden."""
+        from core import compare_design_vs_asbuilt
+        from core.param_extractor import compare_design_vs_asbuilt_batch
+
+        def bench(n, z, d, h=15.0, a=70.0):
+            return BenchParams(
+                bench_number=n, crest_elevation=z, crest_distance=d,
+                toe_elevation=z - h, toe_distance=d + 5.0,
+                bench_height=h, face_angle=a, berm_width=9.0,
+            )
+
+        pairs = [
+            (self._make_params([bench(1, 3900.0, 10.0), bench(2, 3885.0, 25.0)], "S-01"),
+             self._make_params([bench(1, 3900.2, 10.5, a=63.0)], "S-01")),
+            (self._make_params([], "S-02"), self._make_params([], "S-02")),
+            (self._make_params([bench(1, 3870.0, 40.0)], "S-03"),
+             self._make_params([bench(1, 3870.0, 40.0, h=17.5), bench(2, 3820.0, 80.0)], "S-03")),
+        ]
+        batched = compare_design_vs_asbuilt_batch(pairs, sample_tolerances)
+        assert len(batched) == 3
+        assert batched[1] == []
+        for (p_d, p_a), comps in zip(pairs, batched):
+            assert comps == compare_design_vs_asbuilt(p_d, p_a, sample_tolerances)
+        assert {c["type"] for c in batched[0]} == {"MATCH", "MISSING"}
+        assert {c["type"] for c in batched[2]} == {"MATCH", "EXTRA"}
@@ -24,6 +24,8 @@ from core.compliance_status import (
     STATUS_NO_CUMPLE,
     STATUS_RAMPA_OK,
     is_passing_status,
+    worst_status,
+    worst_status_by_section,
 )
 
 
@@ -138,3 +140,30 @@ class TestFeasibilityLiterals:
 
     def test_feasibility_values_distinct_from_statuses(self):
         assert ALL_FEASIBILITY.isdisjoint(ALL_STATUSES)
+
+
+class TestWorstStatus:
+    def test_no_cumple_wins(self):
+        assert worst_status(STATUS_CUMPLE, STATUS_FUERA, STATUS_NO_CUMPLE) == STATUS_NO_CUMPLE
+
+    def test_fuera_beats_cumple(self):
+        assert worst_status(STATUS_CUMPLE, STATUS_FUERA, "") == STATUS_FUERA
+
+    def test_unranked_counts_as_cumple(self):
+        assert worst_status("", STATUS_EXTRA) == STATUS_CUMPLE
+        assert worst_status() == STATUS_CUMPLE
+
+    def test_by_section_folds_all_rows(self):
+        rows = [
+            {"section": "S-01", "height_status": STATUS_CUMPLE,
+             "angle_status": STATUS_FUERA, "berm_status": STATUS_CUMPLE},
+            {"section": "S-01", "height_status": STATUS_NO_CUMPLE},
+            {"section": "S-02", "height_status": STATUS_CUMPLE},
+            {"section": "S-03", "angle_status": STATUS_FUERA},
+            {"section": "S-03", "berm_status": STATUS_CUMPLE},
+        ]
+        assert worst_status_by_section(rows) == {
+            "S-01": STATUS_NO_CUMPLE,
+            "S-02": STATUS_CUMPLE,
+            "S-03": STATUS_FUERA,
+        }
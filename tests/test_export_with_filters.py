@@ -7,6 +7,7 @@ the assertions target the router's filter logic without depending on
 the generated file internals.
 """
 
+import io
 import json
 from typing import Any, Dict, List
 
@@ -138,9 +139,10 @@ class TestExportExcelFilters:
 
         def fake_export(results, params_d, params_t, tolerances, path, project_info=None,
                         df_pozos=None, sections=None):
-            open(path, "wb").close()
+            path.write(b"")  # handler passes an in-memory buffer
             captured["results"] = list(results)
             captured["params_topo"] = params_t
+            captured["path"] = path
             return None
 
         monkeypatch.setattr(export_router, "export_results", fake_export)
@@ -169,13 +171,18 @@ class TestExportExcelFilters:
         assert applied["blast_tolerance"] == 4.5
         assert applied["show_spill_areas"] is False
         assert applied["selected_bench_numbers"] == [1]
+        # Workbook is sent from memory as a download, not via a temp file
+        assert isinstance(captured["path"], io.BytesIO)
+        assert resp.headers["content-disposition"] == (
+            'attachment; filename="Conciliacion_Geotecnica.xlsx"'
+        )
 
     def test_selected_bench_numbers_excludes_others(self, client, headers, monkeypatch):
         captured: Dict[str, Any] = {}
 
         def fake_export(results, params_d, params_t, tolerances, path, project_info=None,
                         df_pozos=None, sections=None):
-            open(path, "wb").close()
+            path.write(b"")  # handler passes an in-memory buffer
             captured["bench_nums"] = [c["bench_num"] for c in results]
             captured["topo_benches"] = [
                 b.bench_number for p in params_t for b in p.benches
@@ -200,7 +207,7 @@ class TestExportExcelFilters:
 
         def fake_export(results, params_d, params_t, tolerances, path, project_info=None,
                         df_pozos=None, sections=None):
-            open(path, "wb").close()
+            path.write(b"")  # handler passes an in-memory buffer
             captured["bench_nums"] = sorted(c["bench_num"] for c in results)
             return None
 
@@ -223,7 +230,7 @@ class TestExportExcelFilters:
 
         def fake_export(results, params_d, params_t, tolerances, path, project_info=None,
                         df_pozos=None, sections=None):
-            open(path, "wb").close()
+            path.write(b"")  # handler passes an in-memory buffer
             spill_values = [
                 getattr(b, "spill_width")
                 for p in params_t
@@ -50,6 +50,17 @@ class TestCalculateProfileDeviation:
         devs = calculate_profile_deviation(ref, eval_)
         assert np.allclose(devs, 2.0)
 
+    def test_dense_path_matches_kdtree(self, monkeypatch):
+        import core.geom_utils as geom_utils
+
+        rng = np.random.default_rng(0)
+        ref = _Profile(rng.uniform(0, 50, 40), rng.uniform(80, 120, 40))
+        eval_ = _Profile(rng.uniform(0, 50, 30), rng.uniform(80, 120, 30))
+        dense = calculate_profile_deviation(ref, eval_)
+        monkeypatch.setattr(geom_utils, "_BRUTE_FORCE_MAX_PAIRS", 0)
+        tree = calculate_profile_deviation(ref, eval_)
+        np.testing.assert_allclose(dense, tree)
+
 
 class TestCalculateAreaBetweenProfiles:
     def test_overbreak_area_positive(self):
@@ -72,6 +83,45 @@ class TestCalculateAreaBetweenProfiles:
         assert area_under > 0.0
         assert area_over == 0.0
 
+    def test_constant_offset_integrates_trapezoidally(self):
+        # A 3 m offset over the sampled span is a rectangle: 3 * (last - first).
+        d = [0.0, 10.0, 20.0]
+        ref = _Profile(d, [100.0, 100.0, 100.0])
+        eval_ = _Profile(d, [97.0, 97.0, 97.0])
+        area_over, _area_under, common_d, _z_ref_i, _z_eval_i = calculate_area_between_profiles(ref, eval_)
+        assert area_over == pytest.approx(3.0 * (common_d[-1] - common_d[0]))
+
+    def test_crossing_profiles_split_exactly(self):
+        # Topo crosses the flat design at d=10: two 10 x 2 triangles.
+        ref = _Profile([0.0, 20.0], [100.0, 100.0])
+        eval_ = _Profile([0.0, 20.0], [98.0, 102.0])
+        area_over, area_under, common_d, z_ref_i, z_eval_i = calculate_area_between_profiles(ref, eval_)
+        assert area_over == pytest.approx(10.0)
+        assert area_under == pytest.approx(10.0)
+        np.testing.assert_allclose(common_d, [0.0, 10.0, 20.0])
+        assert z_eval_i[1] == pytest.approx(z_ref_i[1])
+
+    def test_shared_stations_skip_interpolation(self):
+        d = [0.0, 5.0, 20.0]
+        ref = _Profile(d, [100.0, 100.0, 100.0])
+        eval_ = _Profile(d, [101.0, 103.0, 101.0])
+        area_over, area_under, common_d, _z_ref_i, z_eval_i = calculate_area_between_profiles(ref, eval_)
+        np.testing.assert_array_equal(common_d, d)
+        np.testing.assert_array_equal(z_eval_i, [101.0, 103.0, 101.0])
+        assert area_over == 0.0
+        assert area_under == pytest.approx(5.0 * 2.0 + 15.0 * 2.0)
+
+    def test_unsorted_profile_matches_sorted(self):
+        # Point order must not matter: the eval profile is interpolated by distance.
+        ref = _Profile([0.0, 10.0, 20.0], [100.0, 95.0, 100.0])
+        sorted_eval = _Profile([0.0, 5.0, 12.0, 20.0], [98.0, 99.0, 96.0, 101.0])
+        shuffled_eval = _Profile([12.0, 0.0, 20.0, 5.0], [96.0, 98.0, 101.0, 99.0])
+        expected = calculate_area_between_profiles(ref, sorted_eval)
+        got = calculate_area_between_profiles(ref, shuffled_eval)
+        assert got[:2] == expected[:2]
+        for a, b in zip(got[2:], expected[2:]):
+            np.testing.assert_array_equal(a, b)
+
     def test_none_returns_zeros_pair(self):
         result = calculate_area_between_profiles(None, _Profile([0, 1], [0, 1]))
         assert result == (0.0, 0.0)
@@ -3,9 +3,10 @@
 import numpy as np
 import plotly.graph_objects as go
 import pytest
+import trimesh
 
 from core import load_mesh, get_mesh_bounds, decimate_mesh
-from core.mesh_handler import mesh_to_plotly
+from core.mesh_handler import mesh_to_plotly, subsample_vertices
 
 
 class TestLoadMesh:
@@ -47,6 +48,49 @@ class TestLoadMesh:
         assert bounds["zmin"] < 3870
 
 
+class TestFastBinaryStl:
+    """Binary STL fast path must match trimesh's own loader."""
+
+    def test_matches_trimesh_load(self, pit_mesh_design, tmp_path):
+        import trimesh
+        from core.mesh_handler import _fast_load_binary_stl
+        path = tmp_path / "pit.stl"
+        pit_mesh_design.export(str(path), file_type="stl")
+
+        fast = _fast_load_binary_stl(str(path))
+        ref = trimesh.load(str(path))
+
+        assert fast is not None
+        assert len(fast.vertices) == len(ref.vertices)
+        assert len(fast.faces) == len(ref.faces)
+        np.testing.assert_allclose(fast.bounds, ref.bounds)
+        np.testing.assert_allclose(
+            np.sort(fast.triangles.reshape(-1, 9), axis=0),
+            np.sort(ref.triangles.reshape(-1, 9), axis=0),
+        )
+        assert load_mesh(str(path)).faces.shape == fast.faces.shape
+
+    def test_ascii_and_truncated_files_fall_back(self, mesh_stl_temp, tmp_path):
+        from core.mesh_handler import _fast_load_binary_stl
+        with open(mesh_stl_temp, "rb") as f:
+            data = f.read()
+        if data[:5].lower() == b"solid":
+            assert _fast_load_binary_stl(mesh_stl_temp) is None
+        truncated = tmp_path / "truncated.stl"
+        truncated.write_bytes(b"\0" * 80 + (10).to_bytes(4, "little") + b"\0" * 49)
+        assert _fast_load_binary_stl(str(truncated)) is None
+
+    def test_drops_non_finite_triangles(self, tmp_path):
+        from core.mesh_handler import _STL_TRIANGLE_DTYPE, _fast_load_binary_stl
+        rec = np.zeros(2, dtype=_STL_TRIANGLE_DTYPE)
+        rec["v"][0] = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+        rec["v"][1] = [[0, 0, 0], [np.nan, 0, 0], [0, 1, 0]]
+        path = tmp_path / "nan.stl"
+        path.write_bytes(b"\0" * 80 + (2).to_bytes(4, "little") + rec.tobytes())
+        mesh = _fast_load_binary_stl(str(path))
+        assert len(mesh.faces) == 1 and len(mesh.vertices) == 3
+
+
 class TestDecimateNoOp:
     def test_decimate_below_target_returns_same_face_count(self, pit_mesh_design):
         """When the mesh already has <= target faces, decimate is a no-op."""
@@ -60,6 +104,70 @@ class TestDecimateNoOp:
         result = decimate_mesh(pit_mesh_design, target_faces=max(original_faces // 20, 50))
         assert len(result.faces) <= original_faces
 
+    def test_decimate_is_memoised_per_target(self):
+        mesh = trimesh.creation.icosphere(subdivisions=4)
+        first = decimate_mesh(mesh, 500)
+        assert decimate_mesh(mesh, 500) is first
+        assert decimate_mesh(mesh, 800) is not first
+
+    def test_decimate_cache_invalidated_by_vertex_edit(self):
+        mesh = trimesh.creation.icosphere(subdivisions=4)
+        first = decimate_mesh(mesh, 500)
+        mesh.vertices = mesh.vertices * 2.0
+        again = decimate_mesh(mesh, 500)
+        assert again is not first
+        assert again.bounds[1][0] == pytest.approx(2 * first.bounds[1][0], rel=0.05)
+
+
+class TestSubsampleVertices:
+    def test_respects_point_budget(self):
+        mesh = trimesh.creation.icosphere(subdivisions=4)
+        n = len(mesh.vertices)
+        x, y, z = subsample_vertices(mesh, n // 2 + 1)
+        assert len(x) == len(y) == len(z) <= n // 2 + 1
+        np.testing.assert_array_equal(x, mesh.vertices[::2, 0])
+        assert x.flags.c_contiguous and not x.flags.writeable
+
+    def test_small_mesh_returns_all_and_is_memoised(self):
+        mesh = trimesh.creation.box()
+        cols = subsample_vertices(mesh, 1000)
+        assert len(cols[0]) == len(mesh.vertices)
+        assert subsample_vertices(mesh, 1000) is cols
+
+
+class TestMeshElevationGrid:
+    def test_interpolates_planar_faces_exactly(self):
+        from core.mesh_handler import mesh_elevation_grid
+        # Two large triangles over [0, 10]^2 on the plane z = 2x + 3y + 1.
+        xy = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+        verts = np.column_stack([xy, 2 * xy[:, 0] + 3 * xy[:, 1] + 1])
+        mesh = trimesh.Trimesh(verts, [[0, 1, 2], [0, 2, 3]], process=False)
+
+        xi, yi, zi = mesh_elevation_grid(mesh, 11)
+
+        xg, yg = np.meshgrid(xi, yi)
+        np.testing.assert_allclose(zi, 2 * xg + 3 * yg + 1)
+
+    def test_nodes_outside_faces_stay_nan(self):
+        from core.mesh_handler import mesh_elevation_grid
+        verts = np.array([[0.0, 0.0, 5.0], [10.0, 0.0, 5.0], [0.0, 10.0, 5.0]])
+        mesh = trimesh.Trimesh(verts, [[0, 1, 2]], process=False)
+
+        xi, yi, zi = mesh_elevation_grid(mesh, 11)
+
+        xg, yg = np.meshgrid(xi, yi)
+        inside = xg + yg <= 10.0 + 1e-9
+        np.testing.assert_allclose(zi[inside], 5.0)
+        assert np.isnan(zi[~inside]).all()
+
+    def test_overlapping_faces_keep_highest(self):
+        from core.mesh_handler import mesh_elevation_grid
+        verts = np.array([[0.0, 0.0, 1.0], [10.0, 0.0, 1.0], [0.0, 10.0, 1.0],
+                          [0.0, 0.0, 4.0], [10.0, 0.0, 4.0], [0.0, 10.0, 4.0]])
+        mesh = trimesh.Trimesh(verts, [[3, 4, 5], [0, 1, 2]], process=False)
+        _, _, zi = mesh_elevation_grid(mesh, 5)
+        assert np.nanmin(zi) == pytest.approx(4.0)
+
 
 class TestMeshToPlotly:
     def test_returns_mesh3d_trace(self, pit_mesh_design):
@@ -178,6 +286,33 @@ class TestLoadDxfPolyline:
         arr = load_dxf_polyline(str(dxf))
         assert arr.shape[1] == 2
 
+    def test_load_polyline_from_stream_matches_path(self, tmp_path):
+        import io
+
+        import ezdxf
+        from core.mesh_handler import load_dxf_polyline
+        doc = ezdxf.new(dxfversion="R12")
+        doc.modelspace().add_polyline2d([(0, 0), (7.5, 1.0), (9.0, 4.25)])
+        for fmt in ("asc", "bin"):
+            path = tmp_path / f"poly_{fmt}.dxf"
+            doc.saveas(str(path), fmt=fmt)
+            from_path = load_dxf_polyline(str(path))
+            from_stream = load_dxf_polyline(io.BytesIO(path.read_bytes()))
+            np.testing.assert_array_equal(from_stream, from_path)
+            np.testing.assert_allclose(from_stream, [[0, 0], [7.5, 1.0], [9.0, 4.25]])
+
+    def test_stream_failure_logs_the_upload_name(self, caplog):
+        import io
+
+        import ezdxf
+        from core.mesh_handler import load_dxf_polyline
+        buf = io.StringIO()
+        ezdxf.new(dxfversion="R2010").write(buf)
+        with caplog.at_level("WARNING", logger="core.mesh_handler"):
+            arr = load_dxf_polyline(io.BytesIO(buf.getvalue().encode()), "trazo.dxf")
+        assert arr.size == 0
+        assert "trazo.dxf" in caplog.text
+
 
 class TestVertexClustering:
     def test_vertex_clustering_reduces_face_count(self, pit_mesh_design):
@@ -191,3 +326,68 @@ class TestVertexClustering:
         original = len(pit_mesh_design.faces)
         out = _vertex_clustering(pit_mesh_design, target_faces=original * 10)
         assert len(out.faces) >= 1
+
+
+class TestMeshContourLines:
+    @staticmethod
+    def _polyline_length(segs):
+        return sum(float(np.linalg.norm(np.diff(s, axis=0), axis=1).sum()) for s in segs)
+
+    def test_matches_exact_section_on_closed_mesh(self):
+        import trimesh
+        from core.mesh_handler import _contour_lines_by_section, mesh_contour_lines
+        mesh = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+        levels = np.arange(-9.5, 10.0, 2.0)
+
+        traced = dict(mesh_contour_lines(mesh, levels))
+        exact = dict(_contour_lines_by_section(mesh, levels))
+
+        assert traced.keys() == exact.keys()
+        for z in exact:
+            assert len(traced[z]) == len(exact[z])
+            assert self._polyline_length(traced[z]) == pytest.approx(
+                self._polyline_length(exact[z]), rel=1e-9
+            )
+
+    def test_level_at_flat_bench_matches_section(self, pit_mesh_design):
+        from core.mesh_handler import _contour_lines_by_section, mesh_contour_lines
+        # Berm elevations: many vertices sit exactly on each flat bench.
+        z, counts = np.unique(pit_mesh_design.vertices[:, 2], return_counts=True)
+        levels = z[counts >= 20]
+
+        traced = dict(mesh_contour_lines(pit_mesh_design, levels))
+        exact = dict(_contour_lines_by_section(pit_mesh_design, levels))
+
+        assert exact
+        assert traced.keys() == exact.keys()
+        for lvl in exact:
+            assert self._polyline_length(traced[lvl]) == pytest.approx(
+                self._polyline_length(exact[lvl]), rel=1e-9
+            )
+
+    def test_pit_mesh_contours_are_2d_polylines(self, pit_mesh_design):
+        from core.mesh_handler import mesh_contour_lines
+        z0, z1 = pit_mesh_design.bounds[:, 2]
+        lines = mesh_contour_lines(pit_mesh_design, np.linspace(z0, z1, 7)[1:-1])
+        assert lines
+        for _, segs in lines:
+            assert all(s.ndim == 2 and s.shape[1] == 2 and len(s) >= 2 for s in segs)
+
+    def test_falls_back_to_section_when_tracer_fails(self, monkeypatch):
+        import matplotlib.tri as mtri
+        import trimesh
+        from core.mesh_handler import mesh_contour_lines
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("tracer unavailable")
+
+        monkeypatch.setattr(mtri, "Triangulation", broken)
+        mesh = trimesh.creation.box((10.0, 10.0, 10.0))
+        lines = mesh_contour_lines(mesh, [0.0])
+        assert len(lines) == 1 and lines[0][0] == 0.0
+        assert self._polyline_length(lines[0][1]) == pytest.approx(40.0)
+
+    def test_empty_levels(self):
+        import trimesh
+        from core.mesh_handler import mesh_contour_lines
+        assert mesh_contour_lines(trimesh.creation.box(), []) == []
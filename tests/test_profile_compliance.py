@@ -1,12 +1,17 @@
-"""Tests for core.profile_compliance.compute_sector_deviations (Phase 21)."""
+"""Tests for core.profile_compliance.compute_sector_deviations (Phase 21),
+the bench-matching cost matrix and the reconciled-profile cache."""
 
 import numpy as np
 import pytest
 
 from core.profile_compliance import (
     SectorDeviation,
+    _build_cost_matrix,
+    _design_sector_boundaries,
+    build_reconciled_profile_cached,
     compute_sector_deviations,
 )
+from core.profile_extract import BenchParams
 
 
 def _linear_profile(d0=0.0, d1=300.0, e0=100.0, e1=130.0, n=601):
@@ -117,6 +122,20 @@ class TestComputeSectorDeviations:
         sectors_ok = compute_sector_deviations(d, e, d, e + 0.25, tolerance_m=0.3)
         assert sectors_ok[0].classification == "compliant"
 
+    def test_sector_areas_are_consistent_across_sectors(self):
+        d, e = _hump_profile()
+        topo_e = e + 0.6 * np.sin(d / 15.0)
+        sectors = compute_sector_deviations(d, e, d, topo_e)
+        assert len(sectors) == 3
+        for s in sectors:
+            assert s.area_above_m2 - s.area_below_m2 == pytest.approx(s.net_area_m2, abs=1e-9)
+            assert 0.0 <= s.max_delta_h <= 0.6 + 1e-9
+            assert abs(s.mean_delta_h) <= s.max_delta_h
+            assert s.d_start <= s.centroid_d <= s.d_end
+        # Sectors tile the profile, so their net areas add up to the whole.
+        whole = np.trapezoid(topo_e - e, d)
+        assert sum(s.net_area_m2 for s in sectors) == pytest.approx(whole, abs=0.05)
+
 
 class TestSectorHoverData:
 
@@ -160,3 +179,87 @@ class TestSectorHoverData:
         for s in sectors:
             assert s.mean_delta_h < 0
             assert s.area_below_m2 > 0.0
+
+
+class TestDesignSectorBoundaries:
+    def test_reports_crests_and_toes_once(self):
+        d = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        e = np.array([0.0, 2.0, 1.0, 1.0, 3.0, np.nan, 4.0])
+        # Peak at d=1, trough at d=2 (the flat run counts as rising), and
+        # nothing around the NaN elevation.
+        assert _design_sector_boundaries(d, e) == [1.0, 2.0]
+
+    def test_monotonic_profile_has_no_boundaries(self):
+        d, e = _linear_profile(n=50)
+        assert _design_sector_boundaries(d, e) == []
+
+
+class TestBuildCostMatrix:
+    @staticmethod
+    def _bench(cd, ce, td, te):
+        return BenchParams(
+            bench_number=1, crest_elevation=ce, crest_distance=cd,
+            toe_elevation=te, toe_distance=td, bench_height=abs(ce - te),
+            face_angle=70.0, berm_width=8.0,
+        )
+
+    def test_matches_pairwise_formula(self):
+        design = [self._bench(5, 100, 10, 85), self._bench(18, 85, 23, 70)]
+        topo = [self._bench(6, 99, 11, 84), self._bench(19, 86, 25, 71), self._bench(40, 40, 45, 25)]
+        cost = _build_cost_matrix(design, topo, match_threshold=8.0)
+
+        assert cost.shape == (2, 3)
+        for i, bd in enumerate(design):
+            bd_z = (bd.crest_elevation + bd.toe_elevation) / 2
+            bd_x = (bd.crest_distance + bd.toe_distance) / 2
+            for j, bt in enumerate(topo):
+                bt_z = (bt.crest_elevation + bt.toe_elevation) / 2
+                bt_x = (bt.crest_distance + bt.toe_distance) / 2
+                if abs(bd_z - bt_z) >= 8.0:
+                    assert cost[i, j] == 1e9
+                else:
+                    expected = np.sqrt(1.5 * (bd_z - bt_z) ** 2 + (bd_x - bt_x) ** 2)
+                    assert cost[i, j] == pytest.approx(expected)
+
+    def test_empty_side(self):
+        assert _build_cost_matrix([], [self._bench(0, 10, 5, 0)]).shape == (0, 1)
+
+
+class TestBuildReconciledProfileCached:
+    @staticmethod
+    def _bench(toe_x):
+        return BenchParams(
+            bench_number=1, crest_elevation=100.0, crest_distance=0.0,
+            toe_elevation=85.0, toe_distance=float(toe_x), bench_height=15.0,
+            face_angle=70.0, berm_width=8.0,
+        )
+
+    def test_equal_geometry_reuses_profile(self):
+        first = build_reconciled_profile_cached([self._bench(5)])
+        assert build_reconciled_profile_cached([self._bench(5)]) is first
+
+    def test_moved_bench_rebuilds_profile(self):
+        first = build_reconciled_profile_cached([self._bench(5)])
+        moved = build_reconciled_profile_cached([self._bench(6)])
+        assert moved is not first
+        assert moved.distances.max() != first.distances.max()
+
+    def test_source_is_part_of_the_key(self):
+        topo = build_reconciled_profile_cached([self._bench(7)])
+        design = build_reconciled_profile_cached([self._bench(7)], source="design")
+        assert design is not topo
+        assert topo.distances.max() == pytest.approx(7.0)
+
+    def test_concurrent_misses_respect_capacity(self, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        import core.profile_compliance as pc
+
+        monkeypatch.setattr(pc, "_RECONCILED_CACHE_MAX", 4)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            profiles = list(pool.map(
+                lambda x: build_reconciled_profile_cached([self._bench(x)]),
+                range(10, 74),
+            ))
+        assert len(profiles) == 64
+        assert len(pc._reconciled_cache) <= 4
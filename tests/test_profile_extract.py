@@ -8,8 +8,15 @@ import pytest
 
 from core.profile_extract import (
     BenchParams,
+    ExtractionResult,
     ReconciledPoint,
     ReconciledProfile,
+    _bench_geometry_arrays,
+    _find_local_extrema,
+    _merge_adjacent_segments,
+    _vote_bench_detection,
+    _vote_features,
+    bench_arrays,
     extract_parameters,
 )
 
@@ -150,3 +157,70 @@ def test_empty_reconciled_profile_has_stable_schema_and_defaults():
     ]
     assert profile.summary()["height_range_m"] == (0.0, 0.0)
     assert profile.to_dict()["source"] == "topo"
+
+
+def test_bench_geometry_arrays_matches_scalar_formula():
+    crest_d = [5.0, 20.0, 30.0]
+    crest_e = [100.0, 85.0, 70.0]
+    toe_d = [10.0, 20.005, 25.0]  # second bench is vertical, third overhangs
+    toe_e = [85.0, 70.0, 55.0]
+
+    heights, angles = _bench_geometry_arrays(crest_d, crest_e, toe_d, toe_e)
+
+    np.testing.assert_allclose(heights, [15.0, 15.0, 15.0])
+    expected_first = np.degrees(np.arctan2(15.0, 5.0))
+    np.testing.assert_allclose(angles, [expected_first, 90.0, expected_first])
+
+
+def test_bench_geometry_arrays_empty():
+    heights, angles = _bench_geometry_arrays([], [], [], [])
+    assert heights.shape == (0,) and angles.shape == (0,)
+
+
+def test_bench_arrays_soa_view_matches_benches():
+    benches = [_bench(1), _bench(2, crest_distance=20.0, toe_distance=26.0, berm_width=0.0)]
+    arr = ExtractionResult(section_name="S", sector="A", benches=benches).bench_arrays()
+
+    np.testing.assert_array_equal(arr.crest_distance, [5.0, 20.0])
+    np.testing.assert_array_equal(arr.toe_distance, [10.0, 26.0])
+    np.testing.assert_array_equal(arr.berm_width, [8.0, 0.0])
+    assert all(a.flags.c_contiguous and a.dtype == float for a in arr)
+
+
+def test_bench_arrays_empty():
+    arr = bench_arrays([])
+    assert all(a.shape == (0,) for a in arr)
+
+
+def test_find_local_extrema_on_staircase():
+    d = np.arange(13, dtype=float)
+    e = np.array([30, 30, 30, 25, 20, 20, 20, 20, 15, 10, 10, 10, 10], dtype=float)
+    crests, toes = _find_local_extrema(d, e, window=1)
+    assert crests == [2, 7]
+    assert toes == [4, 9]
+
+
+def test_find_local_extrema_respects_window_and_short_input():
+    e = np.array([10, 10, 5, 5, 5, 0, 0], dtype=float)
+    assert _find_local_extrema(np.arange(7.0), e, window=2) == ([4], [2])
+    assert _find_local_extrema(np.arange(3.0), e[:3], window=3) == ([], [])
+
+
+def test_vote_with_shared_features_matches_standalone():
+    d = np.linspace(0.0, 120.0, 1201)
+    e = np.floor(d / 20.0) * -15.0 - np.clip(d % 20.0 - 12.0, 0.0, 8.0) * 15.0 / 8.0
+    features = _vote_features(d, e)
+    for lo, hi in [(12.0, 20.0), (32.0, 40.0), (0.0, 5.0), (100.0, 119.0)]:
+        assert _vote_bench_detection(lo, hi, d, e, 60.0, features=features) == \
+            _vote_bench_detection(lo, hi, d, e, 60.0)
+
+
+def test_merge_adjacent_segments_runs():
+    merged = _merge_adjacent_segments(np.array([1, 1, 2, 2, 2, 0, 1]))
+    assert merged == [
+        {"type": 1, "start_idx": 0, "end_idx": 2},
+        {"type": 2, "start_idx": 2, "end_idx": 5},
+        {"type": 0, "start_idx": 5, "end_idx": 6},
+        {"type": 1, "start_idx": 6, "end_idx": 7},
+    ]
+    assert _merge_adjacent_segments(np.array([], dtype=int)) == []
@@ -3,7 +3,12 @@
 import numpy as np
 import pytest
 
-from core.profile_simplify import _detect_and_project_solid_toe, ramer_douglas_peucker
+from core.profile_simplify import (
+    _detect_and_project_solid_toe,
+    _rdp_keep_mask,
+    _rdp_keep_mask_scalar,
+    ramer_douglas_peucker,
+)
 
 
 def test_rdp_removes_collinear_interior_points():
@@ -31,6 +36,46 @@ def test_rdp_returns_short_inputs_unchanged(points):
     np.testing.assert_array_equal(simplified, points)
 
 
+def _rdp_reference(points, epsilon):
+    """Textbook recursive RDP, used as the oracle for the iterative version."""
+    if len(points) < 3:
+        return points
+    start, end = points[0], points[-1]
+    line = end - start
+    norm = np.hypot(*line)
+    seg = points[1:-1] - start
+    if norm == 0:
+        dists = np.hypot(seg[:, 0], seg[:, 1])
+    else:
+        dists = np.abs(line[0] * seg[:, 1] - line[1] * seg[:, 0]) / norm
+    idx = int(np.argmax(dists)) + 1
+    if dists[idx - 1] > epsilon:
+        left = _rdp_reference(points[:idx + 1], epsilon)
+        right = _rdp_reference(points[idx:], epsilon)
+        return np.vstack([left[:-1], right])
+    return points[[0, -1]]
+
+
+def test_rdp_matches_recursive_reference_on_noisy_profile():
+    rng = np.random.default_rng(7)
+    x = np.linspace(0.0, 200.0, 800)
+    points = np.column_stack([x, 0.5 * x + np.cumsum(rng.normal(0.0, 0.3, x.size))])
+    np.testing.assert_array_equal(
+        ramer_douglas_peucker(points, epsilon=0.5), _rdp_reference(points, 0.5))
+
+
+@pytest.mark.parametrize("y_nan", [False, True])
+def test_rdp_scalar_kernel_matches_numpy_kernel(y_nan):
+    # The scalar kernel is what numba compiles; run it uncompiled here.
+    rng = np.random.default_rng(3)
+    xs = np.linspace(0.0, 100.0, 300)
+    ys = np.cumsum(rng.normal(0.0, 0.4, xs.size))
+    if y_nan:
+        ys[150] = np.nan
+    np.testing.assert_array_equal(
+        _rdp_keep_mask_scalar(xs, ys, 0.3), _rdp_keep_mask(xs, ys, 0.3))
+
+
 def test_rdp_handles_closed_polyline_with_coincident_endpoints():
     points = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]])
     simplified = ramer_douglas_peucker(points, epsilon=0.1)
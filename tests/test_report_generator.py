@@ -165,6 +165,16 @@ class TestGenerateSectionImagesZip:
         result = generate_section_images_zip(all_data)
         assert result is not None
 
+    def test_reused_figure_renders_each_section(self):
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 6))
+        d = np.linspace(0, 30, 10)
+        first = create_section_plot(None, None, d, 100 - d, d, 99 - d, figure=figure)
+        second = create_section_plot(None, None, d, 80 - d, d, 79 - d, figure=figure)
+        assert first.getvalue().startswith(b"\x89PNG")
+        assert second.getvalue().startswith(b"\x89PNG")
+        assert len(figure.axes) == 1
+
     def test_zip_with_plot_options(self):
         all_data = [
             {
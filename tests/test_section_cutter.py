@@ -8,11 +8,19 @@ from core import SectionLine, cut_mesh_with_section
 from core.section_cutter import (
     ProfileResult,
     azimuth_to_direction,
+    azimuths_to_directions,
     compute_local_azimuth,
+    compute_local_azimuth_batch,
     cut_both_surfaces,
+    cut_both_surfaces_batch,
+    cut_mesh_with_sections,
+    section_endpoints,
+    face_xy_index,
     generate_perpendicular_sections,
     generate_sections_along_crest,
+    vertex_xy_kdtree,
 )
+from core.section_cutter import _profile_from_points
 
 
 class TestCutMesh:
@@ -67,6 +75,37 @@ class TestCutMesh:
         result = cut_mesh_with_section(pit_mesh_design, section)
         assert result is None
 
+    def test_local_faces_match_whole_mesh_slice(self, pit_mesh_asbuilt):
+        """Cortar solo las caras cercanas da el mismo perfil que la malla completa."""
+        rng = np.random.default_rng(3)
+        sections = [
+            SectionLine(name=f"S{k}", origin=rng.uniform(0.0, 500.0, 2),
+                        azimuth=float(rng.uniform(0.0, 360.0)),
+                        length=float(rng.uniform(10.0, 500.0)))
+            for k in range(12)
+        ] + [SectionLine(name="S-GRID", origin=np.array([250.0, 250.0]), azimuth=90.0,
+                         length=0.0, length_up=120.0, length_down=40.0)]
+        for sec in sections:
+            direction = sec.direction
+            lines = trimesh.intersections.mesh_plane(
+                pit_mesh_asbuilt, [direction[1], -direction[0], 0.0],
+                [sec.origin[0], sec.origin[1], 0.0])
+            expected = _profile_from_points(np.asarray(lines).reshape(-1, 3), sec, direction)
+            got = cut_mesh_with_section(pit_mesh_asbuilt, sec)
+            if expected is None:
+                assert got is None
+            else:
+                np.testing.assert_array_equal(got.distances, expected.distances)
+                np.testing.assert_array_equal(got.elevations, expected.elevations)
+
+    def test_face_index_cached_on_mesh(self):
+        mesh = _plane_mesh(a=-1.0, b=0.0, c=1000.0)
+        tree, reach = face_xy_index(mesh)
+        assert face_xy_index(mesh)[0] is tree
+        assert reach == pytest.approx(np.hypot(20.0, 10.0) / 3)
+        mesh.vertices = mesh.vertices + 1.0
+        assert face_xy_index(mesh)[0] is not tree
+
 
 class TestGenerateSections:
     """Tests for section generation."""
@@ -182,6 +221,42 @@ class TestAzimuthDirection:
         d = azimuth_to_direction(270.0)
         np.testing.assert_allclose(d, [-1.0, 0.0], atol=1e-10)
 
+    def test_batch_matches_scalar(self):
+        """azimuths_to_directions devuelve (N, 2) igual al helper escalar."""
+        az = np.array([0.0, 37.5, 90.0, 181.2, 359.9])
+        dirs = azimuths_to_directions(az)
+        assert dirs.shape == (5, 2)
+        for a, d in zip(az, dirs):
+            np.testing.assert_allclose(d, azimuth_to_direction(a), atol=1e-12)
+        assert azimuths_to_directions([]).shape == (0, 2)
+
+    def test_section_endpoints_match_per_section_formula(self):
+        """section_endpoints apila origin ∓ direction·length/2 de cada sección."""
+        secs = [
+            SectionLine(name=f"S{i}", origin=np.array([10.0 * i, -3.0 * i]),
+                        azimuth=az, length=length)
+            for i, (az, length) in enumerate([(0.0, 20.0), (45.0, 50.0), (300.0, 7.5)])
+        ]
+        p1, p2 = section_endpoints(secs)
+        assert p1.shape == p2.shape == (3, 2)
+        for sec, a, b in zip(secs, p1, p2):
+            d = azimuth_to_direction(sec.azimuth)
+            np.testing.assert_allclose(a, sec.origin - d * sec.length / 2, atol=1e-12)
+            np.testing.assert_allclose(b, sec.origin + d * sec.length / 2, atol=1e-12)
+        empty = section_endpoints([])
+        assert empty[0].shape == empty[1].shape == (0, 2)
+
+    def test_section_direction_is_memoised_and_tracks_azimuth(self):
+        """SectionLine.direction reuses its vector until the azimuth changes."""
+        sec = SectionLine(name="S", origin=np.array([0.0, 0.0]), azimuth=90.0, length=10.0)
+        first = sec.direction
+        assert sec.direction is first
+        assert not first.flags.writeable
+        np.testing.assert_allclose(first, [1.0, 0.0], atol=1e-10)
+
+        sec.azimuth = 0.0
+        np.testing.assert_allclose(sec.direction, [0.0, 1.0], atol=1e-10)
+
 
 def _plane_mesh(a=0.0, b=0.0, c=1000.0, extent=100.0, step=10.0):
     xs = np.arange(-extent, extent + step, step)
@@ -202,6 +277,15 @@ def _plane_mesh(a=0.0, b=0.0, c=1000.0, extent=100.0, step=10.0):
     return trimesh.Trimesh(vertices=verts, faces=np.array(faces))
 
 
+class TestProfileResult:
+    def test_elev_max_is_memoised_and_tracks_elevations(self):
+        prof = ProfileResult(distances=np.array([0.0, 1.0]), elevations=np.array([3.0, 7.0]))
+        assert prof.elev_max == 7.0
+        assert prof.elev_max == 7.0
+        prof.elevations = np.array([2.0, 9.0])
+        assert prof.elev_max == 9.0
+
+
 class TestCutBothSurfaces:
     """Tests for cutting design + topo with the same section."""
 
@@ -235,6 +319,46 @@ class TestCutBothSurfaces:
         assert pt_prof is None
 
 
+class TestCutMeshWithSections:
+    """Tests for the batched multi-section cutter."""
+
+    def test_matches_single_section_cutter(self, pit_mesh_asbuilt, sample_sections):
+        sections = sample_sections + [
+            SectionLine(name="S-ASYM", origin=np.array([250.0, 250.0]), azimuth=37.0,
+                        length=0.0, length_up=150.0, length_down=80.0),
+            SectionLine(name="S-FAR", origin=np.array([9999.0, 9999.0]),
+                        azimuth=0.0, length=400.0),
+        ]
+        batched = cut_mesh_with_sections(pit_mesh_asbuilt, sections)
+
+        assert len(batched) == len(sections)
+        for sec, got in zip(sections, batched):
+            expected = cut_mesh_with_section(pit_mesh_asbuilt, sec)
+            if expected is None:
+                assert got is None
+                continue
+            np.testing.assert_allclose(got.distances, expected.distances, atol=1e-9)
+            np.testing.assert_allclose(got.elevations, expected.elevations, atol=1e-6)
+
+    def test_empty_sections_returns_empty(self, pit_mesh_design):
+        assert cut_mesh_with_sections(pit_mesh_design, []) == []
+
+    def test_reuses_face_index_without_rehashing(self, pit_mesh_asbuilt, sample_sections):
+        index = face_xy_index(pit_mesh_asbuilt)
+        cut_mesh_with_sections(pit_mesh_asbuilt, sample_sections)
+        assert not getattr(pit_mesh_asbuilt.vertices, "_dirty_hash", False)
+        assert face_xy_index(pit_mesh_asbuilt) is index
+
+    def test_both_surfaces_batch_pairs_in_order(self, pit_mesh_design, pit_mesh_asbuilt,
+                                                sample_sections):
+        pairs = cut_both_surfaces_batch(pit_mesh_design, pit_mesh_asbuilt, sample_sections)
+        assert len(pairs) == len(sample_sections)
+        for sec, (pd_prof, pt_prof) in zip(sample_sections, pairs):
+            ref_d, ref_t = cut_both_surfaces(pit_mesh_design, pit_mesh_asbuilt, sec)
+            np.testing.assert_allclose(pd_prof.elevations, ref_d.elevations, atol=1e-6)
+            np.testing.assert_allclose(pt_prof.elevations, ref_t.elevations, atol=1e-6)
+
+
 class TestComputeLocalAzimuth:
     """Tests for steepest-descent azimuth on a mesh surface."""
 
@@ -243,6 +367,15 @@ class TestComputeLocalAzimuth:
         az = compute_local_azimuth(mesh, np.array([0.0, 0.0]), radius=50.0)
         assert az == pytest.approx(90.0, abs=1.0)
 
+    def test_repeat_calls_keep_mesh_hash_clean(self):
+        """Cached-tree lookups must not re-hash the mesh on every call."""
+        mesh = _plane_mesh(a=-1.0, b=0.0, c=1000.0)
+        tree = vertex_xy_kdtree(mesh)
+        for _ in range(2):
+            compute_local_azimuth(mesh, np.array([0.0, 0.0]), radius=50.0)
+            assert not getattr(mesh.vertices, "_dirty_hash", False)
+        assert vertex_xy_kdtree(mesh) is tree
+
     def test_flat_plane_returns_zero(self):
         mesh = _plane_mesh(a=0.0, b=0.0, c=1000.0)
         az = compute_local_azimuth(mesh, np.array([0.0, 0.0]), radius=50.0)
@@ -253,6 +386,40 @@ class TestComputeLocalAzimuth:
         az = compute_local_azimuth(box, np.array([0.0, 0.0]), radius=2.0)
         assert az == 0.0
 
+    def test_matches_brute_force_neighbourhood(self):
+        rng = np.random.default_rng(7)
+        mesh = _plane_mesh(a=-0.4, b=0.7, c=1000.0)
+        mesh.vertices = mesh.vertices + rng.normal(0, 0.5, mesh.vertices.shape)
+        point = np.array([3.0, -2.0])
+        verts = np.asarray(mesh.vertices)
+        mask = ((verts[:, 0] - point[0]) ** 2 + (verts[:, 1] - point[1]) ** 2) < 20.0 ** 2
+        A = np.column_stack([verts[mask, 0], verts[mask, 1], np.ones(mask.sum())])
+        a, b, _ = np.linalg.lstsq(A, verts[mask, 2], rcond=None)[0]
+        expected = np.degrees(np.arctan2(-a, -b)) % 360
+        assert compute_local_azimuth(mesh, point, radius=20.0) == pytest.approx(expected)
+
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(11)
+        mesh = _plane_mesh(a=-0.4, b=0.7, c=1000.0)
+        mesh.vertices = mesh.vertices + rng.normal(0, 0.5, mesh.vertices.shape)
+        origins = np.array([[0.0, 0.0], [35.0, -60.0], [95.0, 95.0], [1e4, 1e4]])
+        expected = [compute_local_azimuth(mesh, o, radius=20.0) for o in origins]
+        got = compute_local_azimuth_batch(mesh, origins, radius=20.0)
+        np.testing.assert_allclose(got, expected, atol=1e-6)
+        assert got[-1] == 0.0  # no neighbours even at 3x radius
+
+    def test_batch_flat_and_empty(self):
+        mesh = _plane_mesh(a=0.0, b=0.0, c=1000.0)
+        assert compute_local_azimuth_batch(mesh, [[0.0, 0.0], [10.0, 5.0]]).tolist() == [0.0, 0.0]
+        assert compute_local_azimuth_batch(mesh, np.empty((0, 2))).shape == (0,)
+
+    def test_xy_tree_cached_on_mesh(self):
+        mesh = _plane_mesh(a=-1.0, b=0.0, c=1000.0)
+        tree = vertex_xy_kdtree(mesh)
+        assert vertex_xy_kdtree(mesh) is tree
+        mesh.vertices = mesh.vertices + 1.0
+        assert vertex_xy_kdtree(mesh) is not tree
+
 
 class TestGeneratePerpendicularSections:
     """Tests for sections perpendicular to a polyline."""
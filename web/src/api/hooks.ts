@@ -135,24 +135,30 @@ export function useDeleteMesh() {
   });
 }
 
+function strideContours(data: ContourData, resolution: number): ContourData {
+  return {
+    ...data,
+    lines: data.lines.map((line) => ({
+      ...line,
+      segments: line.segments.map((segment) => segment.filter((_, i) => i % resolution === 0)),
+    })),
+  };
+}
+
 export function useMeshContours(meshId: string | null, interval = 15.0, resolution = 1) {
+  const select = useCallback(
+    (data: ContourData) => (resolution <= 1 ? data : strideContours(data, resolution)),
+    [resolution],
+  );
   return useQuery({
-    queryKey: ['mesh-contours', meshId, interval, resolution],
-    queryFn: async () => {
-      const data = await client
+    queryKey: ['mesh-contours', meshId, interval],
+    queryFn: () =>
+      client
         .get<ContourData>(`/meshes/${meshId}/contours`, { params: { interval } })
-        .then(r => r.data);
-      if (resolution <= 1) return data;
-      // Client-side decimation: the backend does not expose a resolution
-      // parameter, so we stride the contour points by the chosen factor.
-      return {
-        ...data,
-        lines: data.lines.map((line) => ({
-          ...line,
-          segments: line.segments.map((segment) => segment.filter((_, i) => i % resolution === 0)),
-        })),
-      };
-    },
+        .then(r => r.data),
+    select,
+    placeholderData: (previous, previousQuery) =>
+      previousQuery?.queryKey[1] === meshId ? previous : undefined,
     enabled: !!meshId,
   });
 }
@@ -230,7 +236,16 @@ export function useClickSection() {
   return useMutation({
     mutationFn: (params: SectionClickParams) =>
       client.post<{ section: SectionResponse; total: number }>('/sections/click', params).then(r => r.data),
-    onSuccess: () => qc.invalidateQueries({ queryKey: ['sections'] }),
+    onSuccess: (data) => {
+      const { demoMode, designMeshId } = useSession.getState();
+      const key = ['sections', demoMode, designMeshId];
+      const current = qc.getQueryData<SectionResponse[]>(key);
+      if (current && current.length === data.total - 1) {
+        qc.setQueryData<SectionResponse[]>(key, [...current, data.section]);
+      } else {
+        qc.invalidateQueries({ queryKey: ['sections'] });
+      }
+    },
   });
 }
 
@@ -852,10 +867,20 @@ export function useCurveSection() {
       // meshes while still in demo mode (the flag stays sticky), the
       // POST must proceed so we hit the real backend pipeline.
       if (demoMode && demoData && isDemoMeshId(designMeshId)) return;
-      await client.post('/sections/curve', params);
+      return client
+        .post<{ sections: SectionResponse[] }>('/sections/curve', params)
+        .then(r => r.data);
     },
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['sections'] });
+    onSuccess: (data) => {
+      if (data) {
+        const { demoMode, designMeshId } = useSession.getState();
+        queryClient.setQueryData<SectionResponse[]>(
+          ['sections', demoMode, designMeshId],
+          data.sections,
+        );
+      } else {
+        queryClient.invalidateQueries({ queryKey: ['sections'] });
+      }
     },
   });
 }
@@ -1,4 +1,4 @@
-import { useMemo, useState } from 'react';
+import { useEffect, useMemo, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import {
   Chart,
@@ -56,20 +56,32 @@ const RESOLUTION_STRIDE: Record<ContourResolution, number> = {
   high: 1,
 };
 
+export const INTERVAL_DEBOUNCE_MS = 300;
+
+const SECTIONS_DATASET_LABEL = '__sections__';
+const POINTS_PER_SECTION = 4;
+
 export function ContourChart() {
   const { t } = useTranslation();
   const designMeshId = useSession((s) => s.designMeshId);
   const topoMeshId = useSession((s) => s.topoMeshId);
   const [meshMode, setMeshMode] = useState<ContourMeshMode>('topo');
   const [interval, setInterval] = useState(2.0);
+  const [queryInterval, setQueryInterval] = useState(interval);
   const [resolution, setResolution] = useState<ContourResolution>('medium');
   const stride = RESOLUTION_STRIDE[resolution];
 
+  useEffect(() => {
+    if (interval === queryInterval) return;
+    const id = setTimeout(() => setQueryInterval(interval), INTERVAL_DEBOUNCE_MS);
+    return () => clearTimeout(id);
+  }, [interval, queryInterval]);
+
   const activeDesignMeshId = meshMode === 'design' || meshMode === 'ambas' ? designMeshId : null;
   const activeTopoMeshId = meshMode === 'topo' || meshMode === 'ambas' ? topoMeshId : null;
 
-  const designContours = useMeshContours(activeDesignMeshId, interval, stride);
-  const topoContours = useMeshContours(activeTopoMeshId, interval, stride);
+  const designContours = useMeshContours(activeDesignMeshId, queryInterval, stride);
+  const topoContours = useMeshContours(activeTopoMeshId, queryInterval, stride);
   const { data: sections } = useSections();
   const { data: referenceLinesData } = useReferenceLines(null);
   const { isDark } = useTheme();
@@ -138,38 +150,35 @@ export function ContourChart() {
     });
   }, [contourData]);
 
-  // Section line datasets
   const sectionDatasets = useMemo<ChartDataset<'line'>[]>(() => {
     if (!sections || sections.length === 0) return [];
     const secColor = isDark ? '#f87171' : '#ef4444';
 
-    return sections.map((sec) => {
+    const points: { x: number; y: number }[] = [];
+    for (const sec of sections) {
       const azRad = (sec.azimuth * Math.PI) / 180;
       const dx = Math.sin(azRad) * sec.length;
       const dy = Math.cos(azRad) * sec.length;
-      const x1 = sec.origin[0] - dx / 2;
-      const y1 = sec.origin[1] - dy / 2;
-      const x2 = sec.origin[0] + dx / 2;
-      const y2 = sec.origin[1] + dy / 2;
+      points.push(
+        { x: sec.origin[0] - dx / 2, y: sec.origin[1] - dy / 2 },
+        { x: sec.origin[0], y: sec.origin[1] },
+        { x: sec.origin[0] + dx / 2, y: sec.origin[1] + dy / 2 },
+        { x: NaN, y: NaN },
+      );
+    }
 
-      return {
-        label: sec.name,
-        data: [
-          { x: x1, y: y1 },
-          { x: sec.origin[0], y: sec.origin[1] },
-          { x: x2, y: y2 },
-          { x: NaN, y: NaN },
-        ],
-        borderColor: secColor,
-        backgroundColor: 'transparent',
-        borderWidth: 2,
-        pointRadius: 0,
-        tension: 0,
-        fill: false,
-        spanGaps: false,
-        parsing: false,
-      };
-    });
+    return [{
+      label: SECTIONS_DATASET_LABEL,
+      data: points,
+      borderColor: secColor,
+      backgroundColor: 'transparent',
+      borderWidth: 2,
+      pointRadius: 0,
+      tension: 0,
+      fill: false,
+      spanGaps: false,
+      parsing: false,
+    }];
   }, [sections, isDark]);
 
   const referenceLineDatasets = useMemo<ChartDataset<'line'>[]>(
@@ -222,7 +231,12 @@ export function ContourChart() {
               const p = pt as { x: number; y: number };
               return `(${p.x.toFixed(1)}, ${p.y.toFixed(1)})`;
             },
-            label: (item: TooltipItem<'line'>) => item.dataset.label || '',
+            label: (item: TooltipItem<'line'>) => {
+              if (item.dataset.label === SECTIONS_DATASET_LABEL) {
+                return sections?.[Math.floor(item.dataIndex / POINTS_PER_SECTION)]?.name ?? '';
+              }
+              return item.dataset.label || '';
+            },
           },
         },
       },
@@ -257,7 +271,7 @@ export function ContourChart() {
         },
       },
     };
-  }, [contourData, isDark, textColor, gridColor]);
+  }, [contourData, sections, isDark, textColor, gridColor]);
 
   const requiredMeshId = meshMode === 'design'
     ? designMeshId
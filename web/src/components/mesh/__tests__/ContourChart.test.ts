@@ -1,9 +1,9 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { createElement } from 'react';
-import { render, screen, fireEvent } from '@testing-library/react';
+import { act, render, screen, fireEvent, waitFor } from '@testing-library/react';
 import userEvent from '@testing-library/user-event';
 import i18n from '../../../i18n';
-import { computeContourAspectRatio, ContourChart } from '../ContourChart';
+import { computeContourAspectRatio, ContourChart, INTERVAL_DEBOUNCE_MS } from '../ContourChart';
 import type { ContourData } from '../../../api/types';
 
 let meshContoursCalls: Array<{ meshId: string | null; interval: number; resolution: number }> = [];
@@ -176,6 +176,30 @@ describe('<ContourChart /> toolbar', () => {
     const slider = screen.getByRole('slider', { name: /Intervalo/i });
     fireEvent.change(slider, { target: { value: '4.5' } });
 
-    expect(meshContoursCalls).toContainEqual({ meshId: 'topo-id', interval: 4.5, resolution: 2 });
+    await waitFor(() =>
+      expect(meshContoursCalls).toContainEqual({ meshId: 'topo-id', interval: 4.5, resolution: 2 }),
+    );
+  });
+
+  it('interval slider only queries the value it settles on', () => {
+    vi.useFakeTimers();
+    try {
+      render(createElement(ContourChart));
+      meshContoursCalls = [];
+
+      const slider = screen.getByRole('slider', { name: /Intervalo/i });
+      fireEvent.change(slider, { target: { value: '3' } });
+      fireEvent.change(slider, { target: { value: '3.5' } });
+      fireEvent.change(slider, { target: { value: '4' } });
+      expect(meshContoursCalls.every((c) => c.interval === 2)).toBe(true);
+
+      act(() => {
+        vi.advanceTimersByTime(INTERVAL_DEBOUNCE_MS);
+      });
+      expect(meshContoursCalls).toContainEqual({ meshId: 'topo-id', interval: 4, resolution: 2 });
+      expect(meshContoursCalls.some((c) => c.interval === 3 || c.interval === 3.5)).toBe(false);
+    } finally {
+      vi.useRealTimers();
+    }
   });
 });
@@ -96,9 +96,14 @@ export function ProfileChart({ viewModel, filterState, crossLink, height = 480 }
 
   // ── 1. Build the data array (pure derivation) ─────────────
   const blastHoles = blastQuery.data?.holes;
+  const showAreas = filterState.showAreas;
+  const areaFills = useMemo(
+    () => (showAreas ? buildAreaFillTraces(viewModel, isDark) : []),
+    [viewModel, showAreas, isDark],
+  );
   const data = useMemo<Data[]>(
-    () => buildTraces(viewModel, filterState, crossLink, isDark, blastHoles),
-    [viewModel, filterState, crossLink, isDark, blastHoles],
+    () => buildTraces(viewModel, filterState, crossLink, isDark, blastHoles, areaFills),
+    [viewModel, filterState, crossLink, isDark, blastHoles, areaFills],
   );
 
   // ── 2. Build the layout (pure, depends on viewModel + theme) ─
@@ -337,16 +342,13 @@ export function buildTraces(
   crossLink: UseCrossLinkStateApi,
   isDark: boolean,
   blastHoles?: readonly BlastHoleOnProfile[],
+  areaFills?: readonly Data[],
 ): Data[] {
   const traces: Data[] = [];
 
   // 1. Area fill between design and topo (when showAreas)
   if (filterState.showAreas) {
-    const design = vm.lines.find((l) => l.kind === 'design');
-    const topo = vm.lines.find((l) => l.kind === 'topo');
-    if (design && design.points.length > 1 && topo && topo.points.length > 1) {
-      traces.push(...buildAreaFills(design, topo, isDark));
-    }
+    traces.push(...(areaFills ?? buildAreaFillTraces(vm, isDark)));
   }
 
   // 2. Design polyline (always, if data exists)
@@ -511,6 +513,20 @@ function buildGroundFill(
   };
 }
 
+/**
+ * Deuda / sobrexcavación fill traces between the design and topo
+ * lines, or `[]` when either line has fewer than two points.
+ * Exported for unit testing.
+ */
+export function buildAreaFillTraces(vm: ProfileViewModel, isDark: boolean): Data[] {
+  const design = vm.lines.find((l) => l.kind === 'design');
+  const topo = vm.lines.find((l) => l.kind === 'topo');
+  if (design && design.points.length > 1 && topo && topo.points.length > 1) {
+    return buildAreaFills(design, topo, isDark);
+  }
+  return [];
+}
+
 function buildAreaFills(
   design: ProfileLine,
   topo: ProfileLine,
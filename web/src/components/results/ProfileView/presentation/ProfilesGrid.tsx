@@ -2,11 +2,16 @@
  * ProfilesGrid — renders all processed sections as a 3-column grid
  * of compact ProfileChart thumbnails. Clicking a card selects the
  * section and switches to the single-profile view.
+ *
+ * Cards are memoised and their Plotly data/layout keep a stable
+ * identity until the profile or theme changes, so selecting a card
+ * (or any other grid re-render) does not re-draw every thumbnail.
  */
 
+import { memo, useCallback, useMemo } from 'react';
 import { useTranslation } from 'react-i18next';
 import Plot from 'react-plotly.js';
-import type { Data, Layout } from 'plotly.js';
+import type { Config, Data, Layout } from 'plotly.js';
 import { useSession } from '../../../../stores/session';
 import { useSections, useProfile } from '../../../../api/hooks';
 import type { SectionResponse } from '../../../../api/types';
@@ -17,22 +22,24 @@ import { useTheme } from '../../../../stores/theme';
 
 interface MiniCardProps {
   section: SectionResponse;
-  onSelect: () => void;
+  onSelect: (section: SectionResponse) => void;
   isSelected: boolean;
 }
 
-function MiniCard({ section, onSelect, isSelected }: MiniCardProps) {
+const MINI_PLOT_CONFIG: Partial<Config> = { displayModeBar: false, responsive: true };
+const MINI_PLOT_STYLE = { width: '100%', height: '100%' };
+
+const MiniCard = memo(function MiniCard({ section, onSelect, isSelected }: MiniCardProps) {
   const { isDark } = useTheme();
   const { data: profile } = useProfile(section.id);
 
-  const gridColor = isDark ? '#1e293b' : '#e2e8f0';
-  const designColor = '#7693b7';
-  const topoColor = '#4ade80';
-
-  const plotData: Data[] = [];
-  if (profile) {
+  const plotData = useMemo<Data[]>(() => {
+    const designColor = '#7693b7';
+    const topoColor = '#4ade80';
+    const traces: Data[] = [];
+    if (!profile) return traces;
     if (profile.design) {
-      plotData.push({
+      traces.push({
         x: profile.design.distances,
         y: profile.design.elevations,
         type: 'scatter',
@@ -43,7 +50,7 @@ function MiniCard({ section, onSelect, isSelected }: MiniCardProps) {
       });
     }
     if (profile.topo) {
-      plotData.push({
+      traces.push({
         x: profile.topo.distances,
         y: profile.topo.elevations,
         type: 'scatter',
@@ -53,36 +60,40 @@ function MiniCard({ section, onSelect, isSelected }: MiniCardProps) {
         showlegend: false,
       });
     }
-  }
-
-  const layout: Partial<Layout> = {
-    paper_bgcolor: 'transparent',
-    plot_bgcolor: 'transparent',
-    margin: { l: 28, r: 4, t: 4, b: 24 },
-    xaxis: {
-      showgrid: true,
-      gridcolor: gridColor,
-      zeroline: false,
-      tickfont: { size: 7, color: isDark ? '#64748b' : '#94a3b8' },
-      showticklabels: true,
-    },
-    yaxis: {
-      showgrid: true,
-      gridcolor: gridColor,
-      zeroline: false,
-      tickfont: { size: 7, color: isDark ? '#64748b' : '#94a3b8' },
-      showticklabels: true,
-      scaleanchor: 'x',
-      scaleratio: 1,
-    },
-    autosize: true,
-    hovermode: false,
-  };
+    return traces;
+  }, [profile]);
+
+  const layout = useMemo<Partial<Layout>>(() => {
+    const gridColor = isDark ? '#1e293b' : '#e2e8f0';
+    return {
+      paper_bgcolor: 'transparent',
+      plot_bgcolor: 'transparent',
+      margin: { l: 28, r: 4, t: 4, b: 24 },
+      xaxis: {
+        showgrid: true,
+        gridcolor: gridColor,
+        zeroline: false,
+        tickfont: { size: 7, color: isDark ? '#64748b' : '#94a3b8' },
+        showticklabels: true,
+      },
+      yaxis: {
+        showgrid: true,
+        gridcolor: gridColor,
+        zeroline: false,
+        tickfont: { size: 7, color: isDark ? '#64748b' : '#94a3b8' },
+        showticklabels: true,
+        scaleanchor: 'x',
+        scaleratio: 1,
+      },
+      autosize: true,
+      hovermode: false,
+    };
+  }, [isDark]);
 
   return (
     <button
       type="button"
-      onClick={onSelect}
+      onClick={() => onSelect(section)}
       className="rounded-xl overflow-hidden text-left transition-all hover:scale-[1.01] focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-accent"
       style={{
         border: isSelected
@@ -129,15 +140,15 @@ function MiniCard({ section, onSelect, isSelected }: MiniCardProps) {
           <Plot
             data={plotData}
             layout={layout}
-            config={{ displayModeBar: false, responsive: true }}
-            style={{ width: '100%', height: '100%' }}
+            config={MINI_PLOT_CONFIG}
+            style={MINI_PLOT_STYLE}
             useResizeHandler
           />
         )}
       </div>
     </button>
   );
-}
+});
 
 // ─── Grid ──────────────────────────────────────────────────
 
@@ -151,6 +162,16 @@ export function ProfilesGrid({ onSectionSelect }: ProfilesGridProps) {
   const setSelectedSection = useSession((s) => s.setSelectedSection);
   const { data: sections, isLoading } = useSections();
 
+  const handleSelect = useCallback(
+    (sec: SectionResponse) => {
+      setSelectedSection(sec.id);
+      if (onSectionSelect) {
+        onSectionSelect(sec.id);
+      }
+    },
+    [setSelectedSection, onSectionSelect],
+  );
+
   if (isLoading) {
     return (
       <div className="flex items-center justify-center py-16 gap-3" style={{ color: 'var(--color-text-muted)' }}>
@@ -174,13 +195,6 @@ export function ProfilesGrid({ onSectionSelect }: ProfilesGridProps) {
     );
   }
 
-  const handleSelect = (sec: SectionResponse) => {
-    setSelectedSection(sec.id);
-    if (onSectionSelect) {
-      onSectionSelect(sec.id);
-    }
-  };
-
   return (
     <div
       className="grid gap-3"
@@ -191,7 +205,7 @@ export function ProfilesGrid({ onSectionSelect }: ProfilesGridProps) {
           key={sec.id}
           section={sec}
           isSelected={selectedSection === sec.name}
-          onSelect={() => handleSelect(sec)}
+          onSelect={handleSelect}
         />
       ))}
     </div>
@@ -8,7 +8,7 @@
  */
 
 import { describe, it, expect } from 'vitest';
-import { buildTraces, computeAxisRanges } from '../ProfileChart';
+import { buildAreaFillTraces, buildTraces, computeAxisRanges } from '../ProfileChart';
 import type { ProfileViewModel } from '../../domain/types';
 import type { FilterState } from '../../domain/filters';
 import { DEFAULT_FILTER_STATE } from '../../domain/filters';
@@ -141,6 +141,21 @@ describe('buildTraces', () => {
     expect(fill).toBeUndefined();
   });
 
+  it('reuses precomputed area fills instead of rebuilding them', () => {
+    const vm = makeViewModel({
+      lines: [
+        { kind: 'design', points: [{ distance: 0, elevation: 100 }, { distance: 10, elevation: 90 }] },
+        { kind: 'topo', points: [{ distance: 0, elevation: 99 }, { distance: 10, elevation: 89 }] },
+      ],
+    });
+    const fills = buildAreaFillTraces(vm, false);
+    const traces = buildTraces(vm, makeFilterState({ showAreas: true }), stubCrossLink, false, undefined, fills);
+    expect(traces.slice(0, fills.length)).toEqual(fills);
+    expect(traces[0]).toBe(fills[0]);
+    const hidden = buildTraces(vm, makeFilterState({ showAreas: false }), stubCrossLink, false, undefined, fills);
+    expect(hidden.find((t) => (t as { name?: string }).name === 'Deuda')).toBeUndefined();
+  });
+
   it('emits one bench-markers trace by default (semaphore off)', () => {
     const vm = makeViewModel({ benches: [makeBench({ benchNumber: 1, status: 'CUMPLE' })] });
     const traces = buildTraces(vm, makeFilterState(), stubCrossLink, false);